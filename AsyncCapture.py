@@ -0,0 +1,117 @@
+import asyncio
+import typing
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Колличество потоков общего пула чтения кадров. `cv2.VideoCapture.read` освобождает GIL,
+# поэтому потоки ожидают сеть и декодирование параллельно
+DEFAULT_WORKERS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """Общий ограниченный пул потоков чтения кадров для `Camera.aframes()`
+
+    Returns:
+        `ThreadPoolExecutor`: Пул из `DEFAULT_WORKERS` потоков
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="CameraRead")
+        return _executor
+
+
+async def iterate_in_executor(iterator: typing.Iterator,
+                              executor: ThreadPoolExecutor = None) -> typing.AsyncIterator:
+    """Асинхронный обход блокирующего итератора: каждый шаг выполняется в пуле потоков.
+
+    При отмене задачи или закрытии генератора итератор закрывается (`close()`) после завершения
+    текущего шага, поэтому ресурсы итератора не освобождаются во время чтения.
+
+    Args:
+        `iterator (Iterator)`: Генератор, например `Camera.frames()`
+
+        `executor (ThreadPoolExecutor, optional)`: Пул потоков. По умолчанию `shared_executor()`.
+
+    Yields:
+        `Any`: Элементы итератора
+    """
+    executor = executor or shared_executor()
+    future = None
+
+    try:
+        while True:
+            future = executor.submit(next, iterator, None)
+            item = await asyncio.wrap_future(future)
+            if item is None:
+                break
+            yield item
+            future = None
+
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            # Шаг, который уже выполняется, нельзя прервать: итератор закрывается после его завершения
+            if future is None or future.cancel():
+                close()
+            else:
+                future.add_done_callback(lambda _: close())
+
+
+async def gather_frames(cameras: typing.Sequence,
+                        handler: typing.Callable,
+                        max_workers: int = None,
+                        return_exceptions: bool = False,
+                        **kwargs) -> list:
+    """Одновременная обработка кадров нескольких камер в одном цикле событий
+
+    Для каждой камеры запускается `async for packet in camera.aframes(**kwargs)` и вызывается `handler(camera, packet)`.
+    Отмена задачи `gather_frames` останавливает все камеры и освобождает их источники.
+
+    Args:
+        `cameras (Sequence[Camera])`: Камеры
+
+        `handler (Callable)`: Обработчик кадра `(camera, packet)`. Может быть корутинной функцией.
+
+        `max_workers (int, optional)`: Размер пула потоков чтения. По умолчанию по одному потоку на камеру.
+
+        `return_exceptions (bool, optional)`: Возвращать ошибки камер в результате, не останавливая остальные камеры. По умолчанию `False`.
+
+        `**kwargs`: Параметры `Camera.aframes()`, например `size`, `max_rate`, `max_frames`
+
+    Returns:
+        `list`: Колличество обработанных кадров каждой камеры (или ошибка при `return_exceptions=True`)
+    """
+    if not cameras:
+        return []
+
+    max_workers = max_workers or len(cameras)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="CameraRead")
+
+    async def consume(camera) -> int:
+        count = 0
+        async for packet in camera.aframes(executor=executor, **kwargs):
+            result = handler(camera, packet)
+            if asyncio.iscoroutine(result):
+                await result
+            count += 1
+        return count
+
+    logging.info(f"[ASYNC] Gathering frames from {len(cameras)} cameras on {max_workers} threads")
+    tasks = [asyncio.ensure_future(consume(camera)) for camera in cameras]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        # При ошибке одной камеры или отмене остальные камеры останавливаются
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Потоки дочитывают начатые кадры и закрывают источники без блокировки цикла событий
+        executor.shutdown(wait=False)
@@ -0,0 +1,237 @@
+import cv2
+import time
+import typing
+import logging
+import threading
+import collections
+import numpy as np
+
+
+class AsyncFrameWriter:
+    """Асинхронная запись кадров на диск (`cv2.imwrite`, `np.save`) вне цикла захвата.
+
+    Задачи помещаются в ограниченную очередь и обрабатываются пулом потоков.
+    При переполнении очереди применяется одна из политик:
+    `block` - ожидание свободного места, `drop_oldest` - удаление самой старой задачи,
+    `drop_newest` - отказ от новой задачи.
+    """
+
+    POLICIES = ("block", "drop_oldest", "drop_newest")
+
+    def __init__(self,
+                 max_queue: int = 32,
+                 workers: int = 2,
+                 policy: str = "block",
+                 name: str = "AsyncFrameWriter"):
+        """
+        Args:
+            `max_queue (int, optional)`: Максимальное колличество задач в очереди. По умолчанию `32`.
+
+            `workers (int, optional)`: Колличество потоков записи. По умолчанию `2`.
+
+            `policy (str, optional)`: Политика при переполнении очереди. По умолчанию `block`.
+
+            `name (str, optional)`: Имя пула потоков. По умолчанию `AsyncFrameWriter`.
+        """
+
+        if policy not in self.POLICIES:
+            logging.warning(f"[WRITER] There is no '{policy}' policy, 'block' policy is selected by default")
+            policy = "block"
+
+        self.__max_queue = max(1, max_queue)
+        self.__policy = policy
+        self.__queue = collections.deque()
+        self.__cond = threading.Condition()
+        self.__running = True
+        self.__active = 0
+
+        self.__submitted = 0
+        self.__written = 0
+        self.__dropped = 0
+        self.__errors = 0
+        self.__max_depth = 0
+        self.__latency_sum = 0.0
+        self.__latency_max = 0.0
+        self.__write_sum = 0.0
+        self.__write_max = 0.0
+
+        self.__workers = [threading.Thread(target=self.__worker, name=f"{name} {i}", daemon=True)
+                          for i in range(max(1, workers))]
+        for worker in self.__workers:
+            worker.start()
+
+
+    @property
+    def policy(self) -> str:
+        return self.__policy
+
+
+    @property
+    def queue_depth(self) -> int:
+        """Текущее колличество задач в очереди
+
+        Returns:
+            `int`: Размер очереди
+        """
+        return len(self.__queue)
+
+
+    def imwrite(self, path: str, image: np.ndarray) -> bool:
+        """Постановка в очередь записи изображения через `cv2.imwrite`.
+        Кадр копируется, поэтому его можно изменять после вызова.
+
+        Args:
+            `path (str)`: Путь сохранения изображения
+
+            `image (np.ndarray)`: Изображение
+
+        Returns:
+            `bool`: Принята ли задача в очередь
+        """
+        return self.__submit(cv2.imwrite, path, image.copy())
+
+
+    def save(self, path: str, array: np.ndarray) -> bool:
+        """Постановка в очередь записи массива через `np.save`
+
+        Args:
+            `path (str)`: Путь сохранения файла
+
+            `array (np.ndarray)`: Массив
+
+        Returns:
+            `bool`: Принята ли задача в очередь
+        """
+        return self.__submit(np.save, path, array.copy())
+
+
+    def submit(self, func: typing.Callable, *args) -> bool:
+        """Постановка в очередь произвольной функции записи. Аргументы не копируются.
+
+        Args:
+            `func (Callable)`: Функция записи
+
+        Returns:
+            `bool`: Принята ли задача в очередь
+        """
+        return self.__submit(func, *args)
+
+
+    def __submit(self, func: typing.Callable, *args) -> bool:
+        with self.__cond:
+            if not self.__running:
+                logging.error("[WRITER] The writer has already been closed")
+                raise RuntimeError("[WRITER] The writer has already been closed")
+
+            if len(self.__queue) >= self.__max_queue:
+                if self.__policy == "drop_newest":
+                    self.__dropped += 1
+                    return False
+                elif self.__policy == "drop_oldest":
+                    self.__queue.popleft()
+                    self.__dropped += 1
+                else:
+                    self.__cond.wait_for(lambda: len(self.__queue) < self.__max_queue or not self.__running)
+                    # Писатель закрыт во время ожидания: потоки записи могли завершиться, задача была бы потеряна
+                    if not self.__running:
+                        logging.error("[WRITER] The writer was closed while waiting for a free place in the queue")
+                        raise RuntimeError("[WRITER] The writer was closed while waiting for a free place in the queue")
+
+            self.__queue.append((func, args, time.perf_counter()))
+            self.__submitted += 1
+            self.__max_depth = max(self.__max_depth, len(self.__queue))
+            self.__cond.notify_all()
+
+        return True
+
+
+    def __worker(self) -> None:
+        while True:
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__queue or not self.__running)
+                if not self.__queue:
+                    return
+                func, args, submitted = self.__queue.popleft()
+                self.__active += 1
+                self.__cond.notify_all()
+
+            start = time.perf_counter()
+            try:
+                # `cv2.imwrite` сообщает об ошибке записи (нет папки, диск недоступен) возвратом `False`
+                ok = func(*args) is not False
+                if not ok:
+                    logging.error(f"[WRITER] Failed to write file {args[0] if args else ''}: the write function returned False")
+            except Exception as e:
+                ok = False
+                logging.error(f"[WRITER] Failed to write file {args[0] if args else ''}: {e}")
+            end = time.perf_counter()
+
+            with self.__cond:
+                self.__active -= 1
+                if ok:
+                    self.__written += 1
+                else:
+                    self.__errors += 1
+                self.__write_sum += end - start
+                self.__write_max = max(self.__write_max, end - start)
+                self.__latency_sum += end - submitted
+                self.__latency_max = max(self.__latency_max, end - submitted)
+                self.__cond.notify_all()
+
+
+    def flush(self, timeout: float = None) -> bool:
+        """Ожидание записи всех задач из очереди
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+
+        Returns:
+            `bool`: Все ли задачи записаны
+        """
+        with self.__cond:
+            return self.__cond.wait_for(lambda: not self.__queue and self.__active == 0, timeout)
+
+
+    def close(self, timeout: float = None) -> None:
+        """Запись оставшихся задач и остановка потоков записи
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+        """
+        if not self.__running:
+            return
+
+        self.flush(timeout)
+
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify_all()
+
+        for worker in self.__workers:
+            worker.join(timeout)
+
+        stats = self.stats()
+        logging.info(f"[WRITER] Writer closed. Written {stats['written']}, dropped {stats['dropped']}, errors {stats['errors']}, \
+max queue depth {stats['max_queue_depth']}, avg write {stats['avg_write_ms']:.2f} ms, avg latency {stats['avg_latency_ms']:.2f} ms")
+
+
+    def stats(self) -> dict:
+        """Статистика работы очереди записи
+
+        Returns:
+            `dict`: Глубина очереди, колличество записанных/пропущенных задач, время записи и задержка в миллисекундах
+        """
+        with self.__cond:
+            done = max(1, self.__written + self.__errors)
+            return {
+                "queue_depth": len(self.__queue),
+                "max_queue_depth": self.__max_depth,
+                "submitted": self.__submitted,
+                "written": self.__written,
+                "dropped": self.__dropped,
+                "errors": self.__errors,
+                "avg_write_ms": self.__write_sum / done * 1000,
+                "max_write_ms": self.__write_max * 1000,
+                "avg_latency_ms": self.__latency_sum / done * 1000,
+                "max_latency_ms": self.__latency_max * 1000,
+            }
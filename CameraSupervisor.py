@@ -0,0 +1,291 @@
+import time
+import typing
+import logging
+
+from multiprocessing import Barrier, Value
+
+from .RTSPMultiProc import CameraMultiProc
+from .RealSenseMultiProc import RealSenseMultiProc
+
+
+class CameraSupervisor:
+    """Запуск и контроль процессов камер `RealSenseMultiProc` и `CameraMultiProc` из одной конфигурации.
+
+    Супервизор следит за работой процессов и FPS каждой камеры, перезапускает аварийно завершившиеся
+    и зависшие (счетчик кадров не растет `stall_timeout` секунд) процессы с экспоненциальной задержкой
+    и останавливает все процессы при выходе.
+
+    Пример конфигурации:
+
+        [{"type": "realsense", "name": "rs_0", "device_id": 0, "mode": "stream",
+          "color_profile": 10, "depth_profile": 5, "show_gui_color": False, "show_gui_depth": False},
+         {"type": "rtsp", "name": "gate", "device_id": "rtsp://192.168.1.10/stream", "mode": "video",
+          "show_gui": False}]
+
+    Остальные ключи передаются в конструктор процесса камеры.
+    """
+
+    WORKERS = {"realsense": RealSenseMultiProc, "rtsp": CameraMultiProc}
+
+    def __init__(self,
+                 config: typing.List[dict],
+                 max_restarts: int = 10,
+                 backoff: float = 1.0,
+                 max_backoff: float = 60.0,
+                 stable_time: float = 30.0,
+                 poll_interval: float = 1.0,
+                 log_interval: float = 60.0,
+                 barrier: Barrier = None,
+                 barrier_timeout: float = 30.0,
+                 stall_timeout: float = 60.0):
+        """
+        Args:
+            `config (list)`: Список настроек камер. Ключ `type` - `realsense` или `rtsp`, ключ `name` - имя камеры
+
+            `max_restarts (int, optional)`: Максимальное колличество перезапусков подряд. По умолчанию `10`.
+
+            `backoff (float, optional)`: Начальная задержка перед перезапуском в секундах. По умолчанию `1`.
+
+            `max_backoff (float, optional)`: Максимальная задержка перед перезапуском в секундах. По умолчанию `60`.
+
+            `stable_time (float, optional)`: Время работы, после которого счетчик перезапусков сбрасывается. По умолчанию `30`.
+
+            `poll_interval (float, optional)`: Период проверки процессов в секундах. По умолчанию `1`.
+
+            `log_interval (float, optional)`: Период записи состояния камер в лог в секундах. По умолчанию `60`.
+
+            `barrier (Barrier, optional)`: Барьер синхронизации первого запуска камер. По умолчанию None.
+
+            `barrier_timeout (float, optional)`: Время ожидания барьера процессом камеры в секундах. По умолчанию `30`.
+            Если процесс камеры завершается при первом запуске, барьер разрушается, чтобы остальные камеры не ждали его бесконечно
+
+            `stall_timeout (float, optional)`: Время без новых кадров в секундах, после которого процесс считается зависшим
+            и перезапускается. Должно превышать время открытия камеры и переподключения. По умолчанию `60`, `None` - не проверять.
+        """
+
+        self.__max_restarts = max_restarts
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__stable_time = stable_time
+        self.__poll_interval = poll_interval
+        self.__log_interval = log_interval
+        self.__barrier = barrier
+        self.__barrier_timeout = barrier_timeout
+        self.__stall_timeout = stall_timeout
+        self.__running = False
+
+        self.__workers = []
+        for i, item in enumerate(config):
+            item = dict(item)
+            worker_type = item.pop("type", "realsense")
+            name = item.pop("name", f"{worker_type}_{i}")
+
+            if worker_type not in self.WORKERS:
+                logging.error(f"[SUPERVISOR] There is no '{worker_type}' camera type")
+                raise ValueError(f"[SUPERVISOR] There is no '{worker_type}' camera type")
+
+            self.__workers.append({
+                "name": name,
+                "type": worker_type,
+                "kwargs": item,
+                "process": None,
+                "counter": Value("Q", 0, lock=False),
+                "state": "created",
+                "failures": 0,
+                "restarts": 0,
+                "started": 0.0,
+                "next_start": 0.0,
+                "last_count": 0,
+                "last_time": 0.0,
+                "progress": 0.0,
+                "fps": 0.0,
+                "exitcode": None,
+            })
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+
+    def __start_worker(self, worker: dict, barrier: Barrier = None) -> None:
+        kwargs = dict(worker["kwargs"], barrier=barrier, frame_counter=worker["counter"])
+        if barrier is not None:
+            kwargs["barrier_timeout"] = self.__barrier_timeout
+        process = self.WORKERS[worker["type"]](**kwargs)
+        process.name = worker["name"]
+        process.daemon = False
+        process.start()
+
+        now = time.monotonic()
+        worker.update(process=process, state="running", started=now,
+                      last_count=worker["counter"].value, last_time=now, progress=now, fps=0.0)
+        logging.info(f"[SUPERVISOR] Camera '{worker['name']}' started. PID {process.pid}")
+
+
+    def start(self) -> None:
+        """Запуск процессов всех камер
+        """
+        self.__running = True
+        for worker in self.__workers:
+            self.__start_worker(worker, barrier=self.__barrier)
+
+
+    def poll(self) -> list:
+        """Один шаг контроля: проверка процессов, перезапуск и расчет FPS
+
+        Returns:
+            `list`: Состояние камер (см. `status`)
+        """
+        now = time.monotonic()
+
+        for worker in self.__workers:
+            process = worker["process"]
+
+            if process is not None and not process.is_alive():
+                process.join()
+                worker["process"] = None
+                worker["exitcode"] = process.exitcode
+                worker["fps"] = 0.0
+
+                # Камеры первого запуска ожидают на барьере и эту камеру: барьер разрушается, ожидающие камеры
+                # завершаются с ошибкой и перезапускаются без барьера
+                if self.__barrier is not None and not self.__barrier.broken:
+                    logging.warning(f"[SUPERVISOR] Camera '{worker['name']}' exited, the start barrier is aborted")
+                    self.__barrier.abort()
+
+                if (process.exitcode == 0 and worker["state"] != "stalled") or not self.__running:
+                    worker["state"] = "finished"
+                    logging.info(f"[SUPERVISOR] Camera '{worker['name']}' finished")
+                    continue
+
+                if now - worker["started"] >= self.__stable_time:
+                    worker["failures"] = 0
+                worker["failures"] += 1
+
+                if worker["failures"] > self.__max_restarts:
+                    worker["state"] = "failed"
+                    logging.error(f"[SUPERVISOR] Camera '{worker['name']}' failed {worker['failures']} times in a row, no more restarts")
+                    continue
+
+                delay = min(self.__max_backoff, self.__backoff * 2 ** (worker["failures"] - 1))
+                worker["state"] = "restarting"
+                worker["next_start"] = now + delay
+                logging.warning(f"[SUPERVISOR] Camera '{worker['name']}' exited with code {process.exitcode}, restart in {delay:.1f} s")
+
+            elif worker["state"] == "restarting" and now >= worker["next_start"] and self.__running:
+                worker["restarts"] += 1
+                self.__start_worker(worker)
+
+            elif worker["state"] == "running":
+                count = worker["counter"].value
+                elapsed = now - worker["last_time"]
+                if elapsed > 0:
+                    worker["fps"] = (count - worker["last_count"]) / elapsed
+                if count != worker["last_count"]:
+                    worker["progress"] = now
+                worker["last_count"], worker["last_time"] = count, now
+
+                # Зависший процесс жив, но не выдает кадры: он завершается и перезапускается как аварийный
+                if self.__stall_timeout and now - worker["progress"] > self.__stall_timeout:
+                    worker["state"] = "stalled"
+                    logging.error(f"[SUPERVISOR] Camera '{worker['name']}' produced no frames for {now - worker['progress']:.1f} s, terminating")
+                    process.terminate()
+
+        return self.status()
+
+
+    def status(self) -> list:
+        """Состояние камер
+
+        Returns:
+            `list`: Имя, тип, состояние, PID, FPS, колличество кадров и перезапусков каждой камеры
+        """
+        return [{
+            "name": worker["name"],
+            "type": worker["type"],
+            "state": worker["state"],
+            "pid": worker["process"].pid if worker["process"] else None,
+            "fps": worker["fps"],
+            "frames": worker["counter"].value,
+            "restarts": worker["restarts"],
+            "exitcode": worker["exitcode"],
+        } for worker in self.__workers]
+
+
+    def run(self, duration: float = None) -> None:
+        """Запуск камер и контроль их работы до вызова `stop`, завершения всех камер или истечения `duration`
+
+        Args:
+            `duration (float, optional)`: Время работы в секундах. По умолчанию `None` - без ограничения.
+        """
+        self.start()
+        start = last_log = time.monotonic()
+
+        try:
+            while self.__running:
+                time.sleep(self.__poll_interval)
+                status = self.poll()
+                now = time.monotonic()
+
+                if now - last_log >= self.__log_interval:
+                    last_log = now
+                    for item in status:
+                        logging.info(f"[SUPERVISOR] Camera '{item['name']}' {item['state']}, {item['fps']:.1f} fps, restarts {item['restarts']}")
+
+                if all(item["state"] in ("finished", "failed") for item in status):
+                    break
+                if duration is not None and now - start >= duration:
+                    break
+
+        except KeyboardInterrupt:
+            logging.info("[SUPERVISOR] Interrupted by the user")
+
+        finally:
+            self.shutdown()
+
+
+    def stop(self) -> None:
+        """Завершение цикла `run`. Процессы останавливаются в `shutdown`
+        """
+        self.__running = False
+
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Остановка всех процессов камер. Камерам передается событие остановки, чтобы они
+        завершили запись файлов. Процессы, не завершившиеся за `timeout`, прерываются принудительно
+
+        Args:
+            `timeout (float, optional)`: Время ожидания завершения процесса в секундах. По умолчанию `5`.
+        """
+        self.__running = False
+
+        processes = [worker["process"] for worker in self.__workers if worker["process"] is not None]
+        for process in processes:
+            if process.is_alive():
+                process.stop()
+
+        deadline = time.monotonic() + timeout
+        for worker in self.__workers:
+            process = worker["process"]
+            if process is None:
+                continue
+
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logging.warning(f"[SUPERVISOR] Camera '{worker['name']}' did not stop in {timeout:.1f} s, terminating")
+                process.terminate()
+                process.join(1.0)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+            worker["process"] = None
+            worker["exitcode"] = process.exitcode
+            worker["state"] = "finished"
+
+        logging.info("[SUPERVISOR] All cameras have been stopped")
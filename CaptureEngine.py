@@ -0,0 +1,276 @@
+import os
+import time
+import typing
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .FrameGrabber import LatestFrame
+from .FramePacket import FramePacket
+
+
+class CaptureEngine:
+    """Захват кадров многих камер `Camera` в одном процессе на общем пуле потоков.
+
+    Каждый шаг камеры - чтение и масштабирование одного кадра `Camera.frames()` - выполняется как
+    отдельная задача пула, после чего задача камеры ставится в очередь заново. Декодирование и
+    масштабирование OpenCV освобождают GIL, поэтому потоки работают параллельно.
+
+    Чтение кадра живой камеры (`paced=True`) ожидает следующий кадр источника и занимает поток на все
+    время ожидания, поэтому для таких источников пул по умолчанию содержит по потоку на камеру: при меньшем
+    пуле камеры ждут свободный поток и отдают меньше кадров, чем источник. Пул меньше колличества камер
+    экономит потоки только для источников без темпа реального времени (файлы, синтетические кадры,
+    `paced=False`), где размер определяется колличеством ядер.
+
+    Кадры записываются в слот `LatestFrame` камеры: потребитель получает самый свежий кадр,
+    непрочитанные кадры перезаписываются и учитываются как пропущенные.
+
+        with CaptureEngine([Camera(url) for url in urls], size=(640, 480)) as engine:
+            packet = engine.read(0, timeout=1.0)
+    """
+
+    # Потоков на ядро для источников без темпа реального времени: часть времени задачи ожидают ввод-вывод
+    WORKERS_PER_CORE = 4
+
+    def __init__(self,
+                 cameras: typing.Sequence,
+                 workers: int = None,
+                 log_interval: float = None,
+                 paced: bool = True,
+                 **kwargs):
+        """
+        Args:
+            `cameras (Sequence[Camera])`: Камеры
+
+            `workers (int, optional)`: Размер пула потоков. По умолчанию поток на камеру для `paced=True`,
+            иначе `WORKERS_PER_CORE` потоков на ядро, но не больше колличества камер.
+
+            `log_interval (float, optional)`: Период сводки производительности в лог в секундах. По умолчанию `None` - без сводки.
+
+            `paced (bool, optional)`: Источники отдают кадры в темпе реального времени (живые камеры, синтетические
+            источники с `realtime=True`). По умолчанию `True`.
+
+            `**kwargs`: Параметры `Camera.frames()`, например `size`, `fps`, `max_rate`, `capture_profile`.
+            Кадры всегда копируются (`copy=True`), так как потребитель читает слот параллельно с захватом.
+        """
+        self.__cameras = list(cameras)
+        if workers:
+            self.__workers = workers
+        elif paced:
+            self.__workers = max(1, len(self.__cameras))
+        else:
+            self.__workers = max(1, min(len(self.__cameras), (os.cpu_count() or 1) * self.WORKERS_PER_CORE))
+
+        if paced and self.__workers < len(self.__cameras):
+            logging.warning(f"[ENGINE] {self.__workers} threads for {len(self.__cameras)} paced cameras: "
+                            f"cameras wait for a free thread and may deliver fewer frames than the source")
+        self.__log_interval = log_interval
+        self.__kwargs = dict(kwargs, copy=True)
+
+        self.__slots = [LatestFrame() for _ in self.__cameras]
+        self.__frames = [0] * len(self.__cameras)
+        self.__errors = [None] * len(self.__cameras)
+        self.__iterators = []
+        self.__executor = None
+        self.__running = False
+        self.__active = 0
+        self.__finished = threading.Condition()
+        self.__started = 0.0
+        self.__stopped = None
+        self.__next_report = None
+        self.__report_frames = 0
+        self.__report_time = 0.0
+
+
+    def __enter__(self) -> "CaptureEngine":
+        self.start()
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+    def __len__(self) -> int:
+        return len(self.__cameras)
+
+
+    @property
+    def workers(self) -> int:
+        return self.__workers
+
+
+    @property
+    def running(self) -> bool:
+        """Работает ли хотя бы одна камера
+
+        Returns:
+            `bool`: Признак работы
+        """
+        with self.__finished:
+            return self.__active > 0
+
+
+    def start(self) -> None:
+        """Запуск захвата всех камер
+        """
+        if self.__running:
+            return
+
+        self.__executor = ThreadPoolExecutor(max_workers=self.__workers, thread_name_prefix="CaptureEngine")
+        self.__iterators = [camera.frames(**self.__kwargs) for camera in self.__cameras]
+        self.__frames = [0] * len(self.__cameras)
+        self.__errors = [None] * len(self.__cameras)
+        self.__running = True
+        self.__active = len(self.__cameras)
+        self.__started = self.__report_time = time.monotonic()
+        self.__stopped = None
+        self.__report_frames = 0
+        self.__next_report = self.__started + self.__log_interval if self.__log_interval else None
+
+        logging.info(f"[ENGINE] Capture engine started {len(self.__cameras)} cameras on {self.__workers} threads")
+        for index in range(len(self.__cameras)):
+            self.__executor.submit(self.__step, index)
+
+
+    def __step(self, index: int) -> None:
+        """Захват одного кадра камеры и постановка следующего шага в очередь пула
+
+        Args:
+            `index (int)`: Номер камеры
+        """
+        iterator = self.__iterators[index]
+
+        if self.__running:
+            try:
+                packet = next(iterator, None)
+            except Exception as e:
+                packet = None
+                self.__errors[index] = e
+                logging.error(f"[ENGINE] Camera {index} ({self.__cameras[index].device_id}) failed: {e}")
+
+            if packet is not None:
+                self.__slots[index].put(packet, packet.timestamp)
+                self.__frames[index] += 1
+                self.__report()
+
+                # Движок мог быть остановлен во время чтения, а пул - закрыт по таймауту `stop()`
+                if self.__running:
+                    try:
+                        self.__executor.submit(self.__step, index)
+                        return
+                    except RuntimeError:
+                        pass
+
+        # Камера остановлена, завершила работу или аварийно остановилась: источник освобождается
+        iterator.close()
+        with self.__finished:
+            self.__active -= 1
+            if self.__active == 0:
+                self.__stopped = time.monotonic()
+            self.__finished.notify_all()
+
+
+    def __report(self) -> None:
+        if self.__next_report is None:
+            return
+
+        now = time.monotonic()
+        if now < self.__next_report:
+            return
+
+        self.__next_report = now + self.__log_interval
+        frames = sum(self.__frames)
+        fps = (frames - self.__report_frames) / max(now - self.__report_time, 1e-9)
+        self.__report_frames, self.__report_time = frames, now
+        logging.info(f"[ENGINE] {fps:.1f} fps across {len(self.__cameras)} cameras, frames {frames}, \
+dropped {sum(slot.dropped for slot in self.__slots)}")
+
+
+    def read(self, index: int, timeout: float = None) -> typing.Optional[FramePacket]:
+        """Ожидание кадра камеры, новее последнего прочитанного
+
+        Args:
+            `index (int)`: Номер камеры
+
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+
+        Returns:
+            `FramePacket | None`: Кадр. `None` по истечении `timeout`
+        """
+        frame = self.__slots[index].get(timeout)
+        return None if frame is None else frame[0]
+
+
+    def latest(self, index: int) -> typing.Optional[FramePacket]:
+        """Последний кадр камеры без ожидания
+
+        Args:
+            `index (int)`: Номер камеры
+
+        Returns:
+            `FramePacket | None`: Кадр или `None`, если камера еще не получила ни одного кадра
+        """
+        frame = self.__slots[index].peek()
+        return None if frame is None else frame[0]
+
+
+    def wait(self, timeout: float = None) -> bool:
+        """Ожидание завершения всех камер (`max_frames`, `duration` или ошибка)
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+
+        Returns:
+            `bool`: Все камеры завершили работу
+        """
+        with self.__finished:
+            return self.__finished.wait_for(lambda: self.__active == 0, timeout)
+
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Остановка захвата. Начатые чтения завершаются, источники всех камер освобождаются
+
+        Args:
+            `timeout (float, optional)`: Время ожидания освобождения камер в секундах. По умолчанию `5`.
+        """
+        if not self.__running:
+            return
+
+        self.__running = False
+        if not self.wait(timeout):
+            logging.warning(f"[ENGINE] {self.__active} cameras did not stop within {timeout} s")
+        self.__executor.shutdown(wait=False)
+
+        summary = self.stats()
+        logging.info(f"[ENGINE] Capture engine stopped. {summary['frames']} frames from {len(self.__cameras)} cameras, \
+{summary['fps']:.1f} fps, dropped {summary['dropped']}")
+
+
+    def stats(self) -> dict:
+        """Производительность захвата: суммарный FPS всех камер и FPS каждой камеры
+
+        Returns:
+            `dict`: Колличество камер и потоков, кадры, суммарный FPS, пропущенные потребителем кадры, статистика камер
+        """
+        end = self.__stopped or time.monotonic()
+        uptime = end - self.__started if self.__started else 0.0
+        cameras = [{
+            "device_id": camera.device_id,
+            "frames": frames,
+            "fps": frames / uptime if uptime > 0 else 0.0,
+            "dropped": slot.dropped,
+            "error": repr(error) if error else None,
+        } for camera, frames, slot, error in zip(self.__cameras, self.__frames, self.__slots, self.__errors)]
+
+        frames = sum(self.__frames)
+        return {
+            "cameras": len(self.__cameras),
+            "workers": self.__workers,
+            "frames": frames,
+            "uptime_s": uptime,
+            "fps": frames / uptime if uptime > 0 else 0.0,
+            "dropped": sum(camera["dropped"] for camera in cameras),
+            "per_camera": cameras,
+        }
@@ -0,0 +1,226 @@
+import os
+import cv2
+import time
+import typing
+import logging
+import threading
+import numpy as np
+
+
+# Параметры FFmpeg передаются OpenCV через переменную окружения в формате `key;value|key;value`
+FFMPEG_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+
+# Именованные профили захвата сетевых камер.
+# `options` - параметры демультиплексора и протокола FFmpeg, `buffer_size` - значение `CAP_PROP_BUFFERSIZE`
+CAPTURE_PROFILES = {
+    # Минимальная задержка: UDP, без буферизации и анализа потока. Возможны потери кадров в плохой сети
+    "low-latency": {
+        "options": {
+            "rtsp_transport": "udp",
+            "fflags": "nobuffer",
+            "flags": "low_delay",
+            "probesize": "32",
+            "analyzeduration": "0",
+            "max_delay": "0",
+            "reorder_queue_size": "0",
+        },
+        "buffer_size": 1,
+    },
+    # Надежная доставка: TCP, стандартный анализ потока и буфер сокета для сетей с потерями
+    "reliable-TCP": {
+        "options": {
+            "rtsp_transport": "tcp",
+            "rtsp_flags": "prefer_tcp",
+            "probesize": "5000000",
+            "analyzeduration": "2000000",
+            "buffer_size": "4194304",
+            "max_delay": "500000",
+        },
+        "buffer_size": 4,
+    },
+    # Экономия канала: TCP без повторной передачи потерянных UDP пакетов и короткий анализ потока
+    "bandwidth-saver": {
+        "options": {
+            "rtsp_transport": "tcp",
+            "fflags": "nobuffer",
+            "probesize": "500000",
+            "analyzeduration": "500000",
+            "buffer_size": "262144",
+        },
+        "buffer_size": 2,
+    },
+}
+
+_env_lock = threading.Lock()
+
+
+def get_capture_profile(profile: typing.Union[str, dict, None]) -> dict:
+    """Получение профиля захвата по имени
+
+    Args:
+        `profile (str | dict | None)`: Имя профиля из `CAPTURE_PROFILES` или профиль `{"options": {...}, "buffer_size": n}`
+
+    Raises:
+        `ValueError`: Вызывается при неизвестном имени профиля
+
+    Returns:
+        `dict`: Профиль захвата. Пустой профиль для `None`
+    """
+    if profile is None:
+        return {"options": {}, "buffer_size": None}
+
+    if isinstance(profile, dict):
+        return {"options": dict(profile.get("options", {})), "buffer_size": profile.get("buffer_size")}
+
+    if profile not in CAPTURE_PROFILES:
+        logging.error(f"[CCTV] There is no '{profile}' capture profile. Available: {', '.join(CAPTURE_PROFILES)}")
+        raise ValueError(f"[CCTV] There is no '{profile}' capture profile")
+
+    return get_capture_profile(CAPTURE_PROFILES[profile])
+
+
+def open_capture(source: typing.Union[int, str],
+                 profile: typing.Union[str, dict] = None,
+                 timeout: float = None) -> cv2.VideoCapture:
+    """Открытие камеры с параметрами профиля захвата
+
+    Переменная окружения FFmpeg устанавливается только на время открытия под блокировкой,
+    поэтому камеры одного процесса могут использовать разные профили.
+
+    Args:
+        `source (int | str)`: ID камеры или адрес потока
+
+        `profile (str | dict, optional)`: Профиль захвата. По умолчанию `None` - параметры OpenCV.
+
+        `timeout (float, optional)`: Таймаут открытия и чтения потока в секундах (OpenCV >= 4.6). По умолчанию `None`.
+
+    Returns:
+        `cv2.VideoCapture`: Захваченная камера OpenCV
+    """
+    profile = get_capture_profile(profile)
+
+    if not isinstance(source, str):
+        capture = cv2.VideoCapture(source)
+    else:
+        params = []
+        # CAP_PROP_*_TIMEOUT_MSEC доступны начиная с OpenCV 4.6
+        if timeout and hasattr(cv2, "CAP_PROP_READ_TIMEOUT_MSEC"):
+            params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(timeout * 1000),
+                      cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(timeout * 1000)]
+
+        with _env_lock:
+            previous = os.environ.get(FFMPEG_OPTIONS_ENV)
+            if profile["options"]:
+                os.environ[FFMPEG_OPTIONS_ENV] = "|".join(f"{key};{value}" for key, value in profile["options"].items())
+
+            try:
+                if params:
+                    capture = cv2.VideoCapture(source, cv2.CAP_FFMPEG, params)
+                else:
+                    capture = cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+            finally:
+                if previous is None:
+                    os.environ.pop(FFMPEG_OPTIONS_ENV, None)
+                else:
+                    os.environ[FFMPEG_OPTIONS_ENV] = previous
+
+    if profile["buffer_size"]:
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, profile["buffer_size"])
+
+    return capture
+
+
+def probe_latency(source: typing.Union[int, str],
+                  profile: typing.Union[str, dict] = None,
+                  frames: int = 100,
+                  warmup: int = 10,
+                  timeout: float = 10.0,
+                  capture_factory: typing.Callable = None) -> dict:
+    """Измерение времени до первого кадра и неравномерности интервала между кадрами
+
+    Args:
+        `source (int | str)`: ID камеры или адрес потока
+
+        `profile (str | dict, optional)`: Профиль захвата. По умолчанию `None`.
+
+        `frames (int, optional)`: Колличество кадров для измерения интервала. По умолчанию `100`.
+
+        `warmup (int, optional)`: Колличество первых кадров, не учитываемых в интервале (буфер после подключения). По умолчанию `10`.
+
+        `timeout (float, optional)`: Таймаут открытия и чтения потока в секундах. По умолчанию `10`.
+
+        `capture_factory (Callable, optional)`: Фабрика источника кадров `source -> cv2.VideoCapture`. По умолчанию `open_capture`.
+
+    Returns:
+        `dict`: Время открытия и до первого кадра, средний интервал, джиттер (стандартное отклонение и p99 отклонения интервала)
+        в миллисекундах, FPS, колличество ошибок чтения
+    """
+    name = profile if isinstance(profile, str) else ("custom" if profile else "default")
+
+    start = time.perf_counter()
+    capture = capture_factory(source) if capture_factory else open_capture(source, profile, timeout)
+    opened = time.perf_counter()
+
+    result = {"profile": name, "opened": bool(capture.isOpened()), "open_ms": (opened - start) * 1000,
+              "first_frame_ms": None, "frames": 0, "failures": 0}
+
+    try:
+        ret, _ = capture.read() if result["opened"] else (False, None)
+        if not ret:
+            logging.warning(f"[CCTV] Latency probe: no frames from {source} with profile '{name}'")
+            return result
+        result["first_frame_ms"] = (time.perf_counter() - start) * 1000
+
+        stamps = []
+        while len(stamps) < warmup + frames:
+            ret, _ = capture.read()
+            if not ret:
+                result["failures"] += 1
+                if result["failures"] > frames:
+                    break
+                continue
+            stamps.append(time.perf_counter())
+    finally:
+        capture.release()
+
+    intervals = np.diff(stamps[warmup:]) * 1000
+    result["frames"] = len(intervals) + 1 if len(intervals) else 0
+    if len(intervals):
+        mean = float(intervals.mean())
+        result.update({
+            "interval_ms": mean,
+            "jitter_ms": float(intervals.std()),
+            "jitter_p99_ms": float(np.percentile(np.abs(intervals - mean), 99)),
+            "max_interval_ms": float(intervals.max()),
+            "fps": 1000 / mean if mean > 0 else 0.0,
+        })
+
+    logging.info(f"[CCTV] Latency probe {source} '{name}': first frame {result['first_frame_ms']:.0f} ms, \
+interval {result.get('interval_ms', 0):.1f} ms, jitter {result.get('jitter_ms', 0):.1f} ms")
+    return result
+
+
+def compare_capture_profiles(source: typing.Union[int, str],
+                             profiles: typing.Sequence[str] = None,
+                             frames: int = 100,
+                             timeout: float = 10.0) -> list:
+    """Измерение задержки источника со всеми профилями захвата для выбора профиля на объекте
+
+    Args:
+        `source (int | str)`: ID камеры или адрес потока
+
+        `profiles (Sequence[str], optional)`: Имена профилей. По умолчанию все профили `CAPTURE_PROFILES` и параметры OpenCV.
+
+        `frames (int, optional)`: Колличество кадров для измерения интервала. По умолчанию `100`.
+
+        `timeout (float, optional)`: Таймаут открытия и чтения потока в секундах. По умолчанию `10`.
+
+    Returns:
+        `list`: Результаты `probe_latency`, отсортированные по времени до первого кадра и джиттеру
+    """
+    profiles = [None] + list(CAPTURE_PROFILES) if profiles is None else profiles
+    results = [probe_latency(source, profile, frames=frames, timeout=timeout) for profile in profiles]
+
+    return sorted(results, key=lambda r: (r["first_frame_ms"] is None,
+                                          r["first_frame_ms"] or 0,
+                                          r.get("jitter_ms", float("inf"))))
@@ -0,0 +1,188 @@
+import os
+import json
+import datetime
+import typing
+import logging
+import threading
+import numpy as np
+
+
+class DepthArchive:
+    """Архив кадров глубины на основе `np.memmap` вместо отдельного `.npy` файла на каждый кадр.
+
+    Кадры фиксированного размера `(H, W)` типа `uint16` дописываются в один файл `depth.u16`,
+    место под кадры выделяется заранее и удваивается при заполнении. Номер кадра и время
+    захвата сохраняются в `depth_index.bin`, размер и тип кадра - в `depth.json`.
+    Для пакетной обработки архив открывается методом `DepthArchive.load` без копирования данных.
+    Существующий архив не перезаписывается: каждая сессия записи создает архив в новой папке.
+    """
+
+    DATA_FILE = "depth.u16"
+    META_FILE = "depth.json"
+    INDEX_FILE = "depth_index.bin"
+    INDEX_DTYPE = np.dtype([("counter", "<i8"), ("timestamp", "<f8")])
+
+    def __init__(self, folder: str, shape: tuple, capacity: int = 64):
+        """
+        Args:
+            `folder (str)`: Папка архива
+
+            `shape (tuple)`: Размер кадра глубины `(H, W)`
+
+            `capacity (int, optional)`: Колличество кадров, под которое заранее выделяется место. По умолчанию `64`.
+
+        Raises:
+            `FileExistsError`: Вызывается, если в папке уже есть архив
+        """
+
+        self.__folder = folder
+        self.__shape = tuple(shape)
+        self.__frame_bytes = int(np.prod(self.__shape)) * 2
+        self.__capacity = max(1, capacity)
+        self.__count = 0
+        self.__lock = threading.Lock()
+
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(f"{folder}/{self.DATA_FILE}"):
+            logging.error(f"[DEPTH] Depth archive {folder} already exists")
+            raise FileExistsError(f"[DEPTH] Depth archive {folder} already exists")
+
+        with open(f"{folder}/{self.META_FILE}", "w") as f:
+            json.dump({"shape": list(self.__shape), "dtype": "<u2"}, f)
+
+        self.__data_file = open(f"{folder}/{self.DATA_FILE}", "x+b")
+        self.__index = open(f"{folder}/{self.INDEX_FILE}", "xb")
+        self.__map = None
+        self.__resize(self.__capacity)
+
+        logging.info(f"[DEPTH] Depth archive {folder} created. Frame {self.__shape}, capacity {self.__capacity}")
+
+
+    def __len__(self) -> int:
+        return self.__count
+
+
+    @property
+    def folder(self) -> str:
+        return self.__folder
+
+
+    def __resize(self, capacity: int) -> None:
+        """Изменение выделенного места в файле и повторное отображение в память
+
+        Args:
+            `capacity (int)`: Новое колличество кадров
+        """
+        if self.__map is not None:
+            self.__map.flush()
+            self.__map = None
+
+        self.__data_file.truncate(capacity * self.__frame_bytes)
+        self.__capacity = capacity
+        self.__map = np.memmap(self.__data_file, dtype=np.uint16, mode="r+",
+                               shape=(capacity, ) + self.__shape)
+
+
+    def append(self, depth: np.ndarray, counter: int, timestamp: float) -> int:
+        """Добавление кадра глубины в архив
+
+        Args:
+            `depth (np.ndarray)`: Кадр глубины `(H, W)`
+
+            `counter (int)`: Номер кадра
+
+            `timestamp (float)`: Время захвата кадра
+
+        Returns:
+            `int`: Позиция кадра в архиве
+        """
+        if depth.shape != self.__shape:
+            logging.error(f"[DEPTH] Frame shape {depth.shape} does not match the archive shape {self.__shape}")
+            raise ValueError(f"[DEPTH] Frame shape {depth.shape} does not match the archive shape {self.__shape}")
+
+        with self.__lock:
+            if self.__count == self.__capacity:
+                self.__resize(self.__capacity * 2)
+
+            position = self.__count
+            np.copyto(self.__map[position], depth, casting="unsafe")
+
+            record = np.array([(counter, timestamp)], dtype=self.INDEX_DTYPE)
+            self.__index.write(record.tobytes())
+            self.__index.flush()
+            self.__count += 1
+
+        return position
+
+
+    def flush(self) -> None:
+        with self.__lock:
+            self.__map.flush()
+            self.__index.flush()
+
+
+    def close(self) -> None:
+        """Запись данных на диск и освобождение неиспользованного места
+        """
+        with self.__lock:
+            if self.__map is None:
+                return
+            self.__map.flush()
+            self.__map = None
+            self.__data_file.truncate(self.__count * self.__frame_bytes)
+            self.__data_file.close()
+            self.__index.close()
+
+        logging.info(f"[DEPTH] Depth archive {self.__folder} closed. Frames {self.__count}")
+
+
+    def release(self) -> None:
+        self.close()
+
+
+    @classmethod
+    def load(cls, folder: str, mode: str = "r") -> typing.Tuple[np.memmap, np.ndarray]:
+        """Открытие архива для чтения без копирования данных
+
+        Args:
+            `folder (str)`: Папка архива
+
+            `mode (str, optional)`: Режим `np.memmap`. По умолчанию `r` - только чтение.
+
+        Returns:
+            `tuple`: Кадры глубины `(N, H, W)`. Номера кадров и время захвата (`counter`, `timestamp`)
+        """
+        with open(f"{folder}/{cls.META_FILE}") as f:
+            meta = json.load(f)
+
+        shape = tuple(meta["shape"])
+        index = np.fromfile(f"{folder}/{cls.INDEX_FILE}", dtype=cls.INDEX_DTYPE)
+
+        # Кадры без записи в индексе (например, при аварийном завершении) не учитываются
+        frame_bytes = int(np.prod(shape)) * np.dtype(meta["dtype"]).itemsize
+        count = min(len(index), os.path.getsize(f"{folder}/{cls.DATA_FILE}") // frame_bytes)
+
+        if count == 0:
+            return np.empty((0, ) + shape, dtype=meta["dtype"]), index[:0]
+
+        frames = np.memmap(f"{folder}/{cls.DATA_FILE}", dtype=meta["dtype"], mode=mode,
+                           shape=(count, ) + shape)
+        return frames, index[:count]
+
+
+    @classmethod
+    def session_folder(cls, folder: str) -> str:
+        """Новая папка архива сессии записи `folder/YYYYmmdd-HHMMSS` с номером, если папка уже существует
+
+        Args:
+            `folder (str)`: Папка архивов камеры
+
+        Returns:
+            `str`: Путь к папке, в которой еще нет архива
+        """
+        name = f"{folder}/{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        session, number = name, 1
+        while os.path.exists(session):
+            session = f"{name}_{number}"
+            number += 1
+        return session
@@ -0,0 +1,110 @@
+import cv2
+import logging
+import numpy as np
+
+
+class DepthColorizer:
+    """Раскраска кадров глубины z16 через таблицу соответствия (LUT) вместо `rs.colorizer`.
+
+    Таблица на 65536 значений строится один раз для диапазона глубины и цветовой карты
+    и кешируется на уровне класса. Цвета в таблице упакованы в `uint32` (BGRA), поэтому раскраска -
+    одно векторное `np.take` по 4-байтовым значениям и `cv2.cvtColor` в заранее выделенный буфер.
+    Нулевая глубина (нет данных) окрашивается в черный цвет.
+    """
+
+    __luts = {}
+
+    def __init__(self,
+                 min_depth: float = 0.3,
+                 max_depth: float = 4.0,
+                 colormap: int = cv2.COLORMAP_JET,
+                 depth_scale: float = 0.001):
+        """
+        Args:
+            `min_depth (float, optional)`: Минимальная глубина цветовой шкалы в метрах. По умолчанию `0.3`.
+
+            `max_depth (float, optional)`: Максимальная глубина цветовой шкалы в метрах. По умолчанию `4.0`.
+
+            `colormap (int, optional)`: Цветовая карта OpenCV. По умолчанию `cv2.COLORMAP_JET`.
+
+            `depth_scale (float, optional)`: Метров в одной единице z16. По умолчанию `0.001`.
+        """
+
+        if min_depth >= max_depth:
+            logging.error("[COLOR] The 'min_depth' must be less than 'max_depth'")
+            raise ValueError("[COLOR] The 'min_depth' must be less than 'max_depth'")
+
+        self.__min_depth = min_depth
+        self.__max_depth = max_depth
+        self.__colormap = colormap
+        self.__depth_scale = depth_scale
+        self.__lut = self.lookup_table(min_depth, max_depth, colormap, depth_scale)
+        self.__packed = None
+        self.__buffer = None
+
+
+    @property
+    def depth_scale(self) -> float:
+        return self.__depth_scale
+
+
+    @depth_scale.setter
+    def depth_scale(self, depth_scale: float) -> None:
+        self.__depth_scale = depth_scale
+        self.__lut = self.lookup_table(self.__min_depth, self.__max_depth, self.__colormap, depth_scale)
+
+
+    @classmethod
+    def lookup_table(cls, min_depth: float, max_depth: float,
+                     colormap: int, depth_scale: float) -> np.ndarray:
+        """Получение таблицы соответствия из кеша или ее построение
+
+        Args:
+            `min_depth (float)`: Минимальная глубина в метрах
+
+            `max_depth (float)`: Максимальная глубина в метрах
+
+            `colormap (int)`: Цветовая карта OpenCV
+
+            `depth_scale (float)`: Метров в одной единице z16
+
+        Returns:
+            `np.ndarray`: Таблица `(65536, )` типа `uint32`, цвет BGRA
+        """
+        low = int(round(min_depth / depth_scale))
+        high = int(round(max_depth / depth_scale))
+        key = (low, high, colormap)
+
+        if key not in cls.__luts:
+            values = np.arange(65536, dtype=np.float32)
+            gray = np.clip((values - low) * (255.0 / max(1, high - low)), 0, 255).astype(np.uint8)
+            lut = np.zeros((65536, 4), dtype=np.uint8)
+            lut[:, :3] = cv2.applyColorMap(gray.reshape(-1, 1), colormap).reshape(65536, 3)
+            lut[0] = 0
+            cls.__luts[key] = lut.view(np.uint32).ravel()
+
+        return cls.__luts[key]
+
+
+    def colorize(self, depth: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Раскраска кадра глубины
+
+        Args:
+            `depth (np.ndarray)`: Кадр глубины `(H, W)` типа `uint16`
+
+            `out (np.ndarray, optional)`: Буфер результата `(H, W, 3)` типа `uint8`.
+            По умолчанию используется внутренний буфер, который перезаписывается следующим вызовом.
+
+        Returns:
+            `np.ndarray`: Цветное изображение глубины BGR
+        """
+        if self.__packed is None or self.__packed.shape != depth.shape:
+            self.__packed = np.empty(depth.shape, dtype=np.uint32)
+            self.__buffer = np.empty(depth.shape + (3, ), dtype=np.uint8)
+
+        if out is None:
+            out = self.__buffer
+
+        np.take(self.__lut, depth, out=self.__packed)
+        return cv2.cvtColor(self.__packed.view(np.uint8).reshape(depth.shape + (4, )),
+                            cv2.COLOR_BGRA2BGR, dst=out)
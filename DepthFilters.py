@@ -0,0 +1,138 @@
+import time
+import typing
+import logging
+import pyrealsense2 as rs
+
+from .StreamStats import RollingWindow
+
+
+# Фильтры постобработки глубины: имя в цепочке -> (блок librealsense, аргументы конструктора)
+DEPTH_FILTERS = {
+    "decimation": ("decimation_filter", ()),
+    "threshold": ("threshold_filter", ()),
+    "depth_to_disparity": ("disparity_transform", (True, )),
+    "spatial": ("spatial_filter", ()),
+    "temporal": ("temporal_filter", ()),
+    "disparity_to_depth": ("disparity_transform", (False, )),
+    "hole_filling": ("hole_filling_filter", ()),
+}
+
+# Порядок фильтров, рекомендованный librealsense: прореживание уменьшает объем данных для всех следующих
+# фильтров и получателей, пространственный и временной фильтры работают в пространстве диспаратности
+RECOMMENDED_DEPTH_FILTERS = (
+    ("decimation", {"filter_magnitude": 2}),
+    ("threshold", {"min_distance": 0.15, "max_distance": 4.0}),
+    "depth_to_disparity",
+    ("spatial", {"filter_magnitude": 2, "filter_smooth_alpha": 0.5, "filter_smooth_delta": 20}),
+    ("temporal", {"filter_smooth_alpha": 0.4, "filter_smooth_delta": 20}),
+    "disparity_to_depth",
+    ("hole_filling", {"holes_fill": 1}),
+)
+
+
+class DepthFilterChain:
+    """Цепочка фильтров постобработки глубины librealsense, заданная списком.
+
+    Элемент списка - имя фильтра из `DEPTH_FILTERS` или пара `(имя, {опция: значение})`, где опция - имя
+    `rs.option` без префикса. Фильтры применяются в порядке списка, длительность каждого фильтра учитывается отдельно.
+
+        chain = DepthFilterChain([("decimation", {"filter_magnitude": 2}),
+                                  ("threshold", {"min_distance": 0.3, "max_distance": 4.0}),
+                                  "hole_filling"])
+        depth_f = chain.process(frameset.get_depth_frame())
+    """
+
+    def __init__(self, filters: typing.Sequence = RECOMMENDED_DEPTH_FILTERS, backend: typing.Any = None):
+        """
+        Args:
+            `filters (Sequence, optional)`: Фильтры цепочки. По умолчанию `RECOMMENDED_DEPTH_FILTERS`.
+
+            `backend (module, optional)`: Реализация API `pyrealsense2`. По умолчанию `pyrealsense2`.
+
+        Raises:
+            `ValueError`: Вызывается при неизвестном фильтре или опции и если цепочка не возвращает глубину из диспаратности
+        """
+        self.__rs = backend if backend is not None else rs
+        self.__spec = [(f, {}) if isinstance(f, str) else (f[0], dict(f[1])) for f in filters or ()]
+        self.__filters = []
+        self.__build()
+
+
+    def __build(self) -> None:
+        """Создание блоков librealsense и установка их опций
+        """
+        filters, disparity = [], False
+        for name, options in self.__spec:
+            if name not in DEPTH_FILTERS:
+                logging.error(f"[RS] There is no '{name}' depth filter. Available filters: {', '.join(DEPTH_FILTERS)}")
+                raise ValueError(f"[RS] There is no '{name}' depth filter")
+
+            block, args = DEPTH_FILTERS[name]
+            depth_filter = getattr(self.__rs, block)(*args)
+            for option, value in options.items():
+                try:
+                    depth_filter.set_option(getattr(self.__rs.option, option), value)
+                except Exception as e:
+                    logging.error(f"[RS] Failed to set the '{option}' option of the '{name}' depth filter to {value}: {e}")
+                    raise ValueError(f"[RS] Failed to set the '{option}' option of the '{name}' depth filter to {value}")
+
+            if name in ("depth_to_disparity", "disparity_to_depth"):
+                disparity = name == "depth_to_disparity"
+
+            # Повторяющиеся фильтры различаются номером в цепочке
+            key = name if all(name != f[0] for f in filters) else f"{name}_{len(filters)}"
+            filters.append((key, depth_filter, RollingWindow()))
+
+        if disparity:
+            logging.error("[RS] The depth filter chain ends in the disparity domain, add 'disparity_to_depth'")
+            raise ValueError("[RS] The depth filter chain ends in the disparity domain, add 'disparity_to_depth'")
+
+        self.__filters = filters
+
+
+    def __len__(self) -> int:
+        return len(self.__filters)
+
+
+    @property
+    def names(self) -> typing.List[str]:
+        return [name for name, _, _ in self.__filters]
+
+
+    def process(self, depth_f: typing.Any) -> typing.Any:
+        """Применение цепочки к кадру глубины или к набору кадров (фильтры обрабатывают только глубину набора)
+
+        Args:
+            `depth_f (rs.depth_frame | rs.composite_frame)`: Кадр глубины или набор кадров librealsense
+
+        Returns:
+            `rs.frame`: Отфильтрованный кадр глубины или набор кадров. Без фильтров - исходный кадр
+        """
+        last = time.perf_counter()
+        for _, depth_filter, window in self.__filters:
+            depth_f = depth_filter.process(depth_f)
+            now = time.perf_counter()
+            window.add(now - last)
+            last = now
+        return depth_f
+
+
+    def reset(self) -> None:
+        """Пересоздание фильтров: сброс истории временного фильтра и статистики, например перед новым запуском камеры
+        """
+        self.__build()
+
+
+    def stats(self) -> dict:
+        """Длительность каждого фильтра
+
+        Returns:
+            `dict`: Статистика `RollingWindow` в миллисекундах для каждого фильтра в порядке цепочки
+        """
+        return {name: window.summary() for name, _, window in self.__filters}
+
+
+    def describe(self) -> str:
+        """Строка `имя mean ms, ...` для лога
+        """
+        return ", ".join(f"{name} {summary.get('mean_ms', 0.0):.2f} ms" for name, summary in self.stats().items())
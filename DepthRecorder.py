@@ -0,0 +1,328 @@
+import os
+import zlib
+import struct
+import threading
+import typing
+import logging
+import numpy as np
+
+from .AsyncFrameWriter import AsyncFrameWriter
+
+
+class DepthRecorder:
+    """Запись необработанных кадров глубины (z16) в сжатый контейнер без потерь.
+
+    Кадры группируются в блоки по `chunk_frames` штук, каждый блок сжимается `zlib`
+    после разностного кодирования по строкам и разделения байтов. Рядом с файлом данных
+    ведется индекс `.idx` со смещением блока и временем захвата каждого кадра,
+    что позволяет читать кадр `N` или кадр на момент `T`, распаковывая только один блок.
+    Сжатие и запись выполняются в фоновом потоке.
+    """
+
+    MAGIC = b"RNFDEPTH"
+    VERSION = 1
+    HEADER = struct.Struct("<8sHIII")
+    INDEX_DTYPE = np.dtype([("offset", "<u8"), ("length", "<u4"), ("position", "<u4"), ("timestamp", "<f8")])
+
+    def __init__(self,
+                 path: str,
+                 shape: tuple,
+                 chunk_frames: int = 10,
+                 level: int = 1,
+                 workers: int = 2,
+                 max_queue: int = 8):
+        """
+        Args:
+            `path (str)`: Путь файла контейнера. Индекс сохраняется в `{path}.idx`
+
+            `shape (tuple)`: Размер кадра глубины `(H, W)`
+
+            `chunk_frames (int, optional)`: Колличество кадров в одном блоке. По умолчанию `10`.
+
+            `level (int, optional)`: Уровень сжатия `zlib`. По умолчанию `1`.
+
+            `workers (int, optional)`: Колличество потоков сжатия. По умолчанию `2`.
+
+            `max_queue (int, optional)`: Колличество блоков в очереди на сжатие. По умолчанию `8`.
+        """
+
+        self.__path = path
+        self.__shape = tuple(shape)
+        self.__chunk_frames = max(1, chunk_frames)
+        self.__level = level
+
+        self.__file = open(path, "wb")
+        self.__file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.__shape[0],
+                                           self.__shape[1], self.__chunk_frames))
+        self.__file.flush()
+        self.__index = open(f"{path}.idx", "wb")
+
+        self.__chunk = np.empty((self.__chunk_frames, ) + self.__shape, dtype=np.uint16)
+        self.__stamps = np.empty(self.__chunk_frames, dtype=np.float64)
+        self.__fill = 0
+        self.__frames = 0
+        self.__raw_bytes = 0
+        self.__stored_bytes = 0
+
+        # Блоки сжимаются параллельно, но записываются в файл строго по порядку
+        self.__order = threading.Condition()
+        self.__submitted_chunks = 0
+        self.__written_chunks = 0
+        self.__writer = AsyncFrameWriter(max_queue=max_queue, workers=workers, policy="block",
+                                         name=f"DepthRecorder {os.path.basename(path)}")
+        self.__closed = False
+
+        logging.info(f"[DEPTH] Depth recording {path} started. Frame {self.__shape}, chunk {self.__chunk_frames} frames")
+
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+
+    @property
+    def frames(self) -> int:
+        """Колличество записанных кадров
+
+        Returns:
+            `int`: Колличество кадров
+        """
+        return self.__frames
+
+
+    @staticmethod
+    def encode(frames: np.ndarray, level: int = 1) -> bytes:
+        """Сжатие блока кадров глубины
+
+        Args:
+            `frames (np.ndarray)`: Кадры глубины `(N, H, W)` типа `uint16`
+
+            `level (int, optional)`: Уровень сжатия `zlib`. По умолчанию `1`.
+
+        Returns:
+            `bytes`: Сжатый блок
+        """
+        # Разность соседних пикселей по строке (с переполнением uint16) и разделение старших и младших байтов
+        delta = np.empty_like(frames)
+        delta[..., 0] = frames[..., 0]
+        np.subtract(frames[..., 1:], frames[..., :-1], out=delta[..., 1:])
+        planes = delta.view(np.uint8).reshape(-1, 2).T
+        return zlib.compress(np.ascontiguousarray(planes), level)
+
+
+    @staticmethod
+    def decode(data: bytes, count: int, shape: tuple) -> np.ndarray:
+        """Распаковка блока кадров глубины
+
+        Args:
+            `data (bytes)`: Сжатый блок
+
+            `count (int)`: Колличество кадров в блоке
+
+            `shape (tuple)`: Размер кадра `(H, W)`
+
+        Returns:
+            `np.ndarray`: Кадры глубины `(N, H, W)` типа `uint16`
+        """
+        planes = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(2, -1)
+        delta = np.ascontiguousarray(planes.T).view(np.uint16).reshape((count, ) + tuple(shape))
+        return np.cumsum(delta, axis=-1, dtype=np.uint16)
+
+
+    def append(self, depth: np.ndarray, timestamp: float) -> None:
+        """Добавление кадра глубины в контейнер
+
+        Args:
+            `depth (np.ndarray)`: Кадр глубины `(H, W)` типа `uint16`
+
+            `timestamp (float)`: Время захвата кадра
+        """
+        if depth.shape != self.__shape:
+            logging.error(f"[DEPTH] Frame shape {depth.shape} does not match the recording shape {self.__shape}")
+            raise ValueError(f"[DEPTH] Frame shape {depth.shape} does not match the recording shape {self.__shape}")
+
+        np.copyto(self.__chunk[self.__fill], depth, casting="unsafe")
+        self.__stamps[self.__fill] = timestamp
+        self.__fill += 1
+        self.__frames += 1
+
+        if self.__fill == self.__chunk_frames:
+            self.__submit_chunk()
+
+
+    def __submit_chunk(self) -> None:
+        if self.__fill == 0:
+            return
+
+        frames = self.__chunk[:self.__fill].copy()
+        stamps = self.__stamps[:self.__fill].copy()
+        self.__fill = 0
+        self.__writer.submit(self.__write_chunk, self.__submitted_chunks, frames, stamps)
+        self.__submitted_chunks += 1
+
+
+    def __write_chunk(self, number: int, frames: np.ndarray, stamps: np.ndarray) -> None:
+        # Блоки кодируются параллельно, но очередь записи продвигается и при ошибке кодирования,
+        # иначе следующие блоки ожидали бы этот блок бесконечно
+        try:
+            data = self.encode(frames, self.__level)
+        except Exception as e:
+            data = None
+            logging.error(f"[DEPTH] Failed to encode chunk {number}, {len(frames)} frames are skipped: {e}")
+
+        with self.__order:
+            self.__order.wait_for(lambda: self.__written_chunks == number)
+            try:
+                if data is None:
+                    raise RuntimeError(f"[DEPTH] Chunk {number} was not encoded")
+                self.__append_chunk(data, frames, stamps)
+            finally:
+                self.__written_chunks += 1
+                self.__order.notify_all()
+
+
+    def __append_chunk(self, data: bytes, frames: np.ndarray, stamps: np.ndarray) -> None:
+        offset = self.__file.tell()
+        self.__file.write(data)
+        self.__file.flush()
+
+        index = np.empty(len(frames), dtype=self.INDEX_DTYPE)
+        index["offset"] = offset
+        index["length"] = len(data)
+        index["position"] = np.arange(len(frames))
+        index["timestamp"] = stamps
+        self.__index.write(index.tobytes())
+        self.__index.flush()
+
+        self.__raw_bytes += frames.nbytes
+        self.__stored_bytes += len(data)
+
+
+    def release(self) -> None:
+        """Запись последнего неполного блока и закрытие контейнера. Совместим с `cv2.VideoWriter.release`
+        """
+        if self.__closed:
+            return
+
+        self.__submit_chunk()
+        self.__writer.close()
+        self.__file.close()
+        self.__index.close()
+        self.__closed = True
+
+        ratio = self.__raw_bytes / self.__stored_bytes if self.__stored_bytes else 0.0
+        logging.info(f"[DEPTH] Depth recording {self.__path} finished. Frames {self.__frames}, compression ratio {ratio:.2f}")
+
+
+class DepthReader:
+    """Чтение контейнера `DepthRecorder` с произвольным доступом по номеру кадра или времени
+    """
+
+    def __init__(self, path: str, cache_chunks: bool = True):
+        """
+        Args:
+            `path (str)`: Путь файла контейнера
+
+            `cache_chunks (bool, optional)`: Хранить последний распакованный блок для последовательного чтения. По умолчанию `True`.
+        """
+
+        self.__file = open(path, "rb")
+        magic, version, height, width, chunk_frames = DepthRecorder.HEADER.unpack(
+            self.__file.read(DepthRecorder.HEADER.size))
+
+        if magic != DepthRecorder.MAGIC:
+            logging.error(f"[DEPTH] The file {path} is not a depth recording")
+            raise ValueError(f"[DEPTH] The file {path} is not a depth recording")
+
+        self.__shape = (height, width)
+        self.__chunk_frames = chunk_frames
+        self.__index = np.fromfile(f"{path}.idx", dtype=DepthRecorder.INDEX_DTYPE)
+        self.__cache_chunks = cache_chunks
+        self.__cached_offset = None
+        self.__cached_frames = None
+
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+
+    def __getitem__(self, n: int) -> np.ndarray:
+        return self.frame(n)
+
+
+    def __iter__(self) -> typing.Iterator[np.ndarray]:
+        for n in range(len(self)):
+            yield self.frame(n)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+    @property
+    def shape(self) -> tuple:
+        return self.__shape
+
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Время захвата всех кадров
+
+        Returns:
+            `np.ndarray`: Массив времен захвата
+        """
+        return self.__index["timestamp"]
+
+
+    def frame(self, n: int) -> np.ndarray:
+        """Получение кадра по номеру
+
+        Args:
+            `n (int)`: Номер кадра
+
+        Returns:
+            `np.ndarray`: Кадр глубины `(H, W)` типа `uint16`
+        """
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError(f"[DEPTH] Frame {n} is out of range, the recording contains {len(self)} frames")
+
+        record = self.__index[n]
+        offset = int(record["offset"])
+
+        if offset != self.__cached_offset:
+            # Блоки идут подряд, неполным может быть только последний блок
+            count = min(self.__chunk_frames, len(self) - (n - int(record["position"])))
+            self.__file.seek(offset)
+            frames = DepthRecorder.decode(self.__file.read(int(record["length"])), count, self.__shape)
+            if not self.__cache_chunks:
+                return frames[int(record["position"])]
+            self.__cached_offset, self.__cached_frames = offset, frames
+
+        return self.__cached_frames[int(record["position"])]
+
+
+    def frame_at(self, timestamp: float) -> tuple:
+        """Получение кадра, ближайшего к заданному времени
+
+        Args:
+            `timestamp (float)`: Время захвата
+
+        Returns:
+            `tuple`: Номер кадра. Кадр глубины
+        """
+        stamps = self.timestamps
+        n = int(np.searchsorted(stamps, timestamp))
+        if n >= len(stamps) or (n > 0 and timestamp - stamps[n - 1] <= stamps[n] - timestamp):
+            n -= 1
+        return n, self.frame(n)
+
+
+    def close(self) -> None:
+        self.__file.close()
+        self.__cached_frames = None
@@ -0,0 +1,372 @@
+import time
+import typing
+import logging
+import threading
+import pyrealsense2 as rs
+
+
+class StreamProfile(typing.NamedTuple):
+    """Профиль потока устройства: номер сенсора и профиля в `get_stream_profiles()`,
+    тип потока и формат без префикса (`color`, `z16`), исходный объект профиля librealsense
+    """
+    sensor: int
+    index: int
+    stream: str
+    width: int
+    height: int
+    format: str
+    fps: int
+    profile: typing.Any
+
+
+class DeviceInfo(typing.NamedTuple):
+    """Сведения об устройстве RealSense, полученные при перечислении
+    """
+    name: str
+    serial: str
+    product_line: str
+    firmware: str
+    sensors: tuple
+    profiles: tuple
+    device: typing.Any
+
+
+def _short_name(value: typing.Any) -> str:
+    # Перечисления librealsense выводятся как `stream.color`, `format.z16`
+    return str(value).split(".")[-1].lower()
+
+
+class ProfileIndex:
+    """Индекс профилей потоков одного устройства по `(stream, width, height, format, fps)`.
+
+    Порядок профилей в `get_stream_profiles()` зависит от прошивки, поэтому профили запрашиваются
+    по параметрам, а не по номеру. Если точного профиля нет, выбирается ближайший по разрешению и FPS.
+    """
+
+    def __init__(self, profiles: typing.Iterable[StreamProfile]):
+        """
+        Args:
+            `profiles (Iterable[StreamProfile])`: Профили устройства (`DeviceInfo.profiles`)
+        """
+        self.__profiles = tuple(profiles)
+        self.__exact = {(p.stream, p.width, p.height, p.format, p.fps): p for p in self.__profiles}
+        self.__by_stream = {}
+        for p in self.__profiles:
+            self.__by_stream.setdefault(p.stream, []).append(p)
+
+
+    def __len__(self) -> int:
+        return len(self.__profiles)
+
+
+    def streams(self) -> typing.List[str]:
+        return list(self.__by_stream)
+
+
+    def profiles(self, stream: str = None) -> typing.List[StreamProfile]:
+        """Профили потока или все профили устройства
+
+        Args:
+            `stream (str, optional)`: Тип потока `color`, `depth`, `infrared`. По умолчанию `None` - все потоки.
+
+        Returns:
+            `list`: Список `StreamProfile`
+        """
+        return list(self.__profiles if stream is None else self.__by_stream.get(stream, ()))
+
+
+    def find(self, stream: str,
+             width: int = None,
+             height: int = None,
+             format: str = None,
+             fps: int = None,
+             exact: bool = False) -> StreamProfile:
+        """Поиск профиля. Незаданные параметры не ограничивают выбор
+
+        Ближайший профиль выбирается среди профилей потока с заданным форматом: сначала по относительной разнице
+        площади кадра и соотношения сторон, затем по разнице FPS. При равенстве предпочитается большее разрешение и FPS.
+
+        Args:
+            `stream (str)`: Тип потока `color`, `depth`, `infrared`
+
+            `width (int, optional)`: Ширина кадра. По умолчанию `None`.
+
+            `height (int, optional)`: Высота кадра. По умолчанию `None`.
+
+            `format (str, optional)`: Формат `bgr8`, `rgb8`, `z16` и т.д. По умолчанию `None`.
+
+            `fps (int, optional)`: FPS. По умолчанию `None`.
+
+            `exact (bool, optional)`: Не подбирать ближайший профиль. По умолчанию `False`.
+
+        Raises:
+            `ValueError`: Вызывается, если подходящего профиля нет
+
+        Returns:
+            `StreamProfile`: Профиль потока
+        """
+        stream = _short_name(stream)
+        format = _short_name(format) if format is not None else None
+
+        profile = self.__exact.get((stream, width, height, format, fps))
+        if profile is not None:
+            return profile
+
+        candidates = [p for p in self.__by_stream.get(stream, ())
+                      if (format is None or p.format == format)
+                      and (width is None or not exact or p.width == width)
+                      and (height is None or not exact or p.height == height)
+                      and (fps is None or not exact or p.fps == fps)]
+        requested = f"{stream} {width or '*'}x{height or '*'} {format or '*'} {fps or '*'}"
+        if not candidates:
+            logging.error(f"[RS] There is no {requested} profile. Available {stream} formats: \
+{', '.join(sorted({p.format for p in self.__by_stream.get(stream, ())})) or '-'}")
+            raise ValueError(f"[RS] There is no {requested} profile")
+
+        def distance(p: StreamProfile) -> tuple:
+            area = 0.0
+            if width and height:
+                area = abs(p.width * p.height - width * height) / (width * height) + abs(p.width / p.height - width / height)
+            elif width:
+                area = abs(p.width - width) / width
+            elif height:
+                area = abs(p.height - height) / height
+            rate = abs(p.fps - fps) / fps if fps else 0.0
+            return area, rate, -p.width * p.height, -p.fps
+
+        profile = min(candidates, key=distance)
+        if width is not None or height is not None or fps is not None:
+            logging.warning(f"[RS] There is no exact {requested} profile, the nearest \
+{profile.stream} {profile.width}x{profile.height} {profile.format} {profile.fps} is selected")
+        return profile
+
+
+class DeviceRegistry:
+    """Общий для процесса реестр устройств RealSense.
+
+    Устройства перечисляются один раз: имя, серийный номер, сенсоры и профили потоков кешируются.
+    Реестр обновляется по событиям подключения и отключения librealsense (`set_devices_changed_callback`),
+    поэтому повторные `query_devices()` при создании камер не нужны. Камеры адресуются серийным номером,
+    который, в отличие от индекса, не меняется при переподключении устройств.
+
+        registry = DeviceRegistry.get()
+        registry.subscribe(lambda added, removed: print(added, removed))
+        camera = CameraRS("123456789012")
+    """
+
+    __instances = {}
+    __instances_lock = threading.Lock()
+
+    def __init__(self, backend: typing.Any = None):
+        """
+        Args:
+            `backend (module, optional)`: Реализация API `pyrealsense2`. По умолчанию `pyrealsense2`.
+        """
+        self.__rs = backend if backend is not None else rs
+        self.__lock = threading.RLock()
+        self.__devices = {}
+        self.__indexes = {}
+        self.__callbacks = []
+
+        self.__context = self.__rs.context()
+        self.refresh()
+
+        set_callback = getattr(self.__context, "set_devices_changed_callback", None)
+        if set_callback is not None:
+            set_callback(self.__on_devices_changed)
+        else:
+            logging.warning("[RS] The backend does not report device changes, call DeviceRegistry.refresh() manually")
+
+
+    @classmethod
+    def get(cls, backend: typing.Any = None) -> "DeviceRegistry":
+        """Реестр устройств процесса. Создается при первом вызове для каждой реализации API
+
+        Args:
+            `backend (module, optional)`: Реализация API `pyrealsense2`. По умолчанию `pyrealsense2`.
+
+        Returns:
+            `DeviceRegistry`: Реестр устройств
+        """
+        backend = backend if backend is not None else rs
+        with cls.__instances_lock:
+            registry = cls.__instances.get(backend)
+            if registry is None:
+                registry = cls.__instances[backend] = cls(backend)
+            return registry
+
+
+    def __len__(self) -> int:
+        return len(self.__devices)
+
+
+    def __contains__(self, serial: str) -> bool:
+        return serial in self.__devices
+
+
+    def __describe(self, device) -> DeviceInfo:
+        """Чтение сведений об устройстве, его сенсорах и профилях потоков
+
+        Args:
+            `device (rs.device)`: Устройство librealsense
+
+        Returns:
+            `DeviceInfo`: Сведения об устройстве
+        """
+        info = self.__rs.camera_info
+
+        def read(field: str) -> str:
+            try:
+                return device.get_info(getattr(info, field))
+            except Exception:
+                return ""
+
+        sensors, profiles = [], []
+        for s, sensor in enumerate(device.query_sensors()):
+            sensors.append(sensor.get_info(info.name))
+            for i, profile in enumerate(sensor.get_stream_profiles()):
+                # Профили не видеопотоков (IMU) не имеют разрешения
+                try:
+                    video = self.__rs.video_stream_profile(profile)
+                    width, height = video.width(), video.height()
+                except Exception:
+                    continue
+                profiles.append(StreamProfile(s, i, _short_name(video.stream_type()), width, height,
+                                              _short_name(video.format()), video.fps(), video))
+
+        return DeviceInfo(read("name"), read("serial_number"), read("product_line"), read("firmware_version"),
+                          tuple(sensors), tuple(profiles), device)
+
+
+    def refresh(self) -> None:
+        """Полное повторное перечисление устройств
+        """
+        start = time.perf_counter()
+        devices = {}
+        for device in self.__context.query_devices():
+            described = self.__describe(device)
+            devices[described.serial] = described
+
+        with self.__lock:
+            self.__devices = devices
+            self.__indexes = {}
+        logging.info(f"[RS] Device registry enumerated {len(devices)} devices in {(time.perf_counter() - start) * 1000:.0f} ms: \
+{', '.join(f'{d.name} #{d.serial}' for d in devices.values()) or '-'}")
+
+
+    def __on_devices_changed(self, event) -> None:
+        """Обработка события librealsense: удаление отключенных устройств и перечисление только новых
+        """
+        try:
+            with self.__lock:
+                removed = [d for d in self.__devices.values() if event.was_removed(d.device)]
+                added = [self.__describe(device) for device in event.get_new_devices()]
+
+                for device in removed + added:
+                    self.__devices.pop(device.serial, None)
+                    self.__indexes.pop(device.serial, None)
+                for device in added:
+                    self.__devices[device.serial] = device
+                callbacks = list(self.__callbacks)
+        except Exception as e:
+            logging.error(f"[RS] Failed to process the device change event: {e}")
+            return
+
+        for device in removed:
+            logging.info(f"[RS] Device {device.name} #{device.serial} disconnected")
+        for device in added:
+            logging.info(f"[RS] Device {device.name} #{device.serial} connected")
+
+        for callback in callbacks:
+            try:
+                callback(added, removed)
+            except Exception as e:
+                logging.error(f"[RS] Device change callback failed: {e}")
+
+
+    def subscribe(self, callback: typing.Callable[[list, list], None]) -> None:
+        """Подписка на подключение и отключение устройств
+
+        Args:
+            `callback (Callable)`: Функция `(added, removed)`, получающая списки `DeviceInfo`.
+            Вызывается из потока librealsense
+        """
+        with self.__lock:
+            self.__callbacks.append(callback)
+
+
+    def unsubscribe(self, callback: typing.Callable[[list, list], None]) -> None:
+        with self.__lock:
+            if callback in self.__callbacks:
+                self.__callbacks.remove(callback)
+
+
+    def devices(self) -> typing.List[DeviceInfo]:
+        """Подключенные устройства в порядке перечисления
+
+        Returns:
+            `list`: Список `DeviceInfo`
+        """
+        with self.__lock:
+            return list(self.__devices.values())
+
+
+    def serials(self) -> typing.List[str]:
+        with self.__lock:
+            return list(self.__devices)
+
+
+    def find(self, device_id: typing.Union[int, str]) -> DeviceInfo:
+        """Поиск устройства по серийному номеру или по индексу в порядке перечисления
+
+        Args:
+            `device_id (int | str)`: Серийный номер или индекс устройства
+
+        Raises:
+            `ValueError`: Вызывается, если устройство не найдено
+
+        Returns:
+            `DeviceInfo`: Сведения об устройстве
+        """
+        with self.__lock:
+            if isinstance(device_id, str):
+                device = self.__devices.get(device_id)
+                if device is None:
+                    logging.error(f"[RS] There is no device with the serial number {device_id}. Connected: {', '.join(self.__devices) or '-'}")
+                    raise ValueError(f"[RS] There is no device with the serial number {device_id}")
+                return device
+
+            devices = list(self.__devices.values())
+            if device_id >= len(devices):
+                logging.error("[RS] The transmitted id exceeds the number of connected devices")
+                raise ValueError("[RS] The transmitted id exceeds the number of connected devices")
+            if device_id < 0:
+                logging.error("[RS] The transmitted id is less than 0 (id < 0)")
+                raise ValueError("[RS] The transmitted id is less than 0 (id < 0)")
+            return devices[device_id]
+
+
+    def profiles(self, device_id: typing.Union[int, str]) -> ProfileIndex:
+        """Кешированный индекс профилей потоков устройства
+
+        Args:
+            `device_id (int | str)`: Серийный номер или индекс устройства
+
+        Returns:
+            `ProfileIndex`: Индекс профилей
+        """
+        device = self.find(device_id)
+        with self.__lock:
+            index = self.__indexes.get(device.serial)
+            if index is None:
+                index = self.__indexes[device.serial] = ProfileIndex(device.profiles)
+            return index
+
+
+    def describe(self) -> typing.List[str]:
+        """Строки `индекс. имя #серийный номер` для всех устройств
+
+        Returns:
+            `list`: Список строк
+        """
+        return [f"{i}. {device.name} #{device.serial}" for i, device in enumerate(self.devices())]
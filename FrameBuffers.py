@@ -0,0 +1,167 @@
+import time
+import typing
+import threading
+import numpy as np
+
+from .FramePacket import FramePacket
+
+
+class FrameBuffers:
+    """Заранее выделенные буферы кадров камеры для чтения из других потоков.
+
+    Буферы образуют `count` слотов, в каждом слоте по буферу на поток кадра (`color`, `depth`, `points` и т.д.).
+    Цикл камеры заполняет следующий слот (`begin`, затем `copy`, `buffer` или `put`) и публикует его (`commit`).
+    Читатели получают неизменяемые представления последнего опубликованного слота с номером версии (`latest`).
+    Представления остаются неизменными, пока не опубликованы еще `count - 1` кадров; `valid` проверяет,
+    не начата ли перезапись слота.
+
+        buffers.begin()
+        color = buffers.copy("color", np.asanyarray(color_f.get_data()))
+        buffers.commit(capture_time)
+        color, = buffers.latest("color")
+    """
+
+    def __init__(self, count: int = 3):
+        """
+        Args:
+            `count (int, optional)`: Колличество слотов, не меньше 2. По умолчанию `3`.
+        """
+        self.__count = max(2, count)
+        self.__lock = threading.Lock()
+        # Для каждого слота: имя потока -> (буфер, неизменяемое представление буфера)
+        self.__arrays = [{} for _ in range(self.__count)]
+        # Представления, записанные в слот при последнем заполнении
+        self.__views = [{} for _ in range(self.__count)]
+        self.__versions = [-1] * self.__count
+        self.__timestamps = [0.0] * self.__count
+        self.__writing = 0
+        self.__published = -1
+        self.__version = -1
+
+
+    def __len__(self) -> int:
+        return self.__count
+
+
+    @property
+    def version(self) -> int:
+        """Номер последней опубликованной версии. `-1`, если кадров еще не было
+        """
+        return self.__version
+
+
+    @staticmethod
+    def __readonly(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+
+    def begin(self) -> None:
+        """Начало записи кадра в следующий слот. Слот помечается как перезаписываемый
+        """
+        with self.__lock:
+            self.__writing = (self.__published + 1) % self.__count
+            self.__versions[self.__writing] = -1
+            self.__views[self.__writing] = {}
+
+
+    def buffer(self, name: str, shape: tuple, dtype: typing.Any = np.uint8) -> np.ndarray:
+        """Буфер потока в заполняемом слоте для записи результата (`out=`). Выделяется при первом запросе или смене размера
+
+        Args:
+            `name (str)`: Имя потока
+
+            `shape (tuple)`: Размер массива
+
+            `dtype (np.dtype, optional)`: Тип массива. По умолчанию `np.uint8`.
+
+        Returns:
+            `np.ndarray`: Изменяемый буфер
+        """
+        arrays = self.__arrays[self.__writing]
+        entry = arrays.get(name)
+        if entry is None or entry[0].shape != tuple(shape) or entry[0].dtype != dtype:
+            array = np.empty(shape, dtype=dtype)
+            entry = arrays[name] = (array, self.__readonly(array))
+        self.__views[self.__writing][name] = entry[1]
+        return entry[0]
+
+
+    def copy(self, name: str, source: np.ndarray) -> np.ndarray:
+        """Копирование массива в буфер потока заполняемого слота. Исходный массив можно освободить сразу после вызова
+
+        Args:
+            `name (str)`: Имя потока
+
+            `source (np.ndarray)`: Массив, например данные кадра librealsense
+
+        Returns:
+            `np.ndarray`: Изменяемый буфер с копией
+        """
+        array = self.buffer(name, source.shape, source.dtype)
+        np.copyto(array, source)
+        return array
+
+
+    def put(self, name: str, array: np.ndarray) -> np.ndarray:
+        """Публикация в заполняемом слоте уже скопированного массива без повторного копирования
+
+        Args:
+            `name (str)`: Имя потока
+
+            `array (np.ndarray)`: Массив, не связанный с буферами источника
+
+        Returns:
+            `np.ndarray`: Тот же массив
+        """
+        self.__views[self.__writing][name] = self.__readonly(array)
+        return array
+
+
+    def commit(self, timestamp: float = None) -> int:
+        """Публикация заполненного слота
+
+        Args:
+            `timestamp (float, optional)`: Время захвата кадра. По умолчанию `time.time()`.
+
+        Returns:
+            `int`: Номер версии кадра
+        """
+        with self.__lock:
+            self.__version += 1
+            self.__versions[self.__writing] = self.__version
+            self.__timestamps[self.__writing] = time.time() if timestamp is None else timestamp
+            self.__published = self.__writing
+            return self.__version
+
+
+    def latest(self, *names: str) -> typing.Optional[FramePacket]:
+        """Неизменяемые представления последнего опубликованного кадра
+
+        Args:
+            `*names (str)`: Имена потоков
+
+        Returns:
+            `FramePacket | None`: Представления потоков (`None` для потока, не записанного в этот кадр) с номером версии в `seq`.
+            `None`, если кадров еще не было
+        """
+        with self.__lock:
+            if self.__published < 0:
+                return None
+            views = self.__views[self.__published]
+            return FramePacket(tuple(views.get(name) for name in names),
+                               self.__timestamps[self.__published], self.__versions[self.__published])
+
+
+    def valid(self, packet: FramePacket) -> bool:
+        """Не начата ли перезапись слота, из которого получен кадр
+
+        Args:
+            `packet (FramePacket)`: Результат `latest`
+
+        Returns:
+            `bool`: Представления кадра не изменялись
+        """
+        with self.__lock:
+            return packet.seq >= 0 and packet.seq in self.__versions
@@ -0,0 +1,226 @@
+import time
+import typing
+import logging
+import threading
+import numpy as np
+
+
+class LatestFrame:
+    """Слот, хранящий только самый свежий кадр. Запись не блокируется,
+    предыдущий непрочитанный кадр перезаписывается и учитывается как пропущенный.
+    """
+
+    def __init__(self):
+        self.__cond = threading.Condition(threading.Lock())
+        self.__frame = None
+        self.__seq = -1
+        self.__timestamp = 0.0
+        self.__read_seq = -1
+        self.__dropped = 0
+
+
+    @property
+    def seq(self) -> int:
+        return self.__seq
+
+
+    @property
+    def dropped(self) -> int:
+        """Колличество кадров, перезаписанных до чтения
+
+        Returns:
+            `int`: Колличество пропущенных кадров
+        """
+        return self.__dropped
+
+
+    def put(self, frame: np.ndarray, timestamp: float = None) -> int:
+        """Запись нового кадра в слот
+
+        Args:
+            `frame (np.ndarray)`: Кадр
+
+            `timestamp (float, optional)`: Время захвата кадра. По умолчанию `time.time()`
+
+        Returns:
+            `int`: Номер последовательности кадра
+        """
+        with self.__cond:
+            if self.__seq > self.__read_seq:
+                self.__dropped += 1
+            self.__frame = frame
+            self.__seq += 1
+            self.__timestamp = time.time() if timestamp is None else timestamp
+            self.__cond.notify_all()
+            return self.__seq
+
+
+    def get(self, timeout: float = None) -> typing.Optional[tuple]:
+        """Ожидание кадра, новее последнего прочитанного
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+
+        Returns:
+            `tuple | None`: Кадр, номер последовательности, время захвата. `None` по истечении `timeout`
+        """
+        with self.__cond:
+            if not self.__cond.wait_for(lambda: self.__seq > self.__read_seq, timeout):
+                return None
+            self.__read_seq = self.__seq
+            return self.__frame, self.__seq, self.__timestamp
+
+
+    def peek(self) -> typing.Optional[tuple]:
+        """Получение последнего кадра без ожидания и без отметки о прочтении
+
+        Returns:
+            `tuple | None`: Кадр, номер последовательности, время захвата
+        """
+        with self.__cond:
+            if self.__seq < 0:
+                return None
+            return self.__frame, self.__seq, self.__timestamp
+
+
+class FrameGrabber(threading.Thread):
+    """Фоновый поток, непрерывно вычитывающий кадры из `cv2.VideoCapture`.
+
+    Буфер FFmpeg не переполняется при медленной обработке, а цикл обработки
+    всегда получает последний декодированный кадр.
+
+    Поток владеет захватом: `release()` захвата вызывается потоком после выхода из `read()`,
+    чтобы захват не освобождался во время чтения из другого потока.
+    """
+
+    def __init__(self, capture, name: str = "FrameGrabber"):
+        """
+        Args:
+            `capture (cv2.VideoCapture)`: Захваченная камера OpenCV
+
+            `name (str, optional)`: Имя потока. По умолчанию `FrameGrabber`.
+        """
+        super(FrameGrabber, self).__init__(name=name, daemon=True)
+
+        self.__capture = capture
+        self.__slot = LatestFrame()
+        self.__running = threading.Event()
+        self.__grabbed = 0
+        self.__failures = 0
+        self.__release_lock = threading.Lock()
+        self.__released = False
+
+
+    @property
+    def grabbed(self) -> int:
+        """Колличество кадров, полученных с камеры
+
+        Returns:
+            `int`: Колличество кадров
+        """
+        return self.__grabbed
+
+
+    @property
+    def dropped(self) -> int:
+        """Колличество кадров, которые цикл обработки не успел забрать
+
+        Returns:
+            `int`: Колличество пропущенных кадров
+        """
+        return self.__slot.dropped
+
+
+    @property
+    def failures(self) -> int:
+        """Колличество неудачных попыток чтения кадра
+
+        Returns:
+            `int`: Колличество ошибок чтения
+        """
+        return self.__failures
+
+
+    def start(self) -> None:
+        self.__running.set()
+        super(FrameGrabber, self).start()
+
+
+    def run(self) -> None:
+        try:
+            while self.__running.is_set():
+                ret, frame = self.__capture.read()
+
+                if not ret:
+                    self.__failures += 1
+                    time.sleep(0.005)
+                    continue
+
+                self.__grabbed += 1
+                self.__slot.put(frame)
+        finally:
+            self.__release()
+
+
+    def __release(self) -> None:
+        """Однократное освобождение захвата, если он поддерживает `release()`
+        """
+        with self.__release_lock:
+            if self.__released:
+                return
+            self.__released = True
+        release = getattr(self.__capture, "release", None)
+        if release is not None:
+            release()
+
+
+    def read_frame(self, timeout: float = None) -> typing.Optional[tuple]:
+        """Получение последнего кадра вместе с номером последовательности и временем захвата
+
+        Args:
+            `timeout (float, optional)`: Время ожидания нового кадра в секундах. По умолчанию `None`.
+
+        Returns:
+            `tuple | None`: Кадр, номер последовательности, время захвата. `None` по истечении `timeout`
+        """
+        return self.__slot.get(timeout)
+
+
+    def read(self, timeout: float = None) -> tuple:
+        """Получение последнего кадра. Совместим с `cv2.VideoCapture.read()`
+
+        Args:
+            `timeout (float, optional)`: Время ожидания нового кадра в секундах. По умолчанию `None`.
+
+        Returns:
+            `tuple`: Статус получения кадра. Кадр
+        """
+        frame = self.__slot.get(timeout)
+        if frame is None:
+            return False, None
+        return True, frame[0]
+
+
+    def stop(self, timeout: float = 1.0) -> bool:
+        """Остановка потока захвата. Захват освобождается потоком после завершения текущего `read()`
+
+        Args:
+            `timeout (float, optional)`: Время ожидания завершения потока в секундах. По умолчанию `1`.
+
+        Returns:
+            `bool`: Поток завершен и захват освобожден. `False`, если поток еще ожидает `read()`
+            и освободит захват сам после его завершения
+        """
+        self.__running.clear()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+        stopped = not self.is_alive()
+        if stopped:
+            # Поток мог не запускаться
+            self.__release()
+        else:
+            logging.warning(f"[GRAB] Grabber is still waiting for a read after {timeout} s, "
+                            f"the capture will be released when the read returns")
+        logging.info(f"[GRAB] Grabber stopped. Grabbed {self.__grabbed}, dropped {self.dropped}, read failures {self.__failures}")
+        return stopped
@@ -0,0 +1,51 @@
+import time
+
+
+class FramePacket(tuple):
+    """Кадр, передаваемый между процессами: кортеж массивов `(color, )` или `(color, depth)`
+    с номером последовательности и временем захвата.
+
+    Остается совместимым с кортежем, который ранее передавался через `Pipe`:
+    `packet[0]`, `len(packet)` работают как прежде.
+    """
+
+    def __new__(cls, arrays: tuple, timestamp: float = None, seq: int = -1):
+        """
+        Args:
+            `arrays (tuple)`: Массивы кадра
+
+            `timestamp (float, optional)`: Время захвата кадра (`time.time()`). По умолчанию текущее время.
+
+            `seq (int, optional)`: Номер последовательности кадра. По умолчанию `-1`.
+        """
+        packet = super(FramePacket, cls).__new__(cls, arrays)
+        packet.timestamp = time.time() if timestamp is None else timestamp
+        packet.seq = seq
+        return packet
+
+
+    def __reduce__(self):
+        return (FramePacket, (tuple(self), self.timestamp, self.seq))
+
+
+    def __repr__(self) -> str:
+        shapes = ", ".join(str(getattr(array, "shape", None)) for array in self)
+        return f"FramePacket(seq={self.seq}, timestamp={self.timestamp:.6f}, shapes=[{shapes}])"
+
+
+    @staticmethod
+    def timestamp_of(packet: tuple, default: float = None) -> float:
+        """Время захвата кадра. Для обычного кортежа возвращается `default` или текущее время
+
+        Args:
+            `packet (tuple)`: Кадр
+
+            `default (float, optional)`: Время по умолчанию. По умолчанию `None`.
+
+        Returns:
+            `float`: Время захвата
+        """
+        timestamp = getattr(packet, "timestamp", None)
+        if timestamp is None:
+            timestamp = time.time() if default is None else default
+        return timestamp
@@ -0,0 +1,191 @@
+import time
+import typing
+import logging
+import collections
+import numpy as np
+
+from .FramePacket import FramePacket
+
+
+class FrameSynchronizer:
+    """Сопоставление кадров нескольких камер по времени захвата.
+
+    Приемники (`Pipe` или `SharedFrameRing`) опрашиваются без блокировки, кадры буферизуются
+    по камерам. Набор кадров выдается, когда разброс времени захвата не превышает `tolerance`,
+    иначе самый старый кадр отбрасывается. Медленная или зависшая камера не блокирует остальные.
+
+    Кадры `SharedFrameRing` копируются при чтении: представления разделяемой памяти были бы перезаписаны
+    передатчиком, пока кадр ждет пары, и набор показал бы другой кадр, чем его время захвата.
+    """
+
+    def __init__(self, *receivers, tolerance: float = 0.033, max_buffer: int = 4):
+        """
+        Args:
+            `*receivers (Pipe | SharedFrameRing)`: Приемники кадров камер
+
+            `tolerance (float, optional)`: Допустимый разброс времени захвата в секундах. По умолчанию `0.033`.
+
+            `max_buffer (int, optional)`: Максимальное колличество ожидающих кадров одной камеры. По умолчанию `4`.
+        """
+
+        self.__receivers = receivers
+        self.__tolerance = tolerance
+        self.__buffers = [collections.deque() for _ in receivers]
+        self.__max_buffer = max(1, max_buffer)
+        self.__closed = [False] * len(receivers)
+
+        self.__received = [0] * len(receivers)
+        self.__dropped = [0] * len(receivers)
+        self.__matched = 0
+        self.__skew_sum = 0.0
+        self.__skew_max = 0.0
+        self.__skew_last = 0.0
+
+
+    @property
+    def tolerance(self) -> float:
+        return self.__tolerance
+
+
+    def __drain(self) -> bool:
+        """Чтение всех доступных кадров без блокировки
+
+        Returns:
+            `bool`: Были ли получены новые кадры
+        """
+        received = False
+
+        for i, receiver in enumerate(self.__receivers):
+            if self.__closed[i]:
+                continue
+
+            try:
+                while receiver.poll():
+                    packet = self.__recv(receiver)
+                    if packet is None:
+                        break
+
+                    self.__buffers[i].append((FramePacket.timestamp_of(packet), packet))
+                    self.__received[i] += 1
+                    received = True
+
+                    if len(self.__buffers[i]) > self.__max_buffer:
+                        self.__buffers[i].popleft()
+                        self.__dropped[i] += 1
+            except (EOFError, OSError):
+                self.__closed[i] = True
+                logging.warning(f"[SYNC] Receiver {i} has been closed")
+
+        return received
+
+
+    @staticmethod
+    def __recv(receiver) -> typing.Any:
+        """Получение кадра приемника без ожидания. Кадр кольца копируется из разделяемой памяти
+
+        Args:
+            `receiver (Pipe | SharedFrameRing)`: Приемник кадров
+
+        Returns:
+            `FramePacket | None`: Кадр
+        """
+        if hasattr(receiver, "recv_frame"):
+            frame = receiver.recv_frame(timeout=0.0, copy=True)
+            if frame is None:
+                return None
+            arrays, seq, timestamp = frame
+            return FramePacket(arrays, timestamp, seq)
+        return receiver.recv()
+
+
+    def __match(self) -> typing.Optional[list]:
+        while all(self.__buffers):
+            stamps = [buffer[0][0] for buffer in self.__buffers]
+            oldest, newest = min(stamps), max(stamps)
+
+            if newest - oldest <= self.__tolerance:
+                skew = newest - oldest
+                self.__matched += 1
+                self.__skew_sum += skew
+                self.__skew_max = max(self.__skew_max, skew)
+                self.__skew_last = skew
+                return [buffer.popleft()[1] for buffer in self.__buffers]
+
+            # Кадр без пары в окне допуска отбрасывается
+            i = int(np.argmin(stamps))
+            self.__buffers[i].popleft()
+            self.__dropped[i] += 1
+
+        return None
+
+
+    def poll(self) -> typing.Optional[list]:
+        """Один шаг синхронизации без блокировки
+
+        Returns:
+            `list | None`: Набор кадров (по одному на камеру) или `None`, если совпадений пока нет
+        """
+        self.__drain()
+        return self.__match()
+
+
+    def latest(self) -> list:
+        """Последние полученные кадры камер без сопоставления по времени, например когда одна из камер зависла
+
+        Returns:
+            `list`: Последний ожидающий кадр каждой камеры или `None`, если кадров камеры нет
+        """
+        self.__drain()
+        return [buffer[-1][1] if buffer else None for buffer in self.__buffers]
+
+
+    def recv(self, timeout: float = None) -> typing.Optional[list]:
+        """Ожидание следующего набора синхронизированных кадров
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+
+        Returns:
+            `list | None`: Набор кадров или `None` по истечении `timeout`
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            frames = self.poll()
+            if frames is not None:
+                return frames
+            if all(self.__closed) or (deadline is not None and time.monotonic() >= deadline):
+                return None
+            time.sleep(0.001)
+
+
+    def sets(self, timeout: float = None) -> typing.Iterator[list]:
+        """Итератор наборов синхронизированных кадров для многокамерной обработки
+
+        Args:
+            `timeout (float, optional)`: Максимальное время ожидания набора в секундах. По умолчанию `None`.
+
+        Yields:
+            `list`: Набор кадров `FramePacket` (по одному на камеру)
+        """
+        while True:
+            frames = self.recv(timeout)
+            if frames is None:
+                return
+            yield frames
+
+
+    def stats(self) -> dict:
+        """Статистика синхронизации
+
+        Returns:
+            `dict`: Колличество наборов, полученные и отброшенные кадры по камерам, разброс времени в миллисекундах
+        """
+        return {
+            "matched": self.__matched,
+            "received": list(self.__received),
+            "dropped": list(self.__dropped),
+            "skew_last_ms": self.__skew_last * 1000,
+            "skew_avg_ms": self.__skew_sum / max(1, self.__matched) * 1000,
+            "skew_max_ms": self.__skew_max * 1000,
+        }
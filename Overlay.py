@@ -0,0 +1,160 @@
+import cv2
+import typing
+import numpy as np
+
+
+class Overlay:
+    """Слой наложения HUD (текст, перекрестие центрирования) с кешированием отрисовки.
+
+    Каждый элемент хранится как прямоугольный фрагмент цвета и маска прозрачности. Перекрестие
+    отрисовывается один раз для разрешения кадра, текст - только при изменении его значения.
+    При наложении смешиваются только пиксели внутри прямоугольника элемента.
+    """
+
+    def __init__(self):
+        self.__elements = {}
+        self.__values = {}
+        self.__buffer = None
+
+
+    def __bool__(self) -> bool:
+        return bool(self.__elements)
+
+
+    @staticmethod
+    def __element(mask: np.ndarray, color: tuple) -> typing.Optional[tuple]:
+        """Обрезка маски до ограничивающего прямоугольника и подготовка фрагментов для смешивания
+
+        Args:
+            `mask (np.ndarray)`: Маска прозрачности элемента `0..255`
+
+            `color (tuple)`: Цвет элемента BGR
+
+        Returns:
+            `tuple | None`: Прямоугольник `(y0, y1, x0, x1)`, цвет умноженный на прозрачность, обратная прозрачность
+        """
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if len(rows) == 0:
+            return None
+
+        y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+        alpha = mask[y0:y1, x0:x1, None].astype(np.uint16)
+        premultiplied = alpha * np.array(color, dtype=np.uint16) + 127
+        return (y0, y1, x0, x1), premultiplied, 255 - alpha
+
+
+    def crosshair(self, shape: tuple, color: tuple = (0, 0, 255), thickness: int = 2) -> None:
+        """Перекрестие по центру кадра. Отрисовывается заново только при смене разрешения или цвета
+
+        Args:
+            `shape (tuple)`: Размер кадра `(H, W)`
+
+            `color (tuple, optional)`: Цвет линий BGR. По умолчанию `(0, 0, 255)`.
+
+            `thickness (int, optional)`: Толщина линий. По умолчанию `2`.
+        """
+        h, w = shape[:2]
+        value = (h, w, color, thickness)
+        if self.__values.get("crosshair") == value:
+            return
+
+        mask = np.zeros((h, w), dtype=np.uint8)
+        vertical, horizontal = mask.copy(), mask
+        cv2.line(vertical, (int(w/2), 0), (int(w/2), h), 255, thickness)
+        cv2.line(horizontal, (0, int(h/2)), (w, int(h/2)), 255, thickness)
+
+        self.__elements["crosshair_v"] = self.__element(vertical, color)
+        self.__elements["crosshair_h"] = self.__element(horizontal, color)
+        self.__values["crosshair"] = value
+
+
+    def text(self, key: str, text: str, org: tuple,
+             color: tuple = (0, 0, 0),
+             font: int = cv2.FONT_HERSHEY_COMPLEX_SMALL,
+             scale: float = 1,
+             thickness: int = 1) -> None:
+        """Текстовая надпись. Отрисовывается заново только при изменении текста или параметров
+
+        Args:
+            `key (str)`: Имя надписи
+
+            `text (str)`: Текст
+
+            `org (tuple)`: Левый нижний угол текста `(x, y)`
+
+            `color (tuple, optional)`: Цвет текста BGR. По умолчанию `(0, 0, 0)`.
+
+            `font (int, optional)`: Шрифт OpenCV. По умолчанию `cv2.FONT_HERSHEY_COMPLEX_SMALL`.
+
+            `scale (float, optional)`: Масштаб шрифта. По умолчанию `1`.
+
+            `thickness (int, optional)`: Толщина линий шрифта. По умолчанию `1`.
+        """
+        value = (text, org, color, font, scale, thickness)
+        if self.__values.get(key) == value:
+            return
+
+        (width, height), baseline = cv2.getTextSize(text, font, scale, thickness)
+        x, y = org
+        mask = np.zeros((y + baseline + thickness + 1, x + width + thickness + 1), dtype=np.uint8)
+        cv2.putText(mask, text, org, font, scale, 255, thickness)
+
+        self.__elements[key] = self.__element(mask, color)
+        self.__values[key] = value
+
+
+    def remove(self, key: str) -> None:
+        """Удаление элемента
+
+        Args:
+            `key (str)`: Имя элемента (`crosshair` для перекрестия)
+        """
+        if key == "crosshair":
+            self.__elements.pop("crosshair_v", None)
+            self.__elements.pop("crosshair_h", None)
+        self.__elements.pop(key, None)
+        self.__values.pop(key, None)
+
+
+    def clear(self) -> None:
+        self.__elements.clear()
+        self.__values.clear()
+
+
+    def apply(self, frame: np.ndarray, copy: bool = False) -> np.ndarray:
+        """Наложение элементов на кадр
+
+        Args:
+            `frame (np.ndarray)`: Кадр BGR
+
+            `copy (bool, optional)`: Наложить на копию кадра во внутреннем буфере, не изменяя исходный кадр.
+            Буфер перезаписывается следующим вызовом. По умолчанию `False`.
+
+        Returns:
+            `np.ndarray`: Кадр с наложенными элементами
+        """
+        if copy:
+            if self.__buffer is None or self.__buffer.shape != frame.shape:
+                self.__buffer = np.empty_like(frame)
+            np.copyto(self.__buffer, frame)
+            frame = self.__buffer
+
+        height, width = frame.shape[:2]
+        for element in self.__elements.values():
+            if element is None:
+                continue
+
+            (y0, y1, x0, x1), premultiplied, inverse = element
+            if y0 >= height or x0 >= width:
+                continue
+            y1, x1 = min(y1, height), min(x1, width)
+
+            # frame = (frame * (255 - alpha) + color * alpha) / 255
+            region = frame[y0:y1, x0:x1]
+            blended = region * inverse[:y1 - y0, :x1 - x0]
+            blended += premultiplied[:y1 - y0, :x1 - x0]
+            blended //= 255
+            region[:] = blended
+
+        return frame
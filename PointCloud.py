@@ -0,0 +1,112 @@
+import typing
+import logging
+import numpy as np
+
+
+class PointCloud:
+    """Организованное облако точек XYZ `(H, W, 3)` в метрах из кадра глубины z16.
+
+    Лучи депроекции всех пикселей вычисляются один раз по внутренним параметрам потока
+    и уже умножены на масштаб глубины, поэтому на кадр приходится одно векторное умножение
+    `rays * depth` в заранее выделенный буфер. Пиксели без глубины дают точку `(0, 0, 0)`, как `rs.pointcloud`.
+
+    Результат записывается в кольцо из `buffers` буферов: выданное облако остается неизменным,
+    пока не будут вычислены следующие `buffers - 1` облака.
+    """
+
+    def __init__(self, intrinsics: typing.Any, depth_scale: float = 0.001, buffers: int = 2):
+        """
+        Args:
+            `intrinsics (rs.intrinsics)`: Внутренние параметры потока глубины или цвета при выравнивании глубины:
+            `width`, `height`, `ppx`, `ppy`, `fx`, `fy`, `model`, `coeffs`
+
+            `depth_scale (float, optional)`: Метров в одной единице z16. По умолчанию `0.001`.
+
+            `buffers (int, optional)`: Колличество буферов результата. По умолчанию `2`.
+        """
+        self.__shape = (intrinsics.height, intrinsics.width)
+        self.__rays = self.__ray_grid(intrinsics) * np.float32(depth_scale)
+        self.__buffers = [np.empty(self.__shape + (3, ), dtype=np.float32) for _ in range(max(1, buffers))]
+        self.__index = 0
+
+
+    @classmethod
+    def from_profile(cls, profile: typing.Any, depth_scale: float = 0.001, buffers: int = 2) -> "PointCloud":
+        """Облако точек для видеопотока
+
+        Args:
+            `profile (rs.video_stream_profile)`: Профиль потока, внутренние параметры которого определяют лучи
+
+            `depth_scale (float, optional)`: Метров в одной единице z16. По умолчанию `0.001`.
+
+            `buffers (int, optional)`: Колличество буферов результата. По умолчанию `2`.
+
+        Returns:
+            `PointCloud`: Облако точек
+        """
+        return cls(profile.get_intrinsics(), depth_scale, buffers)
+
+
+    @staticmethod
+    def __ray_grid(intrinsics: typing.Any) -> np.ndarray:
+        """Лучи депроекции `(x, y, 1)` для каждого пикселя, как в `rs2_deproject_pixel_to_point`
+
+        Args:
+            `intrinsics (rs.intrinsics)`: Внутренние параметры потока
+
+        Returns:
+            `np.ndarray`: Массив `(H, W, 3)` float32
+        """
+        width, height = intrinsics.width, intrinsics.height
+        x = (np.arange(width, dtype=np.float64) - intrinsics.ppx) / intrinsics.fx
+        y = (np.arange(height, dtype=np.float64) - intrinsics.ppy) / intrinsics.fy
+        x, y = np.meshgrid(x, y)
+
+        model = str(intrinsics.model).split(".")[-1].lower()
+        coeffs = list(getattr(intrinsics, "coeffs", None) or [0.0] * 5)
+        if model == "inverse_brown_conrady" and any(coeffs):
+            r2 = x * x + y * y
+            f = 1 + coeffs[0] * r2 + coeffs[1] * r2 * r2 + coeffs[4] * r2 * r2 * r2
+            x, y = (x * f + 2 * coeffs[2] * x * y + coeffs[3] * (r2 + 2 * x * x),
+                    y * f + 2 * coeffs[3] * x * y + coeffs[2] * (r2 + 2 * y * y))
+        elif model not in ("none", "inverse_brown_conrady") and any(coeffs):
+            logging.warning(f"[RS] Distortion model '{model}' is not supported by the point cloud, the pinhole model is used")
+
+        rays = np.empty((height, width, 3), dtype=np.float32)
+        rays[..., 0] = x
+        rays[..., 1] = y
+        rays[..., 2] = 1.0
+        return rays
+
+
+    @property
+    def shape(self) -> tuple:
+        """Размер кадра глубины `(H, W)`
+        """
+        return self.__shape
+
+
+    def compute(self, depth: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Вычисление облака точек
+
+        Args:
+            `depth (np.ndarray)`: Кадр глубины z16 размера `shape`
+
+            `out (np.ndarray, optional)`: Буфер результата `(H, W, 3)` float32, например слот `SharedFrameRing`.
+            По умолчанию следующий внутренний буфер.
+
+        Raises:
+            `ValueError`: Вызывается, если размер кадра не совпадает с параметрами потока
+
+        Returns:
+            `np.ndarray`: Точки `(H, W, 3)` float32 в метрах
+        """
+        if depth.shape != self.__shape:
+            logging.error(f"[RS] Depth shape {depth.shape} does not match the point cloud shape {self.__shape}")
+            raise ValueError(f"[RS] Depth shape {depth.shape} does not match the point cloud shape {self.__shape}")
+
+        if out is None:
+            out = self.__buffers[self.__index]
+            self.__index = (self.__index + 1) % len(self.__buffers)
+
+        return np.multiply(self.__rays, depth[..., None], out=out)
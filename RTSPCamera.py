@@ -5,11 +5,22 @@ import time
 import typing
 import logging
 import datetime
+import threading
 import numpy as np
 
-from multiprocessing import Barrier, Pipe
+from multiprocessing import Barrier, Event, Pipe, Value
+from concurrent.futures import ThreadPoolExecutor
 
 from .BaseСamera import BaseCamera
+from .FrameGrabber import FrameGrabber
+from .CaptureProfiles import open_capture
+from .AsyncCapture import iterate_in_executor
+from .FramePacket import FramePacket
+from .Overlay import Overlay
+from .StreamStats import StreamStats
+from .AsyncFrameWriter import AsyncFrameWriter
+from .SegmentedVideoWriter import SegmentedVideoWriter
+from .SharedMemoryRing import SharedFrameRing
 
 
 class Camera(BaseCamera):
@@ -31,7 +42,8 @@ class Camera(BaseCamera):
 
     def __init__(self,
                  device_id: typing.Union[int, str],
-                 mode: str = "stream"):
+                 mode: str = "stream",
+                 capture_factory: typing.Callable = None):
         """
         Args:
             `device_id (int | str)`: ID камеры
@@ -41,6 +53,9 @@ class Camera(BaseCamera):
             `video` - Запись потокового вывода с камеры в видео файл
             `frame` - Запись кадров потокового вывода с камеры в файл
             `centring` - Центрирование кадра
+            
+            `capture_factory (Callable, optional)`: Фабрика источника кадров `device_id -> cv2.VideoCapture`.
+            Например `SyntheticCapture.factory()` для работы без камеры. По умолчанию `cv2.VideoCapture`.
         """
         # Создание базовой конфугурации логировния информации
         logging.basicConfig(level=logging.INFO, 
@@ -57,8 +72,20 @@ class Camera(BaseCamera):
         self.__id = self.__valid_id(device_id) if isinstance(device_id, str) else device_id
         self.__mode = mode.lower()
         self.__flag = True
+        self.__capture_factory = capture_factory
+        self.__capture_profile = None
+
+        self.__frame = None
+        self.__grabber = None
+        self.__disk_writer = None
+        self.__failed = False
+        self.__overlay = Overlay()
+        self.__stats = StreamStats(f"[CCTV] Camera {self.__device_id}")
 
-        self.__frame = np.ndarray
+        self.__resize_buffer = None
+        self.__resize_cost = 0.0
+        self.__resize_skipped = 0
+        self.__source_fps = 0.0
 
         logging.info(f"[CCTV] Camera using {self.__device_id} camera id. Operating mode '{self.__mode}'")
     
@@ -67,10 +94,46 @@ class Camera(BaseCamera):
         return f"[CCTV] Camera using '{self.__device_id}' camera id.\nOperating mode '{self.__mode}'"
     
 
-    def get_frame(self):
+    def get_frame(self) -> typing.Optional[np.ndarray]:
+        """Последний обработанный кадр без ожидания. Для получения каждого нового кадра используйте `frames()`
+
+        Returns:
+            `np.ndarray | None`: Кадр или `None`, если камера еще не получила ни одного кадра
+        """
         return self.__frame
 
 
+    @property
+    def failed(self) -> bool:
+        """Завершилась ли последняя работа камеры из-за ошибки
+
+        Returns:
+            `bool`: Признак аварийного завершения
+        """
+        return self.__failed
+
+
+    @property
+    def dropped_frames(self) -> int:
+        """Колличество кадров, пропущенных циклом обработки при фоновом захвате (`threaded_capture=True`)
+
+        Returns:
+            `int`: Колличество пропущенных кадров
+        """
+        return self.__grabber.dropped if self.__grabber else 0
+
+
+    def stats(self) -> dict:
+        """Статистика работы камеры: FPS, пропущенные и повторные кадры, колличество переподключений (`reconnects`)
+        и время без потока (`downtime_s`), длительность этапов обработки кадра
+        (`read`, `resize`, `save`, `overlay`, `write`, `send`, `show`, `waitkey`). Этапы измеряются при `stream(collect_stats=True)`
+
+        Returns:
+            `dict`: Статистика последнего запуска `stream`
+        """
+        return self.__stats.summary()
+
+
     @property
     def device_id(self) -> typing.Union[int, str]:
         """Получение текущего ID камеры
@@ -125,8 +188,11 @@ class Camera(BaseCamera):
         self.__mode = mode
     
 
-    def _video_writer(self, path: str, fps: int, frame: np.ndarray):
-        """Обертка для cv2.VideoWriter с назначеним папки и текущего фпс
+    def _video_writer(self, path: str, fps: int, frame: np.ndarray,
+                      segment_duration: float = None,
+                      segment_size: int = None,
+                      storage_quota: int = None):
+        """Обертка для SegmentedVideoWriter с назначеним папки и текущего фпс
 
         Args:
             `path (str)`: Путь сохранения файла
@@ -135,17 +201,26 @@ class Camera(BaseCamera):
             
             `frame (np.ndarray)`: Текущий кадр
             
+            `segment_duration (float, optional)`: Длительность сегмента в секундах. По умолчанию `None`.
+            
+            `segment_size (int, optional)`: Максимальный размер сегмента в байтах. По умолчанию `None`.
+            
+            `storage_quota (int, optional)`: Максимальный суммарный размер сегментов в байтах. По умолчанию `None`.
+            
         Returns:
-            `cv2.VideoWriter`: Объект для записи видео в файл
+            `SegmentedVideoWriter`: Объект для записи видео в файл
             
         """
         
         width = frame.shape[1]
         height = frame.shape[0]     
-        writer = cv2.VideoWriter(
-                f"{path}/Camera_{self.__id}_{self.__mode}/camera_{self.__id} {width}x{height}.avi",
-                cv2.VideoWriter_fourcc(*"MJPG"),
-                fps, (width, height), True
+        writer = SegmentedVideoWriter(
+                f"{path}/Camera_{self.__id}_{self.__mode}",
+                f"camera_{self.__id} {width}x{height}",
+                fps, "MJPG",
+                segment_duration=segment_duration,
+                segment_size=segment_size,
+                storage_quota=storage_quota
             )
         
         return writer
@@ -168,23 +243,29 @@ class Camera(BaseCamera):
             `counter (int)`: Колличество сохраненных кадров
 
         Returns:
-            `tuple`: Текущий кадр с надписями о времени и колличестве сохраненных кадров.
-            Колличество сохраненных кадров. Обновленное время с последнего кадра
+            `tuple`: Текущий кадр. Колличество сохраненных кадров. Обновленное время с последнего кадра.
+            Надписи о времени и колличестве сохраненных кадров добавляются в слой наложения
         """
         current_time = time_out - (time.time() - start_time)
                     
         if current_time <= 0:
-            cv2.imwrite(f"{path}/Camera_{self.__id}_{self.__mode}/{counter}.png", frame)
-            logging.info(f"[CCTV] Camera {self.__device_id}] image {counter} saved successfully. Path = {path}/Camera_{self.__id}_{self.__mode}/{counter}.png")
-            start_time = time.time()
-            counter += 1
-            
-        frame = cv2.putText(frame, f"Time: {int(current_time)}",
-                    (20, 20), cv2.FONT_HERSHEY_COMPLEX_SMALL,
-                    1, (0, 0, 0), 1)
-        frame = cv2.putText(frame, f"Counter: {counter}",
-                    (20, 40), cv2.FONT_HERSHEY_COMPLEX_SMALL,
-                    1, (0, 0, 0), 1)
+            file = f"{path}/Camera_{self.__id}_{self.__mode}/{counter}.png"
+            
+            # Кадр учитывается, только если он принят в очередь записи или записан. Иначе попытка на следующем кадре
+            if self.__disk_writer:
+                accepted, action = self.__disk_writer.imwrite(file, frame), "queued"
+            else:
+                accepted, action = cv2.imwrite(file, frame), "saved"
+            
+            if accepted:
+                logging.info(f"[CCTV] Camera {self.__device_id} image {counter} {action}. Path = {file}")
+                start_time = time.time()
+                counter += 1
+            else:
+                logging.warning(f"[CCTV] Camera {self.__device_id} image {counter} was not {action}, retrying on the next frame")
+            
+        self.__overlay.text("time", f"Time: {int(current_time)}", (20, 20))
+        self.__overlay.text("counter", f"Counter: {counter}", (20, 40))
         
         return frame, counter, start_time
     
@@ -263,13 +344,169 @@ The folder has already been created")
         return ret, frame
     
 
-    def __centring(self, frame: np.ndarray) -> np.ndarray:
-        h, w, _ = frame.shape
+    def __open_capture(self, stall_timeout: float = None) -> cv2.VideoCapture:
+        """Открытие источника кадров с профилем захвата текущего запуска. Для сетевых потоков задается
+        таймаут открытия и чтения FFmpeg, чтобы зависшее соединение не блокировало `read` дольше `stall_timeout`
+
+        Args:
+            `stall_timeout (float, optional)`: Максимальное время ожидания кадра в секундах. По умолчанию `None`.
+
+        Returns:
+            `cv2.VideoCapture`: Захваченная камера OpenCV
+        """
+        if self.__capture_factory:
+            return self.__capture_factory(self.device_id)
+        
+        return open_capture(self.device_id, self.__capture_profile, stall_timeout)
+
 
-        frame = cv2.line(frame, (int(w/2), 0), (int(w/2), h), (0, 0, 255), 2)
-        frame = cv2.line(frame, (0, int(h/2)), (w, int(h/2)), (0, 0, 255), 2)
+    def __reconnect(self, capture: cv2.VideoCapture, size: tuple, fps: int,
+                    threaded_capture: bool, stall_timeout: float,
+                    backoff: float, max_backoff: float, max_reconnects: int,
+                    stop_event: Event = None) -> typing.Optional[tuple]:
+        """Переподключение к камере с экспоненциальной задержкой между попытками
 
-        return frame
+        Args:
+            `capture (cv2.VideoCapture)`: Захваченная камера, потерявшая поток
+            
+            `size (tuple)`: Требуемое разрешение `(W, H)`
+            
+            `fps (int)`: Требуемый FPS
+            
+            `threaded_capture (bool)`: Перезапустить фоновый захват кадров
+            
+            `stall_timeout (float)`: Максимальное время ожидания кадра в секундах
+            
+            `backoff (float)`: Начальная задержка между попытками в секундах
+            
+            `max_backoff (float)`: Максимальная задержка между попытками в секундах
+            
+            `max_reconnects (int)`: Максимальное колличество попыток. `None` - без ограничения
+            
+            `stop_event (Event, optional)`: Событие остановки камеры. По умолчанию None.
+
+        Raises:
+            `Exception`: Вызывается, если все попытки переподключения неудачны
+
+        Returns:
+            `tuple | None`: Новая захваченная камера и время без потока в секундах.
+            `None`, если камера была остановлена во время переподключения
+        """
+        lost = time.monotonic()
+        logging.warning(f"[CCTV] Camera {self.__device_id} lost the stream, reconnecting")
+        
+        # Поток захвата обычно еще ждет `read()`, который завершится по таймауту FFmpeg, равному `stall_timeout`.
+        # Захват освобождает сам поток после выхода из чтения
+        self.__release_capture(capture, (stall_timeout or 1.0) + 1.0)
+        
+        delay = backoff
+        attempt = 0
+        while self.__flag and not (stop_event is not None and stop_event.is_set()):
+            attempt += 1
+            if max_reconnects is not None and attempt > max_reconnects:
+                logging.error(f"[CCTV] Camera {self.__device_id} failed to reconnect after {max_reconnects} attempts")
+                raise Exception(f"Failed to reconnect to camera {self.__device_id}")
+            
+            capture = self.__open_capture(stall_timeout)
+            self.__negotiate(capture, size, fps)
+            ret, _ = capture.read() if capture.isOpened() else (False, None)
+            
+            if ret:
+                downtime = time.monotonic() - lost
+                self.__stats.increment("reconnects")
+                self.__stats.increment("downtime_s", downtime)
+                logging.info(f"[CCTV] Camera {self.__device_id} reconnected after {downtime:.1f} s, attempt {attempt}")
+                
+                if threaded_capture:
+                    self.__grabber = FrameGrabber(capture, name=f"Grabber {self.__device_id}")
+                    self.__grabber.start()
+                return capture, downtime
+            
+            capture.release()
+            logging.warning(f"[CCTV] Camera {self.__device_id} reconnect attempt {attempt} failed, retry in {delay:.1f} s")
+            
+            if stop_event is not None:
+                stop_event.wait(delay)
+            else:
+                time.sleep(delay)
+            delay = min(max_backoff, delay * 2)
+        
+        return None
+
+
+    def __negotiate(self, capture: cv2.VideoCapture, size: tuple, fps: int) -> None:
+        """Запрос разрешения и FPS у источника до чтения первого кадра. FPS, выданный источником, проверяется
+
+        Args:
+            `capture (cv2.VideoCapture)`: Захваченная камера OpenCV
+            
+            `size (tuple)`: Требуемое разрешение `(W, H)`
+            
+            `fps (int)`: Требуемый FPS
+        """
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+        capture.set(cv2.CAP_PROP_FPS, fps)
+        
+        # Источник может не поддерживать запрошенный FPS или не сообщать его (0)
+        self.__source_fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+        if self.__source_fps <= 0:
+            logging.info(f"[CCTV] Camera {self.__device_id} does not report its FPS (requested {fps} fps)")
+        elif abs(self.__source_fps - fps) > 0.5:
+            logging.warning(f"[CCTV] Camera {self.__device_id} delivers {self.__source_fps:.1f} fps instead of the requested {fps} fps")
+
+
+    def __prepare_resize(self, frame: np.ndarray, size: tuple, fps: int, interpolation: int) -> None:
+        """Проверка режима, выданного источником, и подготовка буфера масштабирования
+
+        Args:
+            `frame (np.ndarray)`: Первый полученный кадр
+            
+            `size (tuple)`: Требуемое разрешение `(W, H)`
+            
+            `fps (int)`: Требуемый FPS
+            
+            `interpolation (int)`: Метод интерполяции OpenCV
+        """
+        height, width = frame.shape[:2]
+        self.__resize_buffer = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
+        self.__resize_skipped = 0
+        
+        # Оценка стоимости масштабирования одного кадра для отчета о сэкономленном времени
+        start = time.perf_counter()
+        cv2.resize(frame, size, dst=self.__resize_buffer, interpolation=interpolation)
+        self.__resize_cost = time.perf_counter() - start
+        
+        delivered = f"{self.__source_fps:.1f} fps" if self.__source_fps > 0 else "unknown fps"
+        if (width, height) == tuple(size):
+            logging.info(f"[CCTV] Camera {self.__device_id} negotiated {width}x{height} @ {delivered} natively \
+(requested {size[0]}x{size[1]} @ {fps} fps). Resize is skipped")
+        else:
+            logging.info(f"[CCTV] Camera {self.__device_id} delivers {width}x{height} @ {delivered} \
+(requested {size[0]}x{size[1]} @ {fps} fps). Frames are resized, {self.__resize_cost * 1000:.2f} ms per frame")
+
+
+    def __resize(self, frame: np.ndarray, size: tuple, interpolation: int) -> np.ndarray:
+        """Масштабирование кадра в заранее выделенный буфер. Кадр нужного размера возвращается без изменений
+
+        Args:
+            `frame (np.ndarray)`: Кадр
+            
+            `size (tuple)`: Требуемое разрешение `(W, H)`
+            
+            `interpolation (int)`: Метод интерполяции OpenCV
+
+        Returns:
+            `np.ndarray`: Кадр размера `size`
+        """
+        if frame.shape[1] == size[0] and frame.shape[0] == size[1]:
+            self.__resize_skipped += 1
+            return frame
+        
+        if self.__resize_buffer is None or self.__resize_buffer.shape[2:] != frame.shape[2:]:
+            self.__resize_buffer = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
+        
+        return cv2.resize(frame, size, dst=self.__resize_buffer, interpolation=interpolation)
 
 
     def release(self, capture: cv2.VideoCapture,
@@ -288,18 +525,224 @@ The folder has already been created")
         
         if self.__mode == "video":
             writer.release()
+        
+        self.__release_capture(capture)
+        
+        # Дожидаемся записи всех кадров из очереди
+        if self.__disk_writer:
+            self.__disk_writer.close()
+            self.__disk_writer = None
+        
+        if self.__stats.enabled:
+            self.__stats.report()
+        
+        if self.__resize_skipped:
+            logging.info(f"[CCTV] Camera {self.__device_id} skipped resize for {self.__resize_skipped} frames, \
+saved ~{self.__resize_skipped * self.__resize_cost * 1000:.1f} ms")
+            self.__resize_skipped = 0
             
-        capture.release()
         self.stop()
         logging.info(f"[CCTV] The camera with the index {self.__device_id} has shut down")
     
 
+    def __release_capture(self, capture: cv2.VideoCapture, timeout: float = 1.0) -> None:
+        """Освобождение захвата. При фоновом захвате захват освобождает поток `FrameGrabber`
+        после завершения текущего чтения, а не вызывающий поток во время чтения
+
+        Args:
+            `capture (cv2.VideoCapture)`: Захваченная камера OpenCV
+            
+            `timeout (float, optional)`: Время ожидания завершения потока захвата в секундах. По умолчанию `1`.
+        """
+        if self.__grabber:
+            self.__grabber.stop(timeout)
+            self.__grabber = None
+        else:
+            capture.release()
+
+
     def stop(self) -> None:
         """Вспомогательный метод для остановки потокового вещания камеры
         """
         self.__flag = False
     
 
+    def frames(self,
+               size: tuple = (640, 480),
+               fps: int = 30,
+               backpressure: str = "block",
+               max_rate: float = None,
+               copy: bool = False,
+               interpolation: int = cv2.INTER_LINEAR,
+               stop_event: Event = None,
+               max_frames: int = None,
+               duration: float = None,
+               reconnect: bool = True,
+               stall_timeout: float = 5.0,
+               reconnect_backoff: float = 0.5,
+               reconnect_max_backoff: float = 30.0,
+               max_reconnects: int = None,
+               capture_profile: typing.Union[str, dict] = None) -> typing.Iterator[FramePacket]:
+        """Итератор кадров камеры без окон, записи и опроса `get_frame()`. Камера открывается при первой итерации
+        и освобождается при завершении цикла, `break`, `stop()` или закрытии итератора.
+
+        Кадр выдается как `FramePacket((frame, ), timestamp, seq)`: `seq` - монотонный номер кадра источника
+        (разрыв номеров - пропущенные кадры), `timestamp` - время захвата `time.time()`.
+
+        Args:
+            `size (tuple, optional)`: Разрешение кадра `(W, H)`. По умолчанию `(640, 480)`.
+            
+            `fps (int, optional)`: Запрашиваемый FPS источника. По умолчанию `30`.
+            
+            `backpressure (str, optional)`: Поведение при медленном потребителе. По умолчанию `block`.
+            `block` - кадры читаются по запросу потребителя, ни один кадр не пропускается, при медленной обработке растет задержка.
+            `latest` - кадры читаются в фоновом потоке, потребитель получает самый свежий кадр, устаревшие пропускаются.
+            
+            `max_rate (float, optional)`: Максимальная частота выдачи кадров в секунду, лишние кадры пропускаются. По умолчанию `None` - без ограничения.
+            
+            `copy (bool, optional)`: Выдавать копию кадра. Без копии кадр может быть перезаписан следующей итерацией. По умолчанию `False`.
+            
+            `interpolation (int, optional)`: Метод интерполяции, если камера не выдает разрешение `size`. По умолчанию `cv2.INTER_LINEAR`.
+            
+            `stop_event (Event, optional)`: Событие остановки камеры из другого потока или процесса. По умолчанию None.
+            
+            `max_frames (int, optional)`: Остановка после выдачи заданного колличества кадров. По умолчанию `None` - без ограничения.
+            
+            `duration (float, optional)`: Остановка после заданного времени работы в секундах. По умолчанию `None` - без ограничения.
+            
+            `reconnect (bool, optional)`: Переподключаться к камере при потере потока. По умолчанию `True`.
+            
+            `stall_timeout (float, optional)`: Время без новых кадров в секундах, после которого поток считается потерянным. По умолчанию `5`.
+            
+            `reconnect_backoff (float, optional)`: Начальная задержка между попытками переподключения в секундах. По умолчанию `0.5`.
+            
+            `reconnect_max_backoff (float, optional)`: Максимальная задержка между попытками переподключения в секундах. По умолчанию `30`.
+            
+            `max_reconnects (int, optional)`: Максимальное колличество попыток одного переподключения. По умолчанию `None` - без ограничения.
+            
+            `capture_profile (str | dict, optional)`: Профиль захвата FFmpeg (см. `CAPTURE_PROFILES`). По умолчанию `None` - параметры OpenCV.
+
+        Raises:
+            `Exception`: Вызывается при потере потока без переподключения или после неудачных попыток переподключения
+
+        Yields:
+            `FramePacket`: Кадр с номером последовательности и временем захвата
+        """
+        if backpressure not in ("block", "latest"):
+            logging.warning(f"[CCTV] There is no '{backpressure}' backpressure policy, 'block' policy is selected by default")
+            backpressure = "block"
+        
+        self.__flag = True
+        self.__failed = False
+        self.__stats = StreamStats(f"[CCTV] Camera {self.__device_id}")
+        self.__capture_profile = capture_profile
+        
+        cap = self.__open_capture(stall_timeout)
+        self.__negotiate(cap, size, fps)
+        _, frame = self.__check_camera(cap)
+        self.__prepare_resize(frame, size, fps, interpolation)
+        
+        self.__grabber = None
+        if backpressure == "latest":
+            self.__grabber = FrameGrabber(cap, name=f"Grabber {self.__device_id}")
+            self.__grabber.start()
+        
+        interval = 1.0 / max_rate if max_rate else 0.0
+        deadline = time.monotonic() + duration if duration else None
+        next_time = 0.0
+        seq = -1
+        count = 0
+        logging.info(f"[CCTV] The camera with the index {self.__device_id} yields frames, backpressure '{backpressure}'")
+        
+        try:
+            while self.__flag and not (stop_event is not None and stop_event.is_set()):
+                
+                # Фоновый захват: ожидание времени следующего кадра вместо чтения лишних кадров
+                if self.__grabber and interval:
+                    delay = next_time - time.monotonic()
+                    if delay > 0:
+                        if stop_event is not None:
+                            stop_event.wait(delay)
+                        else:
+                            time.sleep(delay)
+                
+                if self.__grabber:
+                    grabbed = self.__grabber.read_frame(timeout=stall_timeout or 1.0)
+                    frame = None
+                    if grabbed is not None:
+                        frame, seq, capture_time = grabbed
+                else:
+                    ret, frame = cap.read()
+                    capture_time = time.time()
+                    seq += 1
+                    if not ret:
+                        frame = None
+                
+                if frame is None:
+                    if not reconnect:
+                        raise Exception(f"Failed to get information from camera {self.__device_id}")
+                    
+                    reconnected = self.__reconnect(cap, size, fps, backpressure == "latest", stall_timeout,
+                                                   reconnect_backoff, reconnect_max_backoff, max_reconnects,
+                                                   stop_event)
+                    if reconnected is None:
+                        break
+                    cap, _ = reconnected
+                    continue
+                
+                # Ограничение частоты: кадры раньше следующего слота пропускаются
+                if interval:
+                    now = time.monotonic()
+                    if now < next_time:
+                        continue
+                    next_time += interval
+                    if next_time < now:
+                        next_time = now + interval
+                
+                # Копируется только буфер масштабирования: кадр декодера - новый массив на каждом чтении
+                frame = self.__resize(frame, size, interpolation)
+                if copy and frame is self.__resize_buffer:
+                    frame = frame.copy()
+                self.__frame = frame
+                
+                self.__stats.frame()
+                count += 1
+                yield FramePacket((frame, ), capture_time, seq)
+                
+                if (max_frames and count >= max_frames) or (deadline and time.monotonic() >= deadline):
+                    break
+        
+        except GeneratorExit:
+            raise
+        
+        except:
+            self.__failed = True
+            logging.error(f"[CCTV] An unexpected error has occurred, the operation of the camera under the index {self.__device_id} is suspended")
+            raise
+        
+        finally:
+            self.__release_capture(cap)
+            self.stop()
+            logging.info(f"[CCTV] The camera with the index {self.__device_id} has stopped yielding frames, {count} frames")
+    
+
+    async def aframes(self, executor: ThreadPoolExecutor = None, **kwargs) -> typing.AsyncIterator[FramePacket]:
+        """Асинхронный итератор кадров: `async for packet in camera.aframes(size=(640, 480))`.
+        Открытие камеры, чтение и масштабирование выполняются в пуле потоков, цикл событий не блокируется.
+        Отмена задачи или выход из цикла освобождает камеру после завершения текущего чтения.
+
+        Args:
+            `executor (ThreadPoolExecutor, optional)`: Ограниченный пул потоков чтения. По умолчанию `shared_executor()`.
+            
+            `**kwargs`: Параметры `frames()`: `size`, `fps`, `max_rate`, `copy`, `max_frames`, `duration`, `reconnect`, `capture_profile` и др.
+
+        Yields:
+            `FramePacket`: Кадр с номером последовательности и временем захвата
+        """
+        async for packet in iterate_in_executor(self.frames(**kwargs), executor):
+            yield packet
+    
+
     def stream(self,
                size: tuple = (640, 480), 
                img_count: int = 10,
@@ -308,7 +751,30 @@ The folder has already been created")
                show_gui: bool = True,
                fps: int = 30,
                barrier: Barrier = None,
-               sender: Pipe = None) -> None:
+               sender: typing.Union[Pipe, SharedFrameRing] = None,
+               threaded_capture: bool = False,
+               async_write: bool = True,
+               write_queue: int = 32,
+               write_policy: str = "block",
+               segment_duration: float = None,
+               segment_size: int = None,
+               storage_quota: int = None,
+               frame_counter: Value = None,
+               overlay_sinks: tuple = ("preview", "video", "sender"),
+               interpolation: int = cv2.INTER_LINEAR,
+               collect_stats: bool = False,
+               stats_interval: float = None,
+               stats_sink: typing.Callable[[dict], None] = None,
+               stop_event: Event = None,
+               max_frames: int = None,
+               duration: float = None,
+               reconnect: bool = True,
+               stall_timeout: float = 5.0,
+               reconnect_backoff: float = 0.5,
+               reconnect_max_backoff: float = 30.0,
+               max_reconnects: int = None,
+               capture_profile: typing.Union[str, dict] = None,
+               barrier_timeout: float = None) -> None:
         """Запуск потока видеозаписи видео/сохранения кадров/вывода
 
         Args:
@@ -323,28 +789,122 @@ The folder has already been created")
             `fps (int, optional)`: FPS записи для видеофайла. Используется при режиме работы `video`. По умолчанию `30`.
             
             `barier (Barrier)`: Барьер для синхронизации потоков. Используется в мультипроцесорности или многопоточности. По умолчанию None.
+            
+            `sender (Pipe | SharedFrameRing)`: Передатчик кадров в другой процесс. По умолчанию None.
+            
+            `threaded_capture (bool, optional)`: Захват кадров в фоновом потоке. Цикл обработки получает только последний кадр,
+            задержка не растет при медленной обработке. По умолчанию `False`.
+            
+            `async_write (bool, optional)`: Запись кадров на диск в фоновых потоках. Используется при режиме работы `frame`. По умолчанию `True`.
+            
+            `write_queue (int, optional)`: Размер очереди фоновой записи. По умолчанию `32`.
+            
+            `write_policy (str, optional)`: Политика при переполнении очереди записи: `block`, `drop_oldest`, `drop_newest`. По умолчанию `block`.
+            
+            `segment_duration (float, optional)`: Длительность сегмента видео в секундах. Используется при режиме работы `video`. По умолчанию `None` - один файл.
+            
+            `segment_size (int, optional)`: Максимальный размер сегмента видео в байтах. Используется при режиме работы `video`. По умолчанию `None`.
+            
+            `storage_quota (int, optional)`: Максимальный суммарный размер сегментов видео в байтах, старые сегменты удаляются. По умолчанию `None`.
+            
+            `frame_counter (Value, optional)`: Счетчик обработанных кадров для контроля работы процесса (`CameraSupervisor`). По умолчанию None.
+            
+            `overlay_sinks (tuple, optional)`: Получатели кадра с наложенными надписями и перекрестием: `preview`, `video`, `sender`.
+            Остальные получают чистый кадр. По умолчанию `("preview", "video", "sender")`.
+            
+            `interpolation (int, optional)`: Метод интерполяции, если камера не выдает разрешение `size`. По умолчанию `cv2.INTER_LINEAR`.
+            
+            `collect_stats (bool, optional)`: Измерять длительность этапов обработки кадра и считать пропущенные и повторные кадры. По умолчанию `False`.
+            
+            `stats_interval (float, optional)`: Период сводки статистики в секундах. По умолчанию `None` - без сводки.
+            
+            `stats_sink (Callable, optional)`: Приемник сводки статистики `dict`. По умолчанию сводка пишется в лог.
+            
+            `stop_event (Event, optional)`: Событие остановки камеры из другого потока или процесса. По умолчанию None.
+            
+            `max_frames (int, optional)`: Остановка после обработки заданного колличества кадров. По умолчанию `None` - без ограничения.
+            
+            `duration (float, optional)`: Остановка после заданного времени работы в секундах. По умолчанию `None` - без ограничения.
+            
+            `reconnect (bool, optional)`: Переподключаться к камере при потере потока без остановки записи. По умолчанию `True`.
+            
+            `stall_timeout (float, optional)`: Время без новых кадров в секундах, после которого поток считается потерянным. По умолчанию `5`.
+            
+            `reconnect_backoff (float, optional)`: Начальная задержка между попытками переподключения в секундах. По умолчанию `0.5`.
+            
+            `reconnect_max_backoff (float, optional)`: Максимальная задержка между попытками переподключения в секундах. По умолчанию `30`.
+            
+            `max_reconnects (int, optional)`: Максимальное колличество попыток одного переподключения. По умолчанию `None` - без ограничения.
+            
+            `capture_profile (str | dict, optional)`: Профиль захвата FFmpeg: `low-latency`, `reliable-TCP`, `bandwidth-saver`
+            (см. `CAPTURE_PROFILES`) или собственный профиль `{"options": {...}, "buffer_size": n}`. По умолчанию `None` - параметры OpenCV.
+            
+            `barrier_timeout (float, optional)`: Время ожидания остальных камер на барьере в секундах. Если барьер не пройден
+            или разрушен (`barrier.abort()`), камера завершает работу с ошибкой. По умолчанию `None` - ожидать бесконечно.
         """
         
         self.__flag = True
+        self.__failed = False
+        self.__stats = StreamStats(f"[CCTV] Camera {self.__device_id}", enabled=collect_stats,
+                                   log_interval=stats_interval, sink=stats_sink)
+        self.__stats.increment("reconnects", 0)
+        self.__stats.increment("downtime_s", 0.0)
         
-        cap = cv2.VideoCapture(self.device_id, cv2.CAP_FFMPEG if isinstance(self.device_id, str) else None)
+        self.__capture_profile = capture_profile
+        if capture_profile:
+            logging.info(f"[CCTV] Camera {self.__device_id} uses the capture profile {capture_profile}")
+        cap = self.__open_capture(stall_timeout)
+        self.__negotiate(cap, size, fps)
         _, frame = self.__check_camera(cap) # Проверка камеры на роботоспособность
+        self.__prepare_resize(frame, size, fps, interpolation)
 
+        # Фоновый захват кадров
+        self.__grabber = None
+        if threaded_capture:
+            self.__grabber = FrameGrabber(cap, name=f"Grabber {self.__device_id}")
+            self.__grabber.start()
         
         if self.__mode == "video" or self.__mode == "frame":
             self._create_folder(folder_name=f"Camera_{self.__id}_{self.__mode}", path=path)
         
+        # Подготовка фоновой записи кадров
+        if self.__mode == "frame" and async_write:
+            self.__disk_writer = AsyncFrameWriter(max_queue=write_queue, policy=write_policy,
+                                                  name=f"Writer {self.__device_id}")
+        
         # Подготовка к записи видео
         writer = None
         if self.__mode == "video":
-            writer = self._video_writer(path, fps, cv2.resize(frame, size))
-
+            writer = self._video_writer(path, fps, self.__resize_buffer,
+                                        segment_duration=segment_duration,
+                                        segment_size=segment_size,
+                                        storage_quota=storage_quota)
+
+        # Слой наложения рисуется прямо на кадре, если его получают все активные получатели,
+        # иначе на копии кадра
+        self.__overlay.clear()
+        sinks = {"preview": show_gui, "video": writer is not None, "sender": sender is not None}
+        hud_sinks = {sink for sink, active in sinks.items() if active and sink in overlay_sinks}
+        overlay_inplace = all(sink in hud_sinks for sink, active in sinks.items() if active)
+
+        # Номер кадра без фонового захвата восстанавливается по времени кадра в потоке
+        source_fps = cap.get(cv2.CAP_PROP_FPS) if collect_stats and not self.__grabber else 0
+        
         # Ожидание других потоков или процессов
         if barrier:
-            barrier.wait()
+            try:
+                barrier.wait(barrier_timeout)
+            except threading.BrokenBarrierError:
+                self.__failed = True
+                logging.error(f"[CCTV] The camera with the index {self.__device_id} did not pass the barrier, other cameras failed or timed out")
+                self.release(capture=cap, show_gui=show_gui, writer=writer)
+                return
         
+        stats = self.__stats
+        deadline = time.monotonic() + duration if duration else None
         start_time = time.time()
         counter = 0
+        seq = 0
         logging.info(f"[CCTV] The camera with the index {self.__device_id} has started working in the '{self.__mode}' mode")
         
         while self.__flag:
@@ -352,10 +912,51 @@ The folder has already been created")
             datetime_now = datetime.datetime.now()
 
             try:
-                key = cv2.waitKey(1)
-                _, frame = cap.read()
+                stats.start()
+                
+                # Без окон предпросмотра HighGUI не используется
+                key = -1
+                if show_gui:
+                    key = cv2.waitKey(1)
+                    stats.lap("waitkey")
+                
+                if self.__grabber:
+                    grabbed = self.__grabber.read_frame(timeout=stall_timeout or 1.0)
+                    frame = None
+                    if grabbed is not None:
+                        frame, grabbed_seq, capture_time = grabbed
+                        stats.sequence(grabbed_seq)
+                else:
+                    ret, frame = cap.read()
+                    capture_time = time.time()
+                    if not ret:
+                        frame = None
+                    elif source_fps > 0:
+                        position = cap.get(cv2.CAP_PROP_POS_MSEC)
+                        if position > 0:
+                            stats.sequence(round(position * source_fps / 1000))
+                
+                # Потеря потока: переподключение без закрытия файлов записи
+                if frame is None:
+                    if not reconnect:
+                        raise Exception(f"Failed to get information from camera {self.__device_id}")
+                    
+                    reconnected = self.__reconnect(cap, size, fps, threaded_capture, stall_timeout,
+                                                   reconnect_backoff, reconnect_max_backoff, max_reconnects,
+                                                   stop_event)
+                    if reconnected is None:
+                        logging.info("[CCTV] The recording was completed while reconnecting to the camera")
+                        self.release(capture=cap, show_gui=show_gui, writer=writer)
+                        continue
+                    
+                    cap, downtime = reconnected
+                    if writer is not None:
+                        writer.mark_gap(downtime)
+                    continue
+                stats.lap("read")
 
-                frame = cv2.resize(frame, size)
+                frame = self.__resize(frame, size, interpolation)
+                stats.lap("resize")
 
                 # Сохранение кадра в файл
                 if (self.__mode == "frame"):
@@ -363,33 +964,57 @@ The folder has already been created")
                 
                 # Сохранение видео в файл
                 elif (self.__mode == "video"):
-                    frame = cv2.putText(frame, f"{datetime_now.hour}:{datetime_now.minute}:{datetime_now.second}",
-                    (20, 20), cv2.FONT_HERSHEY_COMPLEX_SMALL,
-                    1, (0, 0, 255), 1)
-                    writer.write(frame)
+                    self.__overlay.text("clock", f"{datetime_now.hour}:{datetime_now.minute}:{datetime_now.second}",
+                                        (20, 20), (0, 0, 255))
 
                 elif self.__mode == "centring":
-                    frame = self.__centring(frame)
+                    self.__overlay.crosshair(frame.shape)
+                stats.lap("save")
                 
-                self.__frame = frame
+                hud = self.__overlay.apply(frame, copy=not overlay_inplace)
+                stats.lap("overlay")
+                
+                if writer is not None:
+                    writer.write(hud if "video" in hud_sinks else frame)
+                    stats.lap("write")
+                
+                self.__frame = hud
+                
+                if frame_counter is not None:
+                    frame_counter.value += 1
 
                 if sender:
-                    sender.send((frame, ))
+                    sender.send(FramePacket((hud if "sender" in hud_sinks else frame, ), capture_time, seq))
+                    stats.lap("send")
+                seq += 1
 
                 # Отображение окна предосмотра видео
                 if show_gui:
-                    cv2.imshow(f"Camera {self.__device_id}", frame)
+                    cv2.imshow(f"Camera {self.__device_id}", hud if "preview" in hud_sinks else frame)
+                    stats.lap("show")
+                
+                stats.frame()
                 
                 # Выход по нажатию клавиши Q или по вызову метода stop
                 if key == ord('q') & 0xFF or not self.__flag:
                     logging.info("[CCTV] The recording was completed by pressing a key or calling the 'stop' method")
                     self.release(capture=cap, show_gui=show_gui, writer=writer)
                 
+                # Выход по событию остановки, колличеству кадров или времени работы
+                elif stop_event is not None and stop_event.is_set():
+                    logging.info(f"[CCTV] The camera with the index {self.__device_id} received a stop event")
+                    self.release(capture=cap, show_gui=show_gui, writer=writer)
+                
+                elif (max_frames and seq >= max_frames) or (deadline and time.monotonic() >= deadline):
+                    logging.info(f"[CCTV] The recording has ended. Frame or time limit reached, {seq} frames processed")
+                    self.release(capture=cap, show_gui=show_gui, writer=writer)
+                
                 # Выход при сохранении всех изображений
-                if counter >= img_count:
+                elif counter >= img_count:
                     logging.info(f"[CCTV] The recording has ended. All images have been successfully collected")
                     self.release(capture=cap, show_gui=show_gui, writer=writer)
                 
             except:
+                self.__failed = True
                 logging.error(f"[CCTV] An unexpected error has occurred, the operation of the camera under the index {self.__device_id} is suspended")
                 self.release(capture=cap, show_gui=show_gui, writer=writer)
\ No newline at end of file
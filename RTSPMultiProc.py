@@ -0,0 +1,126 @@
+import sys
+import cv2
+from typing import Callable, Union
+from multiprocessing import Process, Barrier, Event, Pipe, Value
+
+from .RTSPCamera import Camera
+from .SharedMemoryRing import SharedFrameRing
+
+class CameraMultiProc(Process):
+
+    def __init__(self, 
+                 device_id: Union[int, str], 
+                 mode: str, 
+                 size: tuple = (640, 480),
+                 img_count: int = 10,
+                 time_out: int = 5,
+                 path: str = "./",
+                 show_gui: bool = True,
+                 fps: int = 30,
+                 barrier: Barrier = None,
+                 sender: Union[Pipe, SharedFrameRing] = None,
+                 threaded_capture: bool = False,
+                 async_write: bool = True,
+                 write_queue: int = 32,
+                 write_policy: str = "block",
+                 segment_duration: float = None,
+                 segment_size: int = None,
+                 storage_quota: int = None,
+                 frame_counter: Value = None,
+                 overlay_sinks: tuple = ("preview", "video", "sender"),
+                 interpolation: int = cv2.INTER_LINEAR,
+                 capture_factory: Callable = None,
+                 collect_stats: bool = False,
+                 stats_interval: float = None,
+                 stats_sink: Callable = None,
+                 stop_event: Event = None,
+                 max_frames: int = None,
+                 duration: float = None,
+                 reconnect: bool = True,
+                 stall_timeout: float = 5.0,
+                 reconnect_backoff: float = 0.5,
+                 reconnect_max_backoff: float = 30.0,
+                 max_reconnects: int = None,
+                 capture_profile: Union[str, dict] = None,
+                 barrier_timeout: float = None):
+        
+        super(CameraMultiProc, self).__init__()
+
+        self.device_id = device_id
+        self.mode = mode
+        self.size = size
+        self.img_count = img_count
+        self.time_out = time_out
+        self.path = path
+        self.show_gui = show_gui
+        self.fps = fps
+        self.barrier = barrier
+        self.sender = sender
+        self.threaded_capture = threaded_capture
+        self.async_write = async_write
+        self.write_queue = write_queue
+        self.write_policy = write_policy
+        self.segment_duration = segment_duration
+        self.segment_size = segment_size
+        self.storage_quota = storage_quota
+        self.frame_counter = frame_counter
+        self.overlay_sinks = overlay_sinks
+        self.interpolation = interpolation
+        self.capture_factory = capture_factory
+        self.collect_stats = collect_stats
+        self.stats_interval = stats_interval
+        self.stats_sink = stats_sink
+        self.stop_event = stop_event if stop_event is not None else Event()
+        self.max_frames = max_frames
+        self.duration = duration
+        self.reconnect = reconnect
+        self.stall_timeout = stall_timeout
+        self.reconnect_backoff = reconnect_backoff
+        self.reconnect_max_backoff = reconnect_max_backoff
+        self.max_reconnects = max_reconnects
+        self.capture_profile = capture_profile
+        self.barrier_timeout = barrier_timeout
+
+    def run(self):
+
+        camera = Camera(self.device_id, self.mode, capture_factory=self.capture_factory)
+        camera.stream(size=self.size,
+                      img_count=self.img_count,
+                      time_out=self.time_out,
+                      path=self.path,
+                      show_gui=self.show_gui,
+                      fps=self.fps,
+                      barrier=self.barrier,
+                      sender=self.sender,
+                      threaded_capture=self.threaded_capture,
+                      async_write=self.async_write,
+                      write_queue=self.write_queue,
+                      write_policy=self.write_policy,
+                      segment_duration=self.segment_duration,
+                      segment_size=self.segment_size,
+                      storage_quota=self.storage_quota,
+                      frame_counter=self.frame_counter,
+                      overlay_sinks=self.overlay_sinks,
+                      interpolation=self.interpolation,
+                      collect_stats=self.collect_stats,
+                      stats_interval=self.stats_interval,
+                      stats_sink=self.stats_sink,
+                      stop_event=self.stop_event,
+                      max_frames=self.max_frames,
+                      duration=self.duration,
+                      reconnect=self.reconnect,
+                      stall_timeout=self.stall_timeout,
+                      reconnect_backoff=self.reconnect_backoff,
+                      reconnect_max_backoff=self.reconnect_max_backoff,
+                      max_reconnects=self.max_reconnects,
+                      capture_profile=self.capture_profile,
+                      barrier_timeout=self.barrier_timeout)
+        
+        # Код завершения процесса сообщает об аварийной остановке камеры
+        if camera.failed:
+            sys.exit(1)
+
+    def stop(self) -> None:
+        """Остановка камеры из родительского процесса. Камера завершает запись и освобождает ресурсы
+        """
+        self.stop_event.set()
@@ -5,12 +5,75 @@ import time
 import typing
 import logging
 import datetime
+import threading
 import numpy as np
 import pyrealsense2 as rs
 
-from multiprocessing import Barrier, Pipe
+from multiprocessing import Barrier, Event, Pipe, Value
 
 from .BaseСamera import BaseCamera
+from .SharedMemoryRing import SharedFrameRing
+from .FramePacket import FramePacket
+from .AsyncFrameWriter import AsyncFrameWriter
+from .SegmentedVideoWriter import SegmentedVideoWriter
+from .DepthRecorder import DepthRecorder
+from .DepthArchive import DepthArchive
+from .DepthColorizer import DepthColorizer
+from .Overlay import Overlay
+from .StreamStats import StreamStats
+from .FrameGrabber import FrameGrabber
+from .DeviceRegistry import DeviceRegistry
+from .PointCloud import PointCloud
+from .DepthFilters import DepthFilterChain
+from .FrameBuffers import FrameBuffers
+
+
+def _filter_and_align(frame, aligner=None, depth_filters=None) -> tuple:
+    """Фильтры глубины и выравнивание набора кадров librealsense. При выравнивании фильтры применяются к набору
+    до `rs.align`, как рекомендует librealsense: выровненная глубина сохраняет разрешение цвета и после прореживания
+
+    Args:
+        `frame (rs.composite_frame)`: Набор кадров конвейера
+
+        `aligner (rs.align, optional)`: Выравнивание глубины по цвету. По умолчанию `None`.
+
+        `depth_filters (DepthFilterChain, optional)`: Фильтры глубины. По умолчанию `None`.
+
+    Returns:
+        `tuple`: Набор кадров. Кадр глубины
+    """
+    if aligner is not None:
+        if depth_filters is not None:
+            frame = depth_filters.process(frame).as_frameset()
+        frame = aligner.process(frame)
+        return frame, frame.get_depth_frame()
+
+    depth_f = frame.get_depth_frame()
+    if depth_filters is not None:
+        depth_f = depth_filters.process(depth_f)
+    return frame, depth_f
+
+
+class _PipelineReader:
+    """Адаптер `rs.pipeline` для `FrameGrabber`: `read()` возвращает копии цветного кадра и глубины z16
+    после выравнивания и фильтров, чтобы кадры librealsense сразу возвращались в пул устройства,
+    и номер цветного кадра устройства
+    """
+
+    def __init__(self, pipeline, timeout_ms: int = 5000, aligner=None, depth_filters=None):
+        self.__pipeline = pipeline
+        self.__timeout_ms = timeout_ms
+        self.__aligner = aligner
+        self.__depth_filters = depth_filters
+
+    def read(self) -> tuple:
+        try:
+            frame = self.__pipeline.wait_for_frames(self.__timeout_ms)
+        except RuntimeError:
+            return False, None
+        frame, depth_f = _filter_and_align(frame, self.__aligner, self.__depth_filters)
+        color_f = frame.get_color_frame()
+        return True, (np.array(color_f.get_data()), np.array(depth_f.get_data()), color_f.get_frame_number())
 
 
 class CameraRS(BaseCamera):
@@ -28,20 +91,25 @@ class CameraRS(BaseCamera):
         return super().__new__(cls)
   
     def __init__(self,
-                 device_id: int,
-                 mode: str = "stream"):
+                 device_id: typing.Union[int, str],
+                 mode: str = "stream",
+                 backend: typing.Any = None):
         """
         Args:
-            `device_id (int | str)`: ID камеры
+            `device_id (int | str)`: Серийный номер камеры или индекс в порядке перечисления устройств.
+            Серийный номер не меняется при переподключении устройств
             
             `mode (str, optional)`: Режим работы камеры. По умолчанию `stream`.
             `stream` - Потоковый вывод с камеры.
             `video` - Запись потокового вывода с камеры в видео файл
             `frame` - Запись кадров потокового вывода с камеры в файл
             `centring` - Центрирование кадра
+            
+            `backend (module, optional)`: Реализация API `pyrealsense2` (`context`, `pipeline`, `config`, `colorizer`).
+            Например `SyntheticRealSense` для работы без камеры. По умолчанию `pyrealsense2`.
         """
         
-        assert isinstance(device_id, int), f"The `device_id` parameter has the {type(device_id)}\ data type, the `int` data type is required for operation"
+        assert isinstance(device_id, (int, str)), f"The `device_id` parameter has the {type(device_id)}\ data type, the `int` or `str` data type is required for operation"
         
         # Создание базовой конфугурации логировния информации
         logging.basicConfig(level=logging.INFO, 
@@ -54,31 +122,37 @@ class CameraRS(BaseCamera):
             logging.warning(f"[RS] There is no '{mode}' mode of operation, 'stream' mode is selected by default")
             mode = "stream"
         
-        contex = rs.context()
-        devices = list(contex.query_devices())
-        
-        if  device_id > len(devices):
-            logging.error("[RS] The transmitted id exceeds the number of connected devices")
-            raise ValueError("[RS] The transmitted id exceeds the number of connected devices")
-        if device_id < 0:
-            logging.error("[RS] The transmitted id is less than 0 (id < 0)")
-            raise ValueError("[RS] The transmitted id is less than 0 (id < 0)")
+        self.__rs = backend if backend is not None else rs
+        # Устройства перечисляются один раз на процесс
+        self.__registry = DeviceRegistry.get(self.__rs)
+        self.__info = self.__registry.find(device_id)
         
-        self.__device = devices[device_id]
+        self.__device_id = device_id
+        self.__device = self.__info.device
         self.__device_name = self.get_device_name()
         self.__device_serial_number = self.get_serial_number()
         
-        self.__pipeline = rs.pipeline()
-        self.__config = rs.config()
-        self.__colorizer = rs.colorizer()
+        self.__pipeline = self.__rs.pipeline()
+        self.__config = self.__rs.config()
+        self.__colorizer = self.__rs.colorizer()
         
         self.__mode = mode.lower()
         self.__flag = True
 
-        self.__color_frame = np.ndarray
-        self.__depth_frame = np.ndarray
+        self.__buffers = None
+        self.__preview = (None, None)
+        self.__preview_lock = threading.Lock()
+        self.__depth_colorizer = None
+        self.__aligner = None
+        self.__depth_filters = None
+        self.__point_cloud = None
+        self.__disk_writer = None
+        self.__depth_archive = None
+        self.__failed = False
+        self.__overlay = Overlay()
+        self.__stats = StreamStats(f"[RS] Camera {self.__device_name} #{self.__device_serial_number}")
         
-        self.__colorizer.set_option(rs.option.visual_preset, 0)
+        self.__colorizer.set_option(self.__rs.option.visual_preset, 0)
 
         logging.info(f"[RS] RealSense camera using {self.__device_name} #{self.__device_serial_number} camera id. Operating mode '{self.__mode}'")
           
@@ -86,35 +160,28 @@ class CameraRS(BaseCamera):
         return f"[RS] RealSense camera using {self.__device_name} #{self.__device_serial_number} camera id. Operating mode '{self.__mode}'"
     
     @property
-    def device_id(self) -> int:
+    def device_id(self) -> typing.Union[int, str]:
         """Получение текущего ID камеры
 
         Returns:
-            `int`: ID камеры
+            `int | str`: ID камеры
         """
         return self.__device_id
     
     @device_id.setter
-    def device_id(self, id: int) -> None:
+    def device_id(self, id: typing.Union[int, str]) -> None:
         """Изминение ID потоковой камеры
 
         Args:
-            `id (int)`: ID камеры
+            `id (int | str)`: Серийный номер или индекс камеры
         """
         
-        contex = rs.context()
-        devices = list(contex.query_devices())
-        
-        if  id > len(devices):
-            logging.error("[RS] The transmitted id exceeds the number of connected devices")
-            raise ValueError("[RS] The transmitted id exceeds the number of connected devices")
-        if id < 0:
-            logging.error("[RS] The transmitted id is less than 0 (id < 0)")
-            raise ValueError("[RS] The transmitted id is less than 0 (id < 0)")
+        info = self.__registry.find(id)
         
         logging.info(f"[RS] A new device ID has been installed {id}")
         self.__device_id = id
-        self.__device = devices[id]
+        self.__info = info
+        self.__device = info.device
         self.__device_name = self.get_device_name()
         self.__device_serial_number = self.get_serial_number()
     
@@ -149,23 +216,90 @@ class CameraRS(BaseCamera):
         logging.info(f"[RS] A new camera mode has been installed {mode}")
         self.__mode = mode
     
+    @property
+    def failed(self) -> bool:
+        """Завершилась ли последняя работа камеры из-за ошибки
+
+        Returns:
+            `bool`: Признак аварийного завершения
+        """
+        return self.__failed
+    
+    def stats(self) -> dict:
+        """Статистика работы камеры: FPS, пропущенные и повторные кадры, длительность этапов обработки кадра
+        (`wait`, `align`, `filter`, `copy`, `colorize`, `points`, `save`, `overlay`, `write`, `send`, `show`, `waitkey`). Этапы измеряются при `stream(collect_stats=True)`.
+        Длительность каждого фильтра глубины выдается в `filters` при любом запуске с фильтрами
+
+        Returns:
+            `dict`: Статистика последнего запуска `stream`
+        """
+        summary = self.__stats.summary()
+        if self.__depth_filters is not None:
+            summary["filters"] = self.__depth_filters.stats()
+        return summary
+    
     def getFrames(self) -> tuple:
-        return self.__color_frame, self.__depth_frame
+        """Последние обработанные кадры без ожидания. Можно вызывать из другого потока: цветной кадр и глубина
+        всегда относятся к одному кадру. Для получения каждой новой пары кадров используйте `frames()`
+
+        Returns:
+            `tuple`: Неизменяемые цветной кадр и раскрашенная глубина. Кадры не изменяются, пока камера не получит
+            еще `frame_buffers - 1` кадров. `(None, None)`, если камера еще не получила ни одного кадра
+        """
+        buffers = self.__buffers
+        while buffers is not None:
+            packet = buffers.latest("overlay", "color", "depth_color", "depth")
+            if packet is None:
+                break
+            
+            overlay, color, depth_i, depth = packet
+            if depth_i is None and depth is not None:
+                depth_i = self.__preview_depth((buffers, packet.seq), depth)
+            
+            # Слот мог начать перезаписываться во время раскраски глубины
+            if depth_i is None or buffers.valid(packet):
+                return (overlay if overlay is not None else color), depth_i
+        return None, None
 
+    def __preview_depth(self, version: tuple, depth: np.ndarray) -> np.ndarray:
+        """Раскраска глубины по запросу `getFrames`, если ее не потребовал цикл камеры. Результат кешируется для версии кадра
+
+        Args:
+            `version (tuple)`: Буферы кадров и версия кадра в них
+            
+            `depth (np.ndarray)`: Кадр глубины z16
+
+        Returns:
+            `np.ndarray`: Неизменяемое цветное изображение глубины
+        """
+        with self.__preview_lock:
+            if self.__preview[0] != version:
+                if self.__depth_colorizer is None:
+                    self.__depth_colorizer = DepthColorizer(depth_scale=self.__depth_scale())
+                image = self.__depth_colorizer.colorize(depth, out=np.empty(depth.shape + (3, ), dtype=np.uint8))
+                image.flags.writeable = False
+                self.__preview = (version, image)
+            return self.__preview[1]
+
+    def get_point_cloud(self) -> typing.Optional[np.ndarray]:
+        """Последнее облако точек XYZ `(H, W, 3)` в метрах. Вычисляется при `stream(point_cloud=True)` или `frames(point_cloud=True)`
+
+        Returns:
+            `np.ndarray | None`: Неизменяемое облако точек или `None`, если оно не вычислялось
+        """
+        packet = self.__buffers.latest("points") if self.__buffers is not None else None
+        return packet[0] if packet is not None else None
+    
     @staticmethod
     def get_devices_str() -> list:
         
         """Получение информации о всех устройствам
 
         Returns:
-            `list | str`: Возвращает список подключенных устройств
+            `list`: Список строк `индекс. имя #серийный номер` подключенных устройств
         """
         
-        contex = rs.context()
-        devs = list(contex.query_devices()) if len(list(contex.query_devices())) > 1 \
-            else list(contex.query_devices())[0]
-            
-        return list(CameraRS.get_full_information(devs))
+        return DeviceRegistry.get().describe()
     
     @staticmethod
     def get_full_information(devive: typing.Union[list, rs.device]) -> list:
@@ -189,19 +323,78 @@ class CameraRS(BaseCamera):
         if isinstance(devive, rs.device):
             return [f"0. {devive.get_info(rs.camera_info.name)} #{devive.get_info(rs.camera_info.serial_number)}"]
     
-    def _configuration_camera(self, color_profile: int, depth_profile:int) -> tuple:
+    def __resolve_profile(self, stream: str, sensor: int, profile: typing.Union[int, tuple, dict]):
+        """Поиск профиля потока в кешированном индексе профилей устройства
+
+        Args:
+            `stream (str)`: Тип потока `color` или `depth`
+            
+            `sensor (int)`: Номер сенсора для профиля, заданного номером
+            
+            `profile (int | tuple | dict)`: Номер профиля сенсора, `(width, height, format, fps)` или
+            `{"width": ..., "height": ..., "format": ..., "fps": ...}`
+
+        Raises:
+            `ValueError`: Вызывается, если профиль не найден
+
+        Returns:
+            `rs.video_stream_profile`: Профиль потока
+        """
+        if isinstance(profile, int):
+            for p in self.__info.profiles:
+                if p.sensor == sensor and p.index == profile:
+                    return p.profile
+            logging.error(f"[RS] There is no {stream} profile {profile} on the sensor {sensor}")
+            raise ValueError(f"[RS] There is no {stream} profile {profile} on the sensor {sensor}")
+        
+        index = self.__registry.profiles(self.__info.serial)
+        found = index.find(stream, **profile) if isinstance(profile, dict) else index.find(stream, *profile)
+        return found.profile
+    
+    def find_profile(self, stream: str,
+                     width: int = None,
+                     height: int = None,
+                     format: str = None,
+                     fps: int = None,
+                     exact: bool = False):
+        """Поиск профиля потока по разрешению, формату и FPS. Если точного профиля нет, выбирается ближайший
+
+        Args:
+            `stream (str)`: Тип потока `color`, `depth`, `infrared`
+            
+            `width (int, optional)`: Ширина кадра. По умолчанию `None`.
+            
+            `height (int, optional)`: Высота кадра. По умолчанию `None`.
+            
+            `format (str, optional)`: Формат `bgr8`, `z16` и т.д. По умолчанию `None`.
+            
+            `fps (int, optional)`: FPS. По умолчанию `None`.
+            
+            `exact (bool, optional)`: Не подбирать ближайший профиль. По умолчанию `False`.
+
+        Returns:
+            `StreamProfile`: Профиль потока с номером сенсора и профиля
+        """
+        return self.__registry.profiles(self.__info.serial).find(stream, width, height, format, fps, exact)
+    
+    def _configuration_camera(self, color_profile: typing.Union[int, tuple, dict],
+                              depth_profile: typing.Union[int, tuple, dict]) -> tuple:
         """Конфигурация камеры. Устновка формата работы камеры.
+        Сочетание профилей проверяется до запуска конвейера, чтобы не ждать неудачного `pipeline.start`
 
         Args:
-            `color_profile (int)`: ID цветового профиля
+            `color_profile (int | tuple | dict)`: Номер цветового профиля или его параметры `(width, height, format, fps)`
             
-            `depth_profile (int)`: ID профиля глубины
+            `depth_profile (int | tuple | dict)`: Номер профиля глубины или его параметры `(width, height, format, fps)`
+
+        Raises:
+            `ValueError`: Вызывается, если профиль не найден или устройство не поддерживает сочетание профилей
 
         Returns:
             `tuple`: Профиль глубины. Цветовой профидь
         """
-        depth_prof = rs.video_stream_profile(self.__device.sensors[0].get_stream_profiles()[depth_profile])
-        color_prof = rs.video_stream_profile(self.__device.sensors[1].get_stream_profiles()[color_profile])
+        depth_prof = self.__resolve_profile("depth", 0, depth_profile)
+        color_prof = self.__resolve_profile("color", 1, color_profile)
         
         self.__config.enable_device(self.get_serial_number())
         self.__config.enable_stream(
@@ -219,49 +412,136 @@ class CameraRS(BaseCamera):
             color_prof.fps()
         )
         
+        wrapper = getattr(self.__rs, "pipeline_wrapper", None)
+        if wrapper is not None and not self.__config.can_resolve(wrapper(self.__pipeline)):
+            requested = f"depth {depth_prof.width()}x{depth_prof.height()} {depth_prof.fps()} fps, \
+color {color_prof.width()}x{color_prof.height()} {color_prof.fps()} fps"
+            logging.error(f"[RS] Camera {self.__device_name} #{self.__device_serial_number} cannot stream {requested}")
+            raise ValueError(f"[RS] Camera {self.__device_name} #{self.__device_serial_number} cannot stream {requested}")
+        
         self.__pipeline.start(self.__config)
         
         return depth_prof, color_prof
     
-    def _video_writer(self, path: str, d_prof, c_prof):
-        """Обертка для cv2.VideoWriter с назначеним папки и текущего фпс
+    def _video_writer(self, path: str, d_prof, c_prof,
+                      segment_duration: float = None,
+                      segment_size: int = None,
+                      storage_quota: int = None,
+                      depth_shape: tuple = None):
+        """Обертка для SegmentedVideoWriter с назначеним папки и текущего фпс
 
         Args:
             `path (str)`: Путь сохранения файла
             
-            `fps (int)`: fps записи видео
-            
             `d_prof (np.ndarray)`: Профиль глубины
             
             `c_prof (np.ndarray)`: Цветовой профиль
+            
+            `segment_duration (float, optional)`: Длительность сегмента в секундах. По умолчанию `None`.
+            
+            `segment_size (int, optional)`: Максимальный размер сегмента в байтах. По умолчанию `None`.
+            
+            `storage_quota (int, optional)`: Максимальный суммарный размер сегментов в байтах. По умолчанию `None`.
+            
+            `depth_shape (tuple, optional)`: Размер кадра глубины `(H, W)` после выравнивания и фильтров. По умолчанию размер профиля глубины.
 
         Returns:
-            `cv2.VideoWriter`: Объект для записи видео в файл
+            `SegmentedVideoWriter`: Объекты для записи видео в файл
         """
         
         # device_product_line = str(self.device.get_info(rs.camera_info.product_line))
         # color_prof.fps() if device_product_line == "D400" else int(color_prof.fps() / 2)
             
-        color_writer = cv2.VideoWriter(
-            f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/color_{self.__device_name}_{self.__device_serial_number}_{c_prof.width()}x{c_prof.height()}.avi",
-            cv2.VideoWriter_fourcc(*"MJPG"), c_prof.fps(),
-            (c_prof.width(), c_prof.height()), True)
+        # Квота делится поровну между потоками цвета и глубины
+        quota = storage_quota // 2 if storage_quota else None
+        depth_h, depth_w = depth_shape or (d_prof.height(), d_prof.width())
+        
+        color_writer = SegmentedVideoWriter(
+            f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}",
+            f"color_{self.__device_name}_{self.__device_serial_number}_{c_prof.width()}x{c_prof.height()}",
+            c_prof.fps(), "MJPG",
+            segment_duration=segment_duration, segment_size=segment_size, storage_quota=quota)
         
-        depth_writer = cv2.VideoWriter(
-            f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth_{self.__device_name}_{self.__device_serial_number}_{d_prof.width()}x{d_prof.height()}.avi",
-            cv2.VideoWriter_fourcc(*"MJPG"), d_prof.fps(),
-            (d_prof.width(), d_prof.height()), True)
+        depth_writer = SegmentedVideoWriter(
+            f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}",
+            f"depth_{self.__device_name}_{self.__device_serial_number}_{depth_w}x{depth_h}",
+            d_prof.fps(), "MJPG",
+            segment_duration=segment_duration, segment_size=segment_size, storage_quota=quota)
         
         return depth_writer, color_writer
     
-    def __centring(self, frame: np.ndarray) -> np.ndarray:
-        h, w, _ = frame.shape
+    def __colorize(self, depth_f, depth_data_frame: np.ndarray) -> np.ndarray:
+        """Раскраска кадра глубины через LUT (`DepthColorizer`) или `rs.colorizer` в буфер `depth_color` кадра
 
-        frame = cv2.line(frame, (int(w/2), 0), (int(w/2), h), (0, 0, 255), 2)
-        frame = cv2.line(frame, (0, int(h/2)), (w, int(h/2)), (0, 0, 255), 2)
+        Args:
+            `depth_f (rs.depth_frame)`: Кадр глубины librealsense
+            
+            `depth_data_frame (np.ndarray)`: Кадр глубины z16
 
-        return frame
+        Returns:
+            `np.ndarray`: Цветное изображение глубины
+        """
+        if self.__depth_colorizer is not None:
+            return self.__depth_colorizer.colorize(
+                depth_data_frame, out=self.__buffers.buffer("depth_color", depth_data_frame.shape + (3, )))
+        return self.__buffers.copy("depth_color", np.asanyarray(self.__colorizer.colorize(depth_f).get_data()))
+    
+    def __prepare_depth(self, depth_prof, color_prof, align_depth: bool, point_cloud: bool,
+                        depth_filters: typing.Union[typing.Sequence, DepthFilterChain] = None) -> tuple:
+        """Подготовка выравнивания глубины по цвету, фильтров глубины и облака точек
 
+        Args:
+            `depth_prof (rs.video_stream_profile)`: Профиль глубины
+            
+            `color_prof (rs.video_stream_profile)`: Цветовой профиль
+            
+            `align_depth (bool)`: Выравнивать глубину по цветному кадру
+            
+            `point_cloud (bool)`: Вычислять облако точек
+            
+            `depth_filters (Sequence | DepthFilterChain, optional)`: Фильтры глубины. По умолчанию `None`.
+
+        Returns:
+            `tuple`: Размер кадра глубины `(H, W)` после выравнивания и фильтров
+        """
+        # Выровненная глубина имеет разрешение и внутренние параметры цветного потока
+        target = color_prof if align_depth else depth_prof
+        self.__aligner = self.__rs.align(self.__rs.stream.color) if align_depth else None
+        
+        if isinstance(depth_filters, DepthFilterChain) or not depth_filters:
+            self.__depth_filters = depth_filters or None
+        else:
+            self.__depth_filters = DepthFilterChain(depth_filters, backend=self.__rs)
+        
+        shape = (target.height(), target.width())
+        if self.__depth_filters is not None and self.__aligner is None:
+            # Прореживание меняет размер и внутренние параметры невыровненной глубины, они определяются по первому кадру.
+            # Пробный кадр сбрасывается из истории временного фильтра пересозданием цепочки
+            depth_f = self.__depth_filters.process(self.__pipeline.wait_for_frames().get_depth_frame())
+            target = depth_f.profile.as_video_stream_profile()
+            shape = np.asanyarray(depth_f.get_data()).shape[:2]
+            depth_f = None
+            self.__depth_filters.reset()
+        
+        if self.__depth_filters is not None:
+            logging.info(f"[RS] Camera {self.__device_name} #{self.__device_serial_number} depth filters \
+{', '.join(self.__depth_filters.names)}, depth {shape[1]}x{shape[0]}")
+        
+        self.__point_cloud = PointCloud.from_profile(target, self.__depth_scale()) if point_cloud else None
+        return shape
+    
+    def __depth_scale(self) -> float:
+        """Масштаб единиц глубины устройства
+
+        Returns:
+            `float`: Метров в одной единице z16
+        """
+        try:
+            return self.__device.first_depth_sensor().get_depth_scale()
+        except Exception:
+            logging.warning(f"[RS] Failed to get the depth scale of {self.__device_name} #{self.__device_serial_number}, 0.001 is used")
+            return 0.001
+    
     def _save_frame(self, start_time: float, time_out: int, 
                     path: str, color_i: np.ndarray, 
                     depth_i: np.ndarray, depth_data_frame: np.ndarray, 
@@ -284,34 +564,39 @@ class CameraRS(BaseCamera):
             `counter (int)`: Колличество сохраненных кадров
 
         Returns:
-            `tuple`: Текущий кадр с надписями о времени и колличестве сохраненных кадров.
-            Колличество сохраненных кадров. Обновленное время с последнего кадра
+            `tuple`: Текущий цветной кадр. Колличество сохраненных кадров. Обновленное время с последнего кадра.
+            Надписи о времени и колличестве сохраненных кадров добавляются в слой наложения
         """
         
         current_time = time_out - (time.time() - start_time)
                     
         if current_time <= 0:
-            cv2.imwrite(f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/color/{counter}.png",
-                        color_i)
-            logging.info(f"[RS] Camera {self.__device_name} {self.__device_serial_number} color image {counter} saved successfully. Path = {path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/color/{counter}.png")
+            folder = f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}"
             
-            cv2.imwrite(f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth/{counter}.png",
-                        depth_i)
-            logging.info(f"[RS] Camera {self.__device_name} {self.__device_serial_number} depth image {counter} saved successfully. Path = {path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth/{counter}.png")
+            # Кадр учитывается, только если все его файлы приняты в очередь записи или записаны.
+            # Иначе попытка на следующем кадре с тем же номером
+            if self.__disk_writer:
+                accepted = (self.__disk_writer.imwrite(f"{folder}/color/{counter}.png", color_i)
+                            and self.__disk_writer.imwrite(f"{folder}/depth/{counter}.png", depth_i)
+                            and self.__disk_writer.submit(self.__depth_archive.append, depth_data_frame.copy(), counter, time.time()))
+                action = "queued"
+            else:
+                accepted = (cv2.imwrite(f"{folder}/color/{counter}.png", color_i)
+                            and cv2.imwrite(f"{folder}/depth/{counter}.png", depth_i))
+                if accepted:
+                    self.__depth_archive.append(depth_data_frame, counter, time.time())
+                action = "saved"
             
-            np.save(f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth_np/{counter}.npy",
-                        depth_data_frame)
-            logging.info(f"[RS] Camera {self.__device_name} {self.__device_serial_number} depth_np image {counter} saved successfully. Path = {path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth_np/{counter}.npy")
-
-            start_time = time.time()
-            counter += 1
+            if accepted:
+                logging.info(f"[RS] Camera {self.__device_name} {self.__device_serial_number} color, depth and depth_np images {counter} {action}. "
+                             f"Path = {folder}, depth archive {self.__depth_archive.folder}")
+                start_time = time.time()
+                counter += 1
+            else:
+                logging.warning(f"[RS] Camera {self.__device_name} {self.__device_serial_number} images {counter} were not {action}, retrying on the next frame")
         
-        color_i = cv2.putText(color_i, f"Time: {int(current_time)}",
-                    (20, 20), cv2.FONT_HERSHEY_COMPLEX_SMALL,
-                    1, (0, 0, 0), 1)
-        color_i = cv2.putText(color_i, f"Counter: {counter}",
-                    (20, 40), cv2.FONT_HERSHEY_COMPLEX_SMALL,
-                    1, (0, 0, 0), 1)
+        self.__overlay.text("time", f"Time: {int(current_time)}", (20, 20))
+        self.__overlay.text("counter", f"Counter: {counter}", (20, 40))
         
         return color_i, counter, start_time
     
@@ -321,7 +606,7 @@ class CameraRS(BaseCamera):
         Returns:
             str: Серийный номер
         """
-        return self.__device.get_info(rs.camera_info.serial_number)
+        return self.__info.serial
     
     def get_profiles(self, sensor_id: int) -> list:
         """Получение профилей камеры по заданному сенсору
@@ -334,18 +619,8 @@ class CameraRS(BaseCamera):
         """
         assert isinstance(sensor_id, int)
 
-        stream_profiles = []
-        profiles = self.__device.sensors[sensor_id].get_stream_profiles()
-        for i, profile in enumerate(profiles):
-            video_profile = rs.video_stream_profile(profile)
-            type_p = video_profile.stream_type()
-            width, height = video_profile.width(), video_profile.height()
-            fps = video_profile.fps()
-            format_p = video_profile.format()
-
-            stream_profiles.append(f"{i}. {type_p} {width}x{height} {format_p} {fps}")
-
-        return stream_profiles
+        return [f"{p.index}. {p.stream} {p.width}x{p.height} {p.format} {p.fps}"
+                for p in self.__info.profiles if p.sensor == sensor_id]
     
     def get_sensors(self) -> list:
         
@@ -355,11 +630,7 @@ class CameraRS(BaseCamera):
             `list`: Список сенсоров
         """
         
-        sensors = []
-        for i, sensor in enumerate(list(self.__device.query_sensors())):
-            sensors.append(f"{i}. {sensor.get_info(rs.camera_info.name)}")
-
-        return sensors
+        return [f"{i}. {name}" for i, name in enumerate(self.__info.sensors)]
     
     def get_device_name(self) -> str:
         """Возвращает имя устройства
@@ -367,7 +638,7 @@ class CameraRS(BaseCamera):
         Returns:
             str: Имя устройства
         """
-        return self.__device.get_info(rs.camera_info.name)
+        return self.__info.name
     
     def _create_folder(self, folder_name: str, path: str = "./") -> None:
         """Создает папку в необходимой директории
@@ -397,19 +668,35 @@ class CameraRS(BaseCamera):
             logging.warning(f"[RS] It is not possible to create a folder '{folder_name}'. \
 The folder has already been created")
     
-    def release(self, writers=[]):
+    def release(self, writers=[], show_gui: bool = True):
         """Обнуляем параметры камеры и уничтожаем имеющиеся окно предосмотра
 
         Args:
-            show_gui (_type_): Имеется ли окно показа изображения.
-            writers (list, optional): Список оберток cv2.VideoWriter. По умолчанию [].
+            writers (list, optional): Список оберток cv2.VideoWriter и DepthRecorder. По умолчанию [].
+            show_gui (bool, optional): Имеется ли окно показа изображения. По умолчанию `True`.
         """
         
-        cv2.destroyAllWindows()
+        if show_gui:
+            cv2.destroyAllWindows()
         
         if self.__mode == "video":
             for writer in writers:
-                writer.release()
+                if writer:
+                    writer.release()
+        
+        # Дожидаемся записи всех кадров из очереди
+        if self.__disk_writer:
+            self.__disk_writer.close()
+            self.__disk_writer = None
+        
+        if self.__depth_archive:
+            self.__depth_archive.close()
+            self.__depth_archive = None
+        
+        if self.__stats.enabled:
+            self.__stats.report()
+            if self.__depth_filters is not None:
+                logging.info(f"[RS] Camera {self.__device_name} #{self.__device_serial_number} depth filters: {self.__depth_filters.describe()}")
             
         self.stop()
         logging.info(f"[CCTV] The camera with the index {self.__device_name} | {self.__device_serial_number} has shut down")
@@ -420,22 +707,216 @@ The folder has already been created")
         self.__flag = False
         self.__pipeline.stop()
     
+    def frames(self,
+               color_profile: typing.Union[int, tuple, dict],
+               depth_profile: typing.Union[int, tuple, dict],
+               backpressure: str = "block",
+               max_rate: float = None,
+               copy: bool = False,
+               timeout: float = 5.0,
+               stop_event: Event = None,
+               max_frames: int = None,
+               duration: float = None,
+               align_depth: bool = False,
+               point_cloud: bool = False,
+               depth_filters: typing.Union[typing.Sequence, DepthFilterChain] = None,
+               frame_buffers: int = 3) -> typing.Iterator[FramePacket]:
+        """Итератор пар кадров камеры без окон, записи и опроса `getFrames()`. Камера запускается при первой итерации
+        и останавливается при завершении цикла, `break`, `stop()` или закрытии итератора.
+
+        Кадр выдается как `FramePacket((color, depth), timestamp, seq)` или `FramePacket((color, depth, points), timestamp, seq)`
+        при `point_cloud=True`: `depth` - необработанная глубина z16, `points` - облако точек XYZ `(H, W, 3)` в метрах,
+        `seq` - номер цветного кадра устройства (разрыв номеров - пропущенные кадры), `timestamp` - время захвата `time.time()`.
+        
+        Кадры librealsense копируются один раз в буферы `FrameBuffers` и сразу возвращаются в пул устройства.
+        Без `copy` выдаются неизменяемые представления буферов, которые не изменяются следующие `frame_buffers - 1` итераций.
+
+        Args:
+            `color_profile (int | tuple | dict)`: Номер цветового профиля или его параметры `(width, height, format, fps)`,
+            например `(1280, 720, "bgr8", 30)`. Если точного профиля нет, выбирается ближайший
+            
+            `depth_profile (int | tuple | dict)`: Номер профиля глубины или его параметры `(width, height, format, fps)`
+            
+            `backpressure (str, optional)`: Поведение при медленном потребителе. По умолчанию `block`.
+            `block` - кадры ожидаются по запросу потребителя, при медленной обработке librealsense пропускает кадры в своей очереди.
+            `latest` - кадры читаются в фоновом потоке, потребитель получает самую свежую пару, устаревшие пропускаются.
+            
+            `max_rate (float, optional)`: Максимальная частота выдачи кадров в секунду, лишние кадры пропускаются. По умолчанию `None` - без ограничения.
+            
+            `copy (bool, optional)`: Выдавать изменяемые копии кадров, не связанные с буферами камеры. Кадр по-прежнему копируется один раз. По умолчанию `False`.
+            
+            `timeout (float, optional)`: Время ожидания кадра в секундах. По умолчанию `5`.
+            
+            `stop_event (Event, optional)`: Событие остановки камеры из другого потока или процесса. По умолчанию None.
+            
+            `max_frames (int, optional)`: Остановка после выдачи заданного колличества кадров. По умолчанию `None` - без ограничения.
+            
+            `duration (float, optional)`: Остановка после заданного времени работы в секундах. По умолчанию `None` - без ограничения.
+            
+            `align_depth (bool, optional)`: Выравнивать глубину по цветному кадру (`rs.align`). По умолчанию `False`.
+            
+            `point_cloud (bool, optional)`: Вычислять облако точек. Облако записывается в двойной буфер и остается
+            неизменным до следующей итерации. По умолчанию `False`.
+            
+            `depth_filters (Sequence | DepthFilterChain, optional)`: Фильтры постобработки глубины. При `align_depth`
+            применяются до выравнивания, и глубина сохраняет разрешение цвета. Например `RECOMMENDED_DEPTH_FILTERS` или `[("decimation", {"filter_magnitude": 2}), "hole_filling"]`. По умолчанию `None`.
+            
+            `frame_buffers (int, optional)`: Колличество буферов кадра: 2 - двойная, 3 - тройная буферизация. По умолчанию `3`.
+
+        Raises:
+            `RuntimeError`: Вызывается, если камера не выдала кадр за `timeout`
+
+        Yields:
+            `FramePacket`: Цветной кадр и глубина с номером последовательности и временем захвата
+        """
+        if backpressure not in ("block", "latest"):
+            logging.warning(f"[RS] There is no '{backpressure}' backpressure policy, 'block' policy is selected by default")
+            backpressure = "block"
+        
+        self.__flag = True
+        self.__failed = False
+        self.__stats = StreamStats(f"[RS] Camera {self.__device_name} #{self.__device_serial_number}")
+        
+        depth_prof, color_prof = self._configuration_camera(color_profile=color_profile, depth_profile=depth_profile)
+        self.__prepare_depth(depth_prof, color_prof, align_depth, point_cloud, depth_filters)
+        buffers = self.__buffers = FrameBuffers(frame_buffers)
+        
+        grabber = None
+        if backpressure == "latest":
+            grabber = FrameGrabber(_PipelineReader(self.__pipeline, int(timeout * 1000), self.__aligner, self.__depth_filters),
+                                   name=f"Grabber {self.__device_serial_number}")
+            grabber.start()
+        
+        interval = 1.0 / max_rate if max_rate else 0.0
+        deadline = time.monotonic() + duration if duration else None
+        next_time = 0.0
+        count = 0
+        logging.info(f"[RS] The camera {self.__device_name} #{self.__device_serial_number} yields frames, backpressure '{backpressure}'")
+        
+        try:
+            while self.__flag and not (stop_event is not None and stop_event.is_set()):
+                
+                if grabber:
+                    # Ожидание времени следующего кадра вместо чтения лишних кадров
+                    delay = next_time - time.monotonic()
+                    if interval and delay > 0:
+                        if stop_event is not None:
+                            stop_event.wait(delay)
+                        else:
+                            time.sleep(delay)
+                    
+                    grabbed = grabber.read_frame(timeout=timeout)
+                    if grabbed is None:
+                        raise RuntimeError(f"Frame didn't arrive within {timeout * 1000:.0f} ms")
+                    (color_i, depth_data_frame, seq), _, capture_time = grabbed
+                else:
+                    frame = self.__pipeline.wait_for_frames(int(timeout * 1000))
+                    capture_time = time.time()
+                    frame, depth_f = _filter_and_align(frame, self.__aligner, self.__depth_filters)
+                    color_f = frame.get_color_frame()
+                    # Номер кадра устройства: кадры, отброшенные очередью librealsense, видны как разрыв номеров
+                    seq = color_f.get_frame_number()
+                    color_i = np.asanyarray(color_f.get_data())
+                    depth_data_frame = np.asanyarray(depth_f.get_data())
+                    frame = color_f = depth_f = None
+                
+                # Ограничение частоты: кадры раньше следующего слота пропускаются
+                if interval:
+                    now = time.monotonic()
+                    if now < next_time:
+                        color_i = depth_data_frame = None
+                        continue
+                    next_time += interval
+                    if next_time < now:
+                        next_time = now + interval
+                
+                # Единственная копия кадра: копии FrameGrabber и копии для `copy` публикуются без повторного копирования,
+                # представления librealsense копируются в буферы и освобождаются до ожидания следующего кадра
+                buffers.begin()
+                if grabber or copy:
+                    color_i = buffers.put("color", color_i if grabber else color_i.copy())
+                    depth_data_frame = buffers.put("depth", depth_data_frame if grabber else depth_data_frame.copy())
+                else:
+                    color_i = buffers.copy("color", color_i)
+                    depth_data_frame = buffers.copy("depth", depth_data_frame)
+                
+                arrays = (color_i, depth_data_frame)
+                if self.__point_cloud is not None:
+                    shape = depth_data_frame.shape + (3, )
+                    if copy:
+                        points = buffers.put("points", self.__point_cloud.compute(depth_data_frame, out=np.empty(shape, dtype=np.float32)))
+                    else:
+                        points = self.__point_cloud.compute(depth_data_frame, out=buffers.buffer("points", shape, np.float32))
+                    arrays += (points, )
+                buffers.commit(capture_time)
+                
+                if not copy:
+                    arrays = tuple(buffers.latest("color", "depth", "points")[:len(arrays)])
+                
+                self.__stats.frame()
+                count += 1
+                yield FramePacket(arrays, capture_time, seq)
+                
+                if (max_frames and count >= max_frames) or (deadline and time.monotonic() >= deadline):
+                    break
+        
+        except GeneratorExit:
+            raise
+        
+        except:
+            self.__failed = True
+            logging.error(f"[RS] An unexpected error has occurred, the operation of the camera under the index {self.__device_name} #{self.__device_serial_number} is suspended")
+            raise
+        
+        finally:
+            # Камера, остановленная методом stop, уже остановила конвейер
+            if self.__flag:
+                self.__flag = False
+                self.__pipeline.stop()
+            if grabber:
+                grabber.stop()
+            logging.info(f"[RS] The camera {self.__device_name} #{self.__device_serial_number} has stopped yielding frames, {count} frames")
+    
     def stream(self,
-               color_profile: int, 
-               depth_profile:int,
+               color_profile: typing.Union[int, tuple, dict], 
+               depth_profile: typing.Union[int, tuple, dict],
                img_count: int = 10,
                time_out: int = 5,
                path: str = "./",
                show_gui_color: bool = True,
                show_gui_depth: bool = True,
                barrier: Barrier = None,
-               sender: Pipe = None):
+               sender: typing.Union[Pipe, SharedFrameRing] = None,
+               async_write: bool = True,
+               write_queue: int = 32,
+               write_policy: str = "block",
+               segment_duration: float = None,
+               segment_size: int = None,
+               storage_quota: int = None,
+               record_raw_depth: bool = False,
+               frame_counter: Value = None,
+               colorizer: str = "lut",
+               depth_range: tuple = (0.3, 4.0),
+               colormap: int = cv2.COLORMAP_JET,
+               overlay_sinks: tuple = ("preview", "video", "sender"),
+               collect_stats: bool = False,
+               stats_interval: float = None,
+               stats_sink: typing.Callable[[dict], None] = None,
+               stop_event: Event = None,
+               max_frames: int = None,
+               duration: float = None,
+               align_depth: bool = False,
+               point_cloud: bool = False,
+               depth_filters: typing.Union[typing.Sequence, DepthFilterChain] = None,
+               frame_buffers: int = 3,
+               barrier_timeout: float = None):
         """Запуск потока видеозаписи видео/сохранения кадров/вывода
 
         Args:
-            `color_profile (int)`: Цветовой профиль
+            `color_profile (int | tuple | dict)`: Номер цветового профиля или его параметры `(width, height, format, fps)`,
+            например `(1280, 720, "bgr8", 30)`. Если точного профиля нет, выбирается ближайший
             
-            `depth_profile (int)`: Профиль глубины
+            `depth_profile (int | tuple | dict)`: Номер профиля глубины или его параметры `(width, height, format, fps)`
             
             img_count (int, optional)`: Необходимое колличество изображений. Используется при режиме работы `frame`. По умолчанию `10`.
             
@@ -448,13 +929,84 @@ The folder has already been created")
             `fps (int, optional)`: FPS записи для видеофайла. Используется при режиме работы `video`. По умолчанию `30`.
             
             `barier (Barrier)`: Барьер для синхронизации потоков. Используется в мультипроцесорности или многопоточности. По умолчанию None.
+            
+            `sender (Pipe | SharedFrameRing)`: Передатчик кадров в другой процесс. По умолчанию None.
+            
+            `async_write (bool, optional)`: Запись кадров на диск в фоновых потоках. Используется при режиме работы `frame`. По умолчанию `True`.
+            
+            `write_queue (int, optional)`: Размер очереди фоновой записи. По умолчанию `32`.
+            
+            `write_policy (str, optional)`: Политика при переполнении очереди записи: `block`, `drop_oldest`, `drop_newest`. По умолчанию `block`.
+            
+            `segment_duration (float, optional)`: Длительность сегмента видео в секундах. Используется при режиме работы `video`. По умолчанию `None` - один файл.
+            
+            `segment_size (int, optional)`: Максимальный размер сегмента видео в байтах. Используется при режиме работы `video`. По умолчанию `None`.
+            
+            `storage_quota (int, optional)`: Максимальный суммарный размер сегментов видео в байтах, старые сегменты удаляются. По умолчанию `None`.
+            
+            `record_raw_depth (bool, optional)`: Запись необработанной глубины z16 без потерь в контейнер `DepthRecorder`. Используется при режиме работы `video`.
+            Файл не делится на сегменты и не учитывается в `storage_quota`, его размер растет все время записи. По умолчанию `False`.
+            
+            `frame_counter (Value, optional)`: Счетчик обработанных кадров для контроля работы процесса (`CameraSupervisor`). По умолчанию None.
+            
+            `colorizer (str, optional)`: Способ раскраски глубины: `lut` - таблица соответствия `DepthColorizer`, `rs` - `rs.colorizer`. По умолчанию `lut`.
+            
+            `depth_range (tuple, optional)`: Диапазон глубины цветовой шкалы в метрах. Используется при `colorizer="lut"`. По умолчанию `(0.3, 4.0)`.
+            
+            `colormap (int, optional)`: Цветовая карта OpenCV. Используется при `colorizer="lut"`. По умолчанию `cv2.COLORMAP_JET`.
+            
+            `overlay_sinks (tuple, optional)`: Получатели цветного кадра с наложенными надписями и перекрестием: `preview`, `video`, `sender`.
+            Остальные получают чистый кадр. По умолчанию `("preview", "video", "sender")`.
+            
+            `collect_stats (bool, optional)`: Измерять длительность этапов обработки кадра и считать пропущенные и повторные кадры. По умолчанию `False`.
+            
+            `stats_interval (float, optional)`: Период сводки статистики в секундах. По умолчанию `None` - без сводки.
+            
+            `stats_sink (Callable, optional)`: Приемник сводки статистики `dict`. По умолчанию сводка пишется в лог.
+            
+            `stop_event (Event, optional)`: Событие остановки камеры из другого потока или процесса. По умолчанию None.
+            
+            `max_frames (int, optional)`: Остановка после обработки заданного колличества кадров. По умолчанию `None` - без ограничения.
+            
+            `duration (float, optional)`: Остановка после заданного времени работы в секундах. По умолчанию `None` - без ограничения.
+            
+            `align_depth (bool, optional)`: Выравнивать глубину по цветному кадру (`rs.align`) до раскраски, записи и передачи. По умолчанию `False`.
+            
+            `point_cloud (bool, optional)`: Вычислять облако точек XYZ `(H, W, 3)` float32. Облако передается третьим массивом
+            кадра `sender` и доступно через `get_point_cloud()`. По умолчанию `False`.
+            
+            `depth_filters (Sequence | DepthFilterChain, optional)`: Фильтры постобработки глубины до раскраски,
+            записи и передачи, например `RECOMMENDED_DEPTH_FILTERS`. При `align_depth` применяются до выравнивания,
+            и глубина сохраняет разрешение цвета. Без выравнивания прореживание уменьшает кадр глубины всех получателей,
+            размер кадров глубины `sender` должен соответствовать ему. По умолчанию `None`.
+            
+            `frame_buffers (int, optional)`: Колличество буферов кадра для `getFrames()`, `get_point_cloud()` и получателей:
+            2 - двойная, 3 - тройная буферизация. Кадры librealsense копируются в буферы один раз и сразу освобождаются. По умолчанию `3`.
+            
+            `barrier_timeout (float, optional)`: Время ожидания остальных камер на барьере в секундах. Если барьер не пройден
+            или разрушен (`barrier.abort()`), камера завершает работу с ошибкой. По умолчанию `None` - ожидать бесконечно.
         """
         
         self.__flag = True
+        self.__failed = False
+        self.__stats = StreamStats(f"[RS] Camera {self.__device_name} #{self.__device_serial_number}",
+                                   enabled=collect_stats, log_interval=stats_interval, sink=stats_sink)
         
         # Конфигурирование камер
         depth_prof, color_prof = self._configuration_camera(color_profile=color_profile,
                                                              depth_profile=depth_profile)
+        depth_shape = self.__prepare_depth(depth_prof, color_prof, align_depth, point_cloud, depth_filters)
+        buffers = self.__buffers = FrameBuffers(frame_buffers)
+        
+        # Раскраска глубины
+        self.__depth_colorizer = None
+        if colorizer == "lut":
+            self.__depth_colorizer = DepthColorizer(depth_range[0], depth_range[1], colormap,
+                                                    depth_scale=self.__depth_scale())
+        
+        # Раскрашенная глубина нужна только окну предпросмотра, записи и передатчику, для `getFrames` LUT раскрашивает ее по запросу.
+        # `rs.colorizer` требует кадр librealsense, который освобождается сразу после копирования, поэтому раскрашивает каждый кадр
+        colorize_depth = show_gui_depth or sender is not None or self.__mode in ("video", "frame") or self.__depth_colorizer is None
         
         #  Создание папки для записи материалов
         if self.__mode == "video":
@@ -469,35 +1021,105 @@ The folder has already been created")
                                 path=path)
             self._create_folder(folder_name=f"RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth_np", 
                                 path=path)
+            
+            # Необработанная глубина записывается в один архив вместо отдельных .npy файлов,
+            # каждая сессия - в отдельную папку, чтобы не перезаписать архив предыдущего запуска
+            self.__depth_archive = DepthArchive(
+                DepthArchive.session_folder(f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth_np"),
+                depth_shape, capacity=max(img_count, 1))
+        
+        # Подготовка фоновой записи кадров
+        if self.__mode == "frame" and async_write:
+            self.__disk_writer = AsyncFrameWriter(max_queue=write_queue, policy=write_policy,
+                                                  name=f"Writer {self.__device_serial_number}")
         
         # Настройка файлов записи видео материала
-        depth_writer, color_writer = None, None
+        depth_writer, color_writer, depth_recorder = None, None, None
         if self.__mode == "video":
-            depth_writer, color_writer = self._video_writer(path, depth_prof, color_prof)
+            depth_writer, color_writer = self._video_writer(path, depth_prof, color_prof,
+                                                            segment_duration=segment_duration,
+                                                            segment_size=segment_size,
+                                                            storage_quota=storage_quota,
+                                                            depth_shape=depth_shape)
+            if record_raw_depth:
+                depth_recorder = DepthRecorder(
+                    f"{path}/RS_Camera_{self.__device_name}_{self.__device_serial_number}_{self.__mode}/depth_raw_{self.__device_name}_{self.__device_serial_number}_{depth_shape[1]}x{depth_shape[0]}_{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.zdepth",
+                    depth_shape)
+        
+        # Слой наложения рисуется прямо на цветном кадре, если его получают все активные получатели,
+        # иначе на копии кадра
+        self.__overlay.clear()
+        sinks = {"preview": show_gui_color, "video": color_writer is not None, "sender": sender is not None}
+        hud_sinks = {sink for sink, active in sinks.items() if active and sink in overlay_sinks}
+        overlay_inplace = all(sink in hud_sinks for sink, active in sinks.items() if active)
         
         # Ожидание других потоков или процессов
         if barrier:
-            barrier.wait()
+            try:
+                barrier.wait(barrier_timeout)
+            except threading.BrokenBarrierError:
+                self.__failed = True
+                logging.error(f"[RS] The camera {self.__device_name} #{self.__device_serial_number} did not pass the barrier, other cameras failed or timed out")
+                self.release(writers=[depth_writer, color_writer, depth_recorder], show_gui=show_gui_color or show_gui_depth)
+                return
         
+        stats = self.__stats
+        show_gui = show_gui_color or show_gui_depth
+        deadline = time.monotonic() + duration if duration else None
         start_time = time.time()
         counter = 0
+        seq = 0
         logging.info(f"RS] The camera {self.__device_name} #{self.__device_serial_number} has started working in the '{self.__mode}' mode")
         
         while self.__flag:
             try:
                 
                 datetime_now = datetime.datetime.now()
-                key = cv2.waitKey(1)
+                stats.start()
+                
+                # Без окон предпросмотра HighGUI не используется
+                key = -1
+                if show_gui:
+                    key = cv2.waitKey(1)
+                    stats.lap("waitkey")
                 
                 # Предобработка кадров глубины и цвета
                 frame = self.__pipeline.wait_for_frames()
+                capture_time = time.time()
+                stats.lap("wait")
+                
+                # Фильтры применяются до выравнивания, чтобы прореживание не уменьшало выровненную глубину
+                if self.__aligner is not None:
+                    if self.__depth_filters is not None:
+                        frame = self.__depth_filters.process(frame).as_frameset()
+                        stats.lap("filter")
+                    frame = self.__aligner.process(frame)
+                    stats.lap("align")
+                
                 depth_f = frame.get_depth_frame()
                 color_f = frame.get_color_frame()
+                if self.__aligner is None and self.__depth_filters is not None:
+                    depth_f = self.__depth_filters.process(depth_f)
+                    stats.lap("filter")
+                stats.sequence(color_f.get_frame_number())
+                
+                # Единственная копия кадров librealsense в буферы, после раскраски кадры сразу возвращаются в пул устройства
+                buffers.begin()
+                depth_data_frame = buffers.copy("depth", np.asanyarray(depth_f.get_data()))
+                color_i = buffers.copy("color", np.asanyarray(color_f.get_data()))
+                stats.lap("copy")
+                if colorize_depth:
+                    depth_i = self.__colorize(depth_f, depth_data_frame)
+                    stats.lap("colorize")
+                else:
+                    depth_i = None
+                frame = depth_f = color_f = None
                 
-                depth_data_frame = np.asanyarray(depth_f.get_data())
-                # depth_i = cv2.applyColorMap(cv2.convertScaleAbs(depth_f, alpha=0.05), cv2.COLORMAP_JET)
-                depth_i = np.asanyarray(self.__colorizer.colorize(depth_f).get_data())
-                color_i = np.asanyarray(color_f.get_data())
+                points = None
+                if self.__point_cloud is not None:
+                    points = self.__point_cloud.compute(
+                        depth_data_frame, out=buffers.buffer("points", depth_data_frame.shape + (3, ), np.float32))
+                    stats.lap("points")
 
                 #  Сохранение кадра в файл
                 if self.__mode == "frame":
@@ -507,43 +1129,69 @@ The folder has already been created")
                                                                     counter)
                 # Сохранение видео в файл
                 elif self.__mode == "video":
-                    color_i = cv2.putText(color_i, 
-                                          f"{datetime_now.hour}:{datetime_now.minute}:{datetime_now.second}",
-                                          (20, 20), cv2.FONT_HERSHEY_COMPLEX_SMALL,
-                                          1, (0, 0, 255), 1)
-                    
-                    depth_writer.write(depth_i) 
-                    color_writer.write(color_i)
+                    self.__overlay.text("clock", f"{datetime_now.hour}:{datetime_now.minute}:{datetime_now.second}",
+                                        (20, 20), (0, 0, 255))
 
                 elif self.__mode == "centring":
-                    color_i = self.__centring(color_i)
+                    self.__overlay.crosshair(color_i.shape)
+                stats.lap("save")
+                
+                hud = self.__overlay.apply(color_i if overlay_inplace else buffers.copy("overlay", color_i))
+                buffers.commit(capture_time)
+                stats.lap("overlay")
                 
-                self.__color_frame = color_i
-                self.__depth_frame = depth_i
+                if color_writer is not None:
+                    color_writer.write(hud if "video" in hud_sinks else color_i)
+                    depth_writer.write(depth_i)
+                    
+                    if depth_recorder:
+                        depth_recorder.append(depth_data_frame, datetime_now.timestamp())
+                    stats.lap("write")
+                
+                if frame_counter is not None:
+                    frame_counter.value += 1
 
                 if sender:
-                    sender.send((color_i, depth_i))
+                    arrays = (hud if "sender" in hud_sinks else color_i, depth_i)
+                    if points is not None:
+                        arrays += (points, )
+                    sender.send(FramePacket(arrays, capture_time, seq))
+                    stats.lap("send")
+                seq += 1
 
                 # Отображение окна предосмотра видео
                 if show_gui_color:
-                    cv2.imshow(f"{self.__device_name} | {self.__device_serial_number} color", color_i)
+                    cv2.imshow(f"{self.__device_name} | {self.__device_serial_number} color",
+                               hud if "preview" in hud_sinks else color_i)
                     
                 if show_gui_depth:
                     cv2.imshow(f"{self.__device_name} | {self.__device_serial_number} depth", depth_i)
                 
+                if show_gui:
+                    stats.lap("show")
+                
+                stats.frame()
+                
                 # Выход по нажатию клавиши Q или по вызову метода stop
                 if key == ord('q') & 0xFF or not self.__flag:
                     logging.info("[RS] The recording was completed by pressing a key or calling the 'stop' method")
-                    self.release(writers=[depth_writer, color_writer])
-                    cv2.destroyAllWindows()
+                    self.release(writers=[depth_writer, color_writer, depth_recorder], show_gui=show_gui)
+                
+                # Выход по событию остановки, колличеству кадров или времени работы
+                elif stop_event is not None and stop_event.is_set():
+                    logging.info(f"[RS] The camera {self.__device_name} #{self.__device_serial_number} received a stop event")
+                    self.release(writers=[depth_writer, color_writer, depth_recorder], show_gui=show_gui)
+                
+                elif (max_frames and seq >= max_frames) or (deadline and time.monotonic() >= deadline):
+                    logging.info(f"[RS] The recording has ended. Frame or time limit reached, {seq} frames processed")
+                    self.release(writers=[depth_writer, color_writer, depth_recorder], show_gui=show_gui)
 
                 # Выход при сохранении всех изображений
-                if counter >= img_count:
+                elif counter >= img_count:
                     logging.info("[RS] The recording has ended. All images have been successfully collected")
-                    self.release(writers=[depth_writer, color_writer])
-                    cv2.destroyAllWindows()
+                    self.release(writers=[depth_writer, color_writer, depth_recorder], show_gui=show_gui)
                 
             except:
+                self.__failed = True
                 logging.error(f"[RS] An unexpected error has occurred, the operation of the camera under the index {self.__device_name} #{self.__device_serial_number} is suspended")
-                self.release(writers=[depth_writer, color_writer])
-                cv2.destroyAllWindows()
\ No newline at end of file
+                self.release(writers=[depth_writer, color_writer, depth_recorder], show_gui=show_gui)
\ No newline at end of file
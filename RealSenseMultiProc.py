@@ -1,21 +1,49 @@
-from multiprocessing import Process, Barrier, Pipe
+import sys
+import cv2
+from typing import Any, Callable, Sequence, Union
+from multiprocessing import Process, Barrier, Event, Pipe, Value
 
 from .RealSenseCamera import CameraRS
+from .SharedMemoryRing import SharedFrameRing
 
 class RealSenseMultiProc(Process):
 
     def __init__(self, 
-                 device_id: int, 
+                 device_id: Union[int, str], 
                  mode: str, 
-                 color_profile: int, 
-                 depth_profile: int,
+                 color_profile: Union[int, tuple, dict], 
+                 depth_profile: Union[int, tuple, dict],
                  img_count: int = 10,
                  time_out: int = 5,
                  path: str = "./",
                  show_gui_color: bool = True,
                  show_gui_depth: bool = True, 
                  barrier: Barrier = None,
-                 sender: Pipe = None):
+                 sender: Union[Pipe, SharedFrameRing] = None,
+                 async_write: bool = True,
+                 write_queue: int = 32,
+                 write_policy: str = "block",
+                 segment_duration: float = None,
+                 segment_size: int = None,
+                 storage_quota: int = None,
+                 record_raw_depth: bool = False,
+                 frame_counter: Value = None,
+                 colorizer: str = "lut",
+                 depth_range: tuple = (0.3, 4.0),
+                 colormap: int = cv2.COLORMAP_JET,
+                 overlay_sinks: tuple = ("preview", "video", "sender"),
+                 backend: Any = None,
+                 collect_stats: bool = False,
+                 stats_interval: float = None,
+                 stats_sink: Callable = None,
+                 stop_event: Event = None,
+                 max_frames: int = None,
+                 duration: float = None,
+                 align_depth: bool = False,
+                 point_cloud: bool = False,
+                 depth_filters: Sequence = None,
+                 frame_buffers: int = 3,
+                 barrier_timeout: float = None):
         
         super(RealSenseMultiProc, self).__init__()
 
@@ -30,10 +58,34 @@ class RealSenseMultiProc(Process):
         self.show_gui_depth = show_gui_depth
         self.barrier = barrier
         self.sender = sender
+        self.async_write = async_write
+        self.write_queue = write_queue
+        self.write_policy = write_policy
+        self.segment_duration = segment_duration
+        self.segment_size = segment_size
+        self.storage_quota = storage_quota
+        self.record_raw_depth = record_raw_depth
+        self.frame_counter = frame_counter
+        self.colorizer = colorizer
+        self.depth_range = depth_range
+        self.colormap = colormap
+        self.overlay_sinks = overlay_sinks
+        self.backend = backend
+        self.collect_stats = collect_stats
+        self.stats_interval = stats_interval
+        self.stats_sink = stats_sink
+        self.stop_event = stop_event if stop_event is not None else Event()
+        self.max_frames = max_frames
+        self.duration = duration
+        self.align_depth = align_depth
+        self.point_cloud = point_cloud
+        self.depth_filters = depth_filters
+        self.frame_buffers = frame_buffers
+        self.barrier_timeout = barrier_timeout
 
     def run(self):
 
-        rs = CameraRS(self.device_id, self.mode)
+        rs = CameraRS(self.device_id, self.mode, backend=self.backend)
         rs.stream(color_profile=self.color_profile, 
                   depth_profile=self.depth_profile,
                   img_count = self.img_count,
@@ -42,4 +94,36 @@ class RealSenseMultiProc(Process):
                   show_gui_color = self.show_gui_color,
                   show_gui_depth  = self.show_gui_depth,
                   barrier=self.barrier,
-                  sender=self.sender)
\ No newline at end of file
+                  sender=self.sender,
+                  async_write=self.async_write,
+                  write_queue=self.write_queue,
+                  write_policy=self.write_policy,
+                  segment_duration=self.segment_duration,
+                  segment_size=self.segment_size,
+                  storage_quota=self.storage_quota,
+                  record_raw_depth=self.record_raw_depth,
+                  frame_counter=self.frame_counter,
+                  colorizer=self.colorizer,
+                  depth_range=self.depth_range,
+                  colormap=self.colormap,
+                  overlay_sinks=self.overlay_sinks,
+                  collect_stats=self.collect_stats,
+                  stats_interval=self.stats_interval,
+                  stats_sink=self.stats_sink,
+                  stop_event=self.stop_event,
+                  max_frames=self.max_frames,
+                  duration=self.duration,
+                  align_depth=self.align_depth,
+                  point_cloud=self.point_cloud,
+                  depth_filters=self.depth_filters,
+                  frame_buffers=self.frame_buffers,
+                  barrier_timeout=self.barrier_timeout)
+        
+        # Код завершения процесса сообщает об аварийной остановке камеры
+        if rs.failed:
+            sys.exit(1)
+
+    def stop(self) -> None:
+        """Остановка камеры из родительского процесса. Камера завершает запись и освобождает ресурсы
+        """
+        self.stop_event.set()
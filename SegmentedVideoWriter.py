@@ -0,0 +1,302 @@
+import os
+import cv2
+import glob
+import time
+import logging
+import datetime
+import threading
+import collections
+import numpy as np
+
+
+class SegmentedVideoWriter:
+    """Запись видео сегментами с кодированием в фоновом потоке.
+
+    Замена `cv2.VideoWriter` для длительной записи: новый файл начинается
+    по истечении `segment_duration` секунд или при превышении `segment_size` байт,
+    а при превышении `storage_quota` удаляются самые старые сегменты. Квота проверяется раз в секунду записи;
+    если ограничения сегмента не заданы, размер сегмента ограничивается `storage_quota / QUOTA_SEGMENTS`.
+    Имя сегмента: `{prefix}_{ГГГГММДД-ЧЧММСС}.avi`, где время - начало сегмента.
+
+    Рядом с сегментом пишется файл `.csv` с временем захвата каждого кадра (`frame,timestamp,gap_s`).
+    Разрыв потока (`mark_gap`) записывается в колонку `gap_s` первого кадра после разрыва.
+    """
+
+    TIME_FORMAT = "%Y%m%d-%H%M%S"
+    # Колличество сегментов в квоте при записи без ограничения размера сегмента
+    QUOTA_SEGMENTS = 10
+
+    def __init__(self,
+                 folder: str,
+                 prefix: str,
+                 fps: float,
+                 fourcc: str = "MJPG",
+                 segment_duration: float = None,
+                 segment_size: int = None,
+                 storage_quota: int = None,
+                 max_queue: int = 64,
+                 timestamps: bool = True):
+        """
+        Args:
+            `folder (str)`: Папка для сохранения сегментов
+
+            `prefix (str)`: Префикс имени файла сегмента
+
+            `fps (float)`: fps записи видео
+
+            `fourcc (str, optional)`: Кодек записи. По умолчанию `MJPG`.
+
+            `segment_duration (float, optional)`: Длительность сегмента в секундах. По умолчанию `None` - без ограничения.
+
+            `segment_size (int, optional)`: Максимальный размер сегмента в байтах. По умолчанию `None` - без ограничения.
+
+            `storage_quota (int, optional)`: Максимальный суммарный размер сегментов в байтах. По умолчанию `None` - без ограничения.
+            Без `segment_size` размер сегмента ограничивается `storage_quota / QUOTA_SEGMENTS`, иначе текущий сегмент нельзя удалить.
+
+            `max_queue (int, optional)`: Размер очереди кадров на кодирование. При переполнении новые кадры пропускаются. По умолчанию `64`.
+
+            `timestamps (bool, optional)`: Записывать файл времени кадров рядом с сегментом. По умолчанию `True`.
+        """
+
+        self.__folder = folder
+        self.__prefix = prefix
+        self.__fps = fps
+        self.__fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.__segment_duration = segment_duration
+        self.__segment_size = segment_size
+        self.__storage_quota = storage_quota
+        if storage_quota and not segment_size:
+            # Текущий сегмент не удаляется, поэтому без ограничения размера он может занять больше квоты
+            self.__segment_size = max(1, storage_quota // self.QUOTA_SEGMENTS)
+            if not segment_duration:
+                logging.warning(f"[VIDEO] Storage quota {storage_quota} bytes is set without segment limits for '{prefix}', \
+segments are limited to {self.__segment_size} bytes")
+        self.__max_queue = max(1, max_queue)
+        self.__timestamps = timestamps
+
+        self.__queue = collections.deque()
+        self.__cond = threading.Condition()
+        self.__running = True
+
+        self.__writer = None
+        self.__sidecar = None
+        self.__pending_gap = 0.0
+        self.__gaps = 0
+        self.__segment_path = None
+        self.__segment_start = 0.0
+        self.__segment_frames = 0
+        self.__segments = 0
+        self.__written = 0
+        self.__dropped = 0
+
+        self.__worker = threading.Thread(target=self.__encode, name=f"Encoder {prefix}", daemon=True)
+        self.__worker.start()
+
+
+    @property
+    def segment_path(self) -> str:
+        """Путь текущего сегмента
+
+        Returns:
+            `str`: Путь файла
+        """
+        return self.__segment_path
+
+
+    @property
+    def dropped(self) -> int:
+        """Колличество кадров, пропущенных из-за переполнения очереди кодирования
+
+        Returns:
+            `int`: Колличество пропущенных кадров
+        """
+        return self.__dropped
+
+
+    @property
+    def gaps(self) -> int:
+        """Колличество отмеченных разрывов потока
+
+        Returns:
+            `int`: Колличество разрывов
+        """
+        return self.__gaps
+
+
+    def isOpened(self) -> bool:
+        return self.__running
+
+
+    def mark_gap(self, duration: float) -> None:
+        """Отметка разрыва потока (например переподключения камеры). Файл записи не закрывается,
+        длительность разрыва записывается в файл времени для следующего кадра
+
+        Args:
+            `duration (float)`: Длительность разрыва в секундах
+        """
+        with self.__cond:
+            self.__pending_gap += duration
+            self.__gaps += 1
+
+
+    def write(self, frame: np.ndarray, timestamp: float = None) -> bool:
+        """Постановка кадра в очередь кодирования. Совместим с `cv2.VideoWriter.write`
+
+        Args:
+            `frame (np.ndarray)`: Кадр
+
+            `timestamp (float, optional)`: Время захвата кадра. По умолчанию `time.time()`
+
+        Returns:
+            `bool`: Принят ли кадр в очередь
+        """
+        with self.__cond:
+            if not self.__running:
+                return False
+
+            if len(self.__queue) >= self.__max_queue:
+                self.__dropped += 1
+                return False
+
+            self.__queue.append((frame.copy(), time.time() if timestamp is None else timestamp, self.__pending_gap))
+            self.__pending_gap = 0.0
+            self.__cond.notify()
+
+        return True
+
+
+    def __encode(self) -> None:
+        while True:
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__queue or not self.__running)
+                if not self.__queue:
+                    break
+                frame, timestamp, gap = self.__queue.popleft()
+
+            try:
+                if self.__need_new_segment(timestamp):
+                    self.__open_segment(frame, timestamp)
+
+                self.__writer.write(frame)
+                if self.__sidecar:
+                    self.__sidecar.write(f"{self.__segment_frames},{timestamp:.6f},{gap:.3f}\n")
+                self.__segment_frames += 1
+                self.__written += 1
+            except Exception as e:
+                logging.error(f"[VIDEO] Failed to encode frame into segment {self.__segment_path}: {e}")
+
+        self.__close_segment()
+
+
+    def __need_new_segment(self, timestamp: float) -> bool:
+        if self.__writer is None:
+            return True
+
+        if self.__segment_duration and timestamp - self.__segment_start >= self.__segment_duration:
+            return True
+
+        # Размер файла и квота проверяются раз в секунду записи
+        if self.__segment_frames % max(1, int(self.__fps)) == 0:
+            if self.__segment_size:
+                try:
+                    if os.path.getsize(self.__segment_path) >= self.__segment_size:
+                        return True
+                except OSError:
+                    pass
+
+            # Старые сегменты удаляются во время записи, а не только при открытии сегмента.
+            # Если квоту превышает текущий сегмент, он закрывается, чтобы его можно было удалить
+            if self.__storage_quota and self.__segment_frames and self.__apply_quota() > self.__storage_quota:
+                return True
+
+        return False
+
+
+    def __open_segment(self, frame: np.ndarray, timestamp: float) -> None:
+        self.__close_segment()
+
+        start = datetime.datetime.fromtimestamp(timestamp).strftime(self.TIME_FORMAT)
+        path = f"{self.__folder}/{self.__prefix}_{start}.avi"
+
+        # Несколько сегментов в пределах одной секунды
+        index = 1
+        while os.path.exists(path):
+            path = f"{self.__folder}/{self.__prefix}_{start}_{index}.avi"
+            index += 1
+
+        height, width = frame.shape[:2]
+        self.__writer = cv2.VideoWriter(path, self.__fourcc, self.__fps, (width, height), frame.ndim == 3)
+        if self.__timestamps:
+            self.__sidecar = open(f"{os.path.splitext(path)[0]}.csv", "w")
+            self.__sidecar.write("frame,timestamp,gap_s\n")
+        self.__segment_path = path
+        self.__segment_start = timestamp
+        self.__segment_frames = 0
+        self.__segments += 1
+        logging.info(f"[VIDEO] New video segment {path}")
+
+        self.__apply_quota()
+
+
+    def __close_segment(self) -> None:
+        if self.__writer is not None:
+            self.__writer.release()
+            self.__writer = None
+
+        if self.__sidecar is not None:
+            self.__sidecar.close()
+            self.__sidecar = None
+
+
+    def segments(self) -> list:
+        """Список сегментов с текущим префиксом, от старых к новым
+
+        Returns:
+            `list`: Пути файлов сегментов
+        """
+        pattern = glob.escape(f"{self.__folder}/{self.__prefix}_") + "*.avi"
+        return sorted(glob.glob(pattern))
+
+
+    def __apply_quota(self) -> int:
+        """Удаление самых старых сегментов, пока их суммарный размер превышает квоту. Текущий сегмент не удаляется
+
+        Returns:
+            `int`: Суммарный размер оставшихся сегментов в байтах
+        """
+        if not self.__storage_quota:
+            return 0
+
+        segments = [(path, os.path.getsize(path)) for path in self.segments() if os.path.exists(path)]
+        total = sum(size for _, size in segments)
+
+        for path, size in segments:
+            if total <= self.__storage_quota or path == self.__segment_path:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                sidecar = f"{os.path.splitext(path)[0]}.csv"
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+                logging.info(f"[VIDEO] Segment {path} removed, storage quota {self.__storage_quota} bytes exceeded")
+            except OSError as e:
+                logging.error(f"[VIDEO] Failed to remove segment {path}: {e}")
+
+        return total
+
+
+    def release(self, timeout: float = None) -> None:
+        """Кодирование оставшихся кадров и закрытие текущего сегмента. Совместим с `cv2.VideoWriter.release`
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+        """
+        with self.__cond:
+            if not self.__running:
+                return
+            self.__running = False
+            self.__cond.notify_all()
+
+        self.__worker.join(timeout)
+        logging.info(f"[VIDEO] Recording '{self.__prefix}' finished. Segments {self.__segments}, frames {self.__written}, dropped {self.__dropped}, gaps {self.__gaps}")
@@ -0,0 +1,334 @@
+import time
+import typing
+import logging
+import numpy as np
+
+from multiprocessing import shared_memory
+
+from .FramePacket import FramePacket
+
+
+class SharedFrameRing:
+    """Кольцевой буфер кадров в разделяемой памяти (`multiprocessing.shared_memory`).
+
+    Используется вместо `multiprocessing.Pipe` для передачи кадров между процессами:
+    кадр копируется в разделяемую память один раз, без сериализации `pickle`.
+    Объект можно передавать в `Camera.stream`, `CameraRS.stream` и `RealSenseMultiProc`
+    вместо параметра `sender`, а также в `preview_cameras` вместо приемника `Pipe`.
+
+    Каждый слот хранит номер последовательности, время захвата и набор массивов
+    (например `(color, depth)` для RealSense).
+    """
+
+    _ALIGN = 64
+
+    def __init__(self,
+                 shapes: typing.Sequence[tuple],
+                 dtypes: typing.Union[np.dtype, typing.Sequence[np.dtype]] = np.uint8,
+                 slots: int = 4,
+                 name: str = None,
+                 create: bool = True):
+        """
+        Args:
+            `shapes (Sequence[tuple])`: Размеры массивов одного кадра. Например `[(480, 640, 3)]` для `Camera`
+            или `[(720, 1280, 3), (720, 1280, 3)]` для `CameraRS`.
+
+            `dtypes (dtype | Sequence[dtype], optional)`: Типы данных массивов. По умолчанию `np.uint8`.
+
+            `slots (int, optional)`: Колличество слотов в кольце. По умолчанию `4`.
+
+            `name (str, optional)`: Имя блока разделяемой памяти. Используется при подключении к существующему кольцу.
+
+            `create (bool, optional)`: Создать новый блок памяти или подключиться к существующему. По умолчанию `True`.
+        """
+
+        if slots < 2:
+            logging.error("[SHM] The ring buffer requires at least 2 slots")
+            raise ValueError("[SHM] The ring buffer requires at least 2 slots")
+
+        if isinstance(dtypes, (list, tuple)):
+            dtypes = [np.dtype(dtype) for dtype in dtypes]
+        else:
+            dtypes = [np.dtype(dtypes)] * len(shapes)
+
+        if len(dtypes) != len(shapes):
+            logging.error("[SHM] The number of 'shapes' and 'dtypes' must match")
+            raise ValueError("[SHM] The number of 'shapes' and 'dtypes' must match")
+
+        self.__shapes = [tuple(shape) for shape in shapes]
+        self.__dtypes = dtypes
+        self.__slots = slots
+        self.__owner = create
+
+        layout, size = self.__layout()
+
+        if create:
+            self.__shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.__shm = self.__attach(name)
+
+        buf = self.__shm.buf
+        self.__head = np.ndarray((1, ), dtype=np.int64, buffer=buf, offset=layout["head"])
+        self.__seqs = np.ndarray((slots, ), dtype=np.int64, buffer=buf, offset=layout["seqs"])
+        self.__stamps = np.ndarray((slots, ), dtype=np.float64, buffer=buf, offset=layout["stamps"])
+        self.__buffers = [
+            np.ndarray((slots, ) + shape, dtype=dtype, buffer=buf, offset=offset)
+            for shape, dtype, offset in zip(self.__shapes, self.__dtypes, layout["data"])
+        ]
+
+        if create:
+            self.__head[0] = 0
+            self.__seqs[:] = -1
+            self.__stamps[:] = 0.0
+            logging.info(f"[SHM] Ring buffer '{self.__shm.name}' created. Slots {slots}, size {size} bytes")
+
+        self.__last_seq = -1
+        self.__dropped = 0
+
+
+    def __getstate__(self) -> dict:
+        # При передаче в другой процесс передается только имя блока памяти
+        return {"name": self.__shm.name, "shapes": self.__shapes,
+                "dtypes": [dtype.str for dtype in self.__dtypes], "slots": self.__slots}
+
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(shapes=state["shapes"], dtypes=state["dtypes"],
+                      slots=state["slots"], name=state["name"], create=False)
+
+
+    def __str__(self) -> str:
+        return f"[SHM] Ring buffer '{self.name}'. Slots {self.__slots}. Shapes {self.__shapes}"
+
+
+    @staticmethod
+    def __attach(name: str) -> shared_memory.SharedMemory:
+        """Подключение к существующему блоку разделяемой памяти без регистрации
+        в `resource_tracker` (блок освобождает только процесс-владелец)
+
+        Args:
+            `name (str)`: Имя блока разделяемой памяти
+
+        Returns:
+            `SharedMemory`: Блок разделяемой памяти
+        """
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13
+            return shared_memory.SharedMemory(name=name)
+
+
+    def __layout(self) -> tuple:
+        """Расчет смещений заголовка и массивов внутри блока памяти
+
+        Returns:
+            `tuple`: Словарь смещений. Общий размер блока в байтах
+        """
+        def align(value: int) -> int:
+            return (value + self._ALIGN - 1) // self._ALIGN * self._ALIGN
+
+        offset = 0
+        layout = {"head": offset}
+        offset = align(offset + 8)
+        layout["seqs"] = offset
+        offset = align(offset + 8 * self.__slots)
+        layout["stamps"] = offset
+        offset = align(offset + 8 * self.__slots)
+
+        layout["data"] = []
+        for shape, dtype in zip(self.__shapes, self.__dtypes):
+            layout["data"].append(offset)
+            offset = align(offset + int(np.prod(shape)) * dtype.itemsize * self.__slots)
+
+        return layout, offset
+
+
+    @property
+    def name(self) -> str:
+        """Имя блока разделяемой памяти
+
+        Returns:
+            `str`: Имя блока
+        """
+        return self.__shm.name
+
+
+    @property
+    def slots(self) -> int:
+        return self.__slots
+
+
+    @property
+    def dropped(self) -> int:
+        """Колличество кадров, перезаписанных до того, как их прочитал приемник
+
+        Returns:
+            `int`: Колличество пропущенных кадров
+        """
+        return self.__dropped
+
+
+    def send(self, data: tuple, timestamp: float = None) -> int:
+        """Запись кадра в следующий слот кольца. Совместим с `Pipe.send((frame, ))`
+
+        Args:
+            `data (tuple)`: Массивы кадра в порядке `shapes`
+
+            `timestamp (float, optional)`: Время захвата кадра. По умолчанию `data.timestamp` для `FramePacket`, иначе `time.time()`
+
+        Returns:
+            `int`: Номер последовательности записанного кадра
+        """
+
+        if len(data) != len(self.__buffers):
+            logging.error(f"[SHM] Expected {len(self.__buffers)} arrays, received {len(data)}")
+            raise ValueError(f"[SHM] Expected {len(self.__buffers)} arrays, received {len(data)}")
+
+        seq = int(self.__head[0])
+        slot = seq % self.__slots
+
+        # Слот помечается как записываемый, чтобы приемник не прочитал частично записанный кадр
+        self.__seqs[slot] = -1
+        for buffer, array in zip(self.__buffers, data):
+            if array.shape != buffer.shape[1:]:
+                logging.error(f"[SHM] Frame shape {array.shape} does not match the ring shape {buffer.shape[1:]}")
+                raise ValueError(f"[SHM] Frame shape {array.shape} does not match the ring shape {buffer.shape[1:]}")
+            np.copyto(buffer[slot], array, casting="unsafe")
+
+        self.__stamps[slot] = FramePacket.timestamp_of(data) if timestamp is None else timestamp
+        self.__seqs[slot] = seq
+        self.__head[0] = seq + 1
+
+        return seq
+
+
+    def poll(self, timeout: float = 0.0) -> bool:
+        """Проверка наличия непрочитанного кадра. Совместим с `Connection.poll`
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. `None` - ожидать бесконечно. По умолчанию `0`.
+
+        Returns:
+            `bool`: Имеется ли новый кадр
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while int(self.__head[0]) - 1 <= self.__last_seq:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.0005)
+
+        return True
+
+
+    def read(self, seq: int, copy: bool = False) -> typing.Optional[tuple]:
+        """Чтение кадра по номеру последовательности
+
+        Args:
+            `seq (int)`: Номер последовательности
+
+            `copy (bool, optional)`: Вернуть копию кадра вместо представления разделяемой памяти. По умолчанию `False`.
+
+        Returns:
+            `tuple | None`: Массивы кадра, номер последовательности, время захвата.
+            `None` если кадр уже перезаписан
+        """
+        slot = seq % self.__slots
+
+        if self.__seqs[slot] != seq:
+            return None
+
+        arrays = tuple(buffer[slot].copy() if copy else buffer[slot] for buffer in self.__buffers)
+        timestamp = float(self.__stamps[slot])
+
+        # Проверка, что слот не был перезаписан во время копирования
+        if copy and self.__seqs[slot] != seq:
+            return None
+
+        return arrays, seq, timestamp
+
+
+    def recv_frame(self, timeout: float = None, copy: bool = False) -> typing.Optional[tuple]:
+        """Получение следующего непрочитанного кадра вместе с номером последовательности и временем захвата.
+
+        Представления (`copy=False`) ссылаются на разделяемую память и остаются валидными,
+        пока передатчик не запишет еще `slots - 1` кадров.
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+
+            `copy (bool, optional)`: Вернуть копию кадра. По умолчанию `False`.
+
+        Returns:
+            `tuple | None`: Массивы кадра, номер последовательности, время захвата. `None` по истечении `timeout`
+        """
+
+        while self.poll(timeout):
+            head = int(self.__head[0])
+            seq = self.__last_seq + 1
+
+            # Приемник отстал больше чем на размер кольца - переходим к самому свежему кадру
+            if head - seq >= self.__slots:
+                self.__dropped += head - 1 - seq
+                seq = head - 1
+
+            frame = self.read(seq, copy=copy)
+            self.__last_seq = seq
+
+            if frame is not None:
+                return frame
+            self.__dropped += 1
+
+        return None
+
+
+    def recv(self, timeout: float = None) -> typing.Optional[FramePacket]:
+        """Получение следующего кадра. Совместим с `Pipe.recv()`
+
+        Args:
+            `timeout (float, optional)`: Время ожидания в секундах. По умолчанию `None` - ожидать бесконечно.
+
+        Returns:
+            `FramePacket | None`: Массивы кадра (представления разделяемой памяти) с номером и временем захвата
+        """
+        frame = self.recv_frame(timeout=timeout)
+        if frame is None:
+            return None
+        arrays, seq, timestamp = frame
+        return FramePacket(arrays, timestamp, seq)
+
+
+    def latest(self, copy: bool = False) -> typing.Optional[tuple]:
+        """Получение последнего записанного кадра без ожидания
+
+        Args:
+            `copy (bool, optional)`: Вернуть копию кадра. По умолчанию `False`.
+
+        Returns:
+            `tuple | None`: Массивы кадра, номер последовательности, время захвата
+        """
+        seq = int(self.__head[0]) - 1
+        if seq < 0:
+            return None
+
+        frame = self.read(seq, copy=copy)
+        if frame is not None:
+            self.__last_seq = max(self.__last_seq, seq)
+        return frame
+
+
+    def close(self) -> None:
+        """Закрытие доступа к разделяемой памяти в текущем процессе
+        """
+        self.__head = self.__seqs = self.__stamps = None
+        self.__buffers = []
+        self.__shm.close()
+
+
+    def unlink(self) -> None:
+        """Освобождение блока разделяемой памяти. Вызывается процессом-владельцем после остановки камер
+        """
+        if self.__owner:
+            self.__shm.unlink()
+            logging.info(f"[SHM] Ring buffer '{self.__shm.name}' released")
@@ -0,0 +1,215 @@
+import time
+import typing
+import logging
+import numpy as np
+
+
+class RollingWindow:
+    """Скользящее окно последних значений длительности этапа.
+
+    Запись - присваивание в заранее выделенный список, перцентили считаются только при запросе статистики.
+    """
+
+    def __init__(self, size: int = 1024):
+        """
+        Args:
+            `size (int, optional)`: Колличество последних значений в окне. По умолчанию `1024`.
+        """
+        self.__samples = [0.0] * size
+        self.__size = size
+        self.__count = 0
+        self.__total = 0.0
+        self.__max = 0.0
+
+
+    def add(self, value: float) -> None:
+        self.__samples[self.__count % self.__size] = value
+        self.__count += 1
+        self.__total += value
+        if value > self.__max:
+            self.__max = value
+
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+
+    def summary(self) -> dict:
+        """Статистика окна в миллисекундах
+
+        Returns:
+            `dict`: Колличество значений, среднее за все время, перцентили окна и максимум за все время
+        """
+        if not self.__count:
+            return {"count": 0}
+
+        window = np.array(self.__samples[:min(self.__count, self.__size)]) * 1000
+        p50, p90, p99 = np.percentile(window, (50, 90, 99))
+        return {
+            "count": self.__count,
+            "mean_ms": self.__total / self.__count * 1000,
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": self.__max * 1000,
+        }
+
+
+class StreamStats:
+    """Статистика цикла камеры: длительность этапов обработки кадра, счетчики пропущенных
+    и повторных кадров, периодическая сводка в лог или во внешний приемник метрик.
+
+    Этапы отмечаются вызовами `start()` в начале кадра и `lap(stage)` после каждого этапа.
+    При `enabled=False` методы измерения заменяются пустыми, учитывается только колличество кадров.
+    """
+
+    def __init__(self,
+                 name: str,
+                 enabled: bool = False,
+                 window: int = 1024,
+                 log_interval: float = None,
+                 sink: typing.Callable[[dict], None] = None):
+        """
+        Args:
+            `name (str)`: Имя камеры в сводке, например `[CCTV] Camera 0`
+
+            `enabled (bool, optional)`: Измерять длительность этапов и счетчики кадров. По умолчанию `False`.
+
+            `window (int, optional)`: Размер скользящего окна каждого этапа. По умолчанию `1024`.
+
+            `log_interval (float, optional)`: Период сводки в секундах. По умолчанию `None` - без сводки.
+
+            `sink (Callable, optional)`: Приемник сводки `dict` (например экспортер метрик). По умолчанию сводка пишется в лог.
+        """
+        self.__name = name
+        self.__enabled = enabled
+        self.__window = window
+        self.__log_interval = log_interval
+        self.__sink = sink
+
+        self.__stages = {}
+        self.__counters = {"dropped": 0, "duplicates": 0}
+        self.__frames = 0
+        self.__started = time.monotonic()
+        self.__next_report = self.__started + log_interval if log_interval else None
+        self.__report_frames = 0
+        self.__report_time = self.__started
+        self.__last = 0.0
+        self.__last_number = None
+
+        if not enabled:
+            self.start = self.lap = self.sequence = self.__skip
+
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+
+    @property
+    def frames(self) -> int:
+        return self.__frames
+
+
+    def __skip(self, *args) -> None:
+        pass
+
+
+    def start(self) -> None:
+        """Начало обработки кадра
+        """
+        self.__last = time.perf_counter()
+
+
+    def lap(self, stage: str) -> None:
+        """Завершение этапа: записывается время с предыдущей отметки
+
+        Args:
+            `stage (str)`: Имя этапа
+        """
+        now = time.perf_counter()
+        window = self.__stages.get(stage)
+        if window is None:
+            window = self.__stages[stage] = RollingWindow(self.__window)
+        window.add(now - self.__last)
+        self.__last = now
+
+
+    def sequence(self, number: int) -> None:
+        """Учет номера кадра источника: пропуск номеров - потерянные кадры, повтор номера - дубликат
+
+        Args:
+            `number (int)`: Номер кадра источника
+        """
+        last, self.__last_number = self.__last_number, number
+        if last is None:
+            return
+
+        gap = number - last
+        if gap == 0:
+            self.__counters["duplicates"] += 1
+        elif gap > 1:
+            self.__counters["dropped"] += gap - 1
+
+
+    def increment(self, counter: str, value: float = 1) -> None:
+        """Увеличение именованного счетчика
+
+        Args:
+            `counter (str)`: Имя счетчика
+
+            `value (float, optional)`: Приращение. По умолчанию `1`.
+        """
+        self.__counters[counter] = self.__counters.get(counter, 0) + value
+
+
+    def frame(self) -> None:
+        """Завершение кадра. Формирует периодическую сводку, если подошло время
+        """
+        self.__frames += 1
+
+        if self.__next_report is not None:
+            now = time.monotonic()
+            if now >= self.__next_report:
+                self.__next_report = now + self.__log_interval
+                self.report(now)
+
+
+    def report(self, now: float = None) -> dict:
+        """Формирование сводки за период и ее передача в приемник или лог
+
+        Returns:
+            `dict`: Сводка статистики
+        """
+        now = time.monotonic() if now is None else now
+        summary = self.summary()
+        period = max(now - self.__report_time, 1e-9)
+        summary["period_fps"] = (self.__frames - self.__report_frames) / period
+        self.__report_frames, self.__report_time = self.__frames, now
+
+        if self.__sink:
+            self.__sink(summary)
+        else:
+            stages = ", ".join(f"{stage} {value['p50_ms']:.2f}/{value['p99_ms']:.2f}"
+                               for stage, value in summary["stages"].items() if value["count"])
+            logging.info(f"{self.__name} stats: {summary['period_fps']:.1f} fps, frames {summary['frames']}, \
+dropped {summary['dropped']}, duplicates {summary['duplicates']}. Stages p50/p99 ms: {stages or '-'}")
+
+        return summary
+
+
+    def summary(self) -> dict:
+        """Текущая статистика
+
+        Returns:
+            `dict`: Колличество кадров, средний FPS, счетчики и статистика этапов в миллисекундах
+        """
+        uptime = time.monotonic() - self.__started
+        return {
+            "frames": self.__frames,
+            "uptime_s": uptime,
+            "fps": self.__frames / uptime if uptime > 0 else 0.0,
+            **self.__counters,
+            "stages": {stage: window.summary() for stage, window in self.__stages.items()},
+        }
@@ -0,0 +1,630 @@
+import time
+import types
+import functools
+import typing
+import numpy as np
+import cv2
+
+from .DepthColorizer import DepthColorizer
+
+
+def synthetic_color(count: int, width: int, height: int, seed: int = 0) -> list:
+    """Синтетические цветные кадры BGR: градиент, движущийся круг и шум
+
+    Args:
+        `count (int)`: Колличество кадров
+
+        `width (int)`: Ширина кадра
+
+        `height (int)`: Высота кадра
+
+        `seed (int, optional)`: Начальное значение генератора шума. По умолчанию `0`.
+
+    Returns:
+        `list`: Кадры `(H, W, 3)` типа `uint8`
+    """
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    base = np.dstack([xx * 255 // max(1, width - 1),
+                      yy * 255 // max(1, height - 1),
+                      np.full_like(xx, 128)]).astype(np.uint8)
+
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        center = (int(width / 2 + width / 4 * np.cos(2 * np.pi * i / count)),
+                  int(height / 2 + height / 4 * np.sin(2 * np.pi * i / count)))
+        cv2.circle(frame, center, max(4, min(width, height) // 10), (255, 255, 255), -1)
+        noise = rng.integers(0, 8, size=frame.shape, dtype=np.uint8)
+        frames.append(cv2.add(frame, noise))
+
+    return frames
+
+
+def synthetic_depth(count: int, width: int, height: int, seed: int = 0) -> list:
+    """Синтетические кадры z16: наклонная плоскость, шум сенсора и пропуски (нули)
+
+    Args:
+        `count (int)`: Колличество кадров
+
+        `width (int)`: Ширина кадра
+
+        `height (int)`: Высота кадра
+
+        `seed (int, optional)`: Начальное значение генератора шума. По умолчанию `0`.
+
+    Returns:
+        `list`: Кадры `(H, W)` типа `uint16`
+    """
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    base = 800 + 2 * yy + xx // 2
+
+    frames = []
+    for i in range(count):
+        frame = base + rng.normal(0, 4, size=base.shape) + 50 * np.sin(i / 10)
+        frame[rng.random(base.shape) < 0.03] = 0
+        frames.append(np.clip(frame, 0, 65535).astype(np.uint16))
+
+    return frames
+
+
+class _Pacer:
+    """Ограничение частоты выдачи кадров реальным FPS источника
+    """
+
+    def __init__(self, fps: float, realtime: bool):
+        self.__period = 1.0 / fps if realtime and fps > 0 else 0.0
+        self.__next = None
+
+
+    def wait(self) -> None:
+        if not self.__period:
+            return
+
+        now = time.monotonic()
+        if self.__next is None or now - self.__next > self.__period:
+            self.__next = now
+        elif self.__next > now:
+            time.sleep(self.__next - now)
+        self.__next += self.__period
+
+
+class SyntheticCapture:
+    """Синтетический источник кадров, совместимый с `cv2.VideoCapture`.
+
+    Передается в `Camera(capture_factory=...)` для работы без камеры: тестов, бенчмарков и отладки.
+    Кадры генерируются заранее и выдаются по кругу. Каждое чтение возвращает новый массив,
+    как и декодер OpenCV.
+    """
+
+    def __init__(self,
+                 device_id: typing.Union[int, str] = 0,
+                 size: tuple = (1280, 720),
+                 fps: float = 30,
+                 realtime: bool = False,
+                 negotiable: bool = True,
+                 frames: int = 16):
+        """
+        Args:
+            `device_id (int | str, optional)`: ID камеры. Используется только в логах. По умолчанию `0`.
+
+            `size (tuple, optional)`: Разрешение кадров `(W, H)`. По умолчанию `(1280, 720)`.
+
+            `fps (float, optional)`: FPS источника. По умолчанию `30`.
+
+            `realtime (bool, optional)`: Выдавать кадры с частотой `fps`, иначе максимально быстро. По умолчанию `False`.
+
+            `negotiable (bool, optional)`: Принимать разрешение, запрошенное через `CAP_PROP_FRAME_WIDTH/HEIGHT`. По умолчанию `True`.
+
+            `frames (int, optional)`: Колличество заранее сгенерированных кадров. По умолчанию `16`.
+        """
+        self.device_id = device_id
+        self.__size = tuple(size)
+        self.__fps = fps
+        self.__realtime = realtime
+        self.__negotiable = negotiable
+        self.__count = frames
+        self.__frames = None
+        self.__index = 0
+        self.__opened = True
+        self.__pacer = _Pacer(fps, realtime)
+
+
+    @classmethod
+    def factory(cls, **kwargs) -> typing.Callable:
+        """Фабрика источников для параметра `Camera(capture_factory=...)`
+
+        Returns:
+            `Callable`: Функция `device_id -> SyntheticCapture`, которую можно передать в другой процесс
+        """
+        return functools.partial(cls, **kwargs)
+
+
+    def isOpened(self) -> bool:
+        return self.__opened
+
+
+    def set(self, prop: int, value: float) -> bool:
+        width, height = self.__size
+
+        if prop == cv2.CAP_PROP_FPS:
+            self.__fps = value
+            self.__pacer = _Pacer(value, self.__realtime)
+            return True
+
+        if not self.__negotiable:
+            return False
+
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            height = int(value)
+        else:
+            return False
+
+        if (width, height) != self.__size:
+            self.__size = (width, height)
+            self.__frames = None
+        return True
+
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.__size[0])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.__size[1])
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.__fps)
+        return 0.0
+
+
+    def read(self) -> tuple:
+        if not self.__opened:
+            return False, None
+
+        if self.__frames is None:
+            self.__frames = synthetic_color(self.__count, *self.__size)
+
+        self.__pacer.wait()
+        frame = self.__frames[self.__index % self.__count].copy()
+        self.__index += 1
+        return True, frame
+
+
+    def release(self) -> None:
+        self.__opened = False
+
+
+class _Frame:
+
+    def __init__(self, data: np.ndarray, number: int, timestamp: float):
+        self.__data = data
+        self.__number = number
+        self.__timestamp = timestamp
+
+
+    def get_data(self) -> np.ndarray:
+        return self.__data
+
+
+    def get_frame_number(self) -> int:
+        return self.__number
+
+
+    def get_timestamp(self) -> float:
+        return self.__timestamp
+
+
+    def get_width(self) -> int:
+        return self.__data.shape[1]
+
+
+    def get_height(self) -> int:
+        return self.__data.shape[0]
+
+
+    @property
+    def profile(self) -> "_Profile":
+        return _Profile("depth", self.get_width(), self.get_height(), str(self.__data.dtype), 0)
+
+
+class _Frameset:
+
+    def __init__(self, depth: _Frame, color: _Frame):
+        self.__depth = depth
+        self.__color = color
+
+
+    def get_depth_frame(self) -> _Frame:
+        return self.__depth
+
+
+    def get_color_frame(self) -> _Frame:
+        return self.__color
+
+
+class _Profile:
+
+    def __init__(self, stream_type: str, width: int, height: int, fmt: str, fps: int):
+        self.__stream = stream_type
+        self.__width = width
+        self.__height = height
+        self.__format = fmt
+        self.__fps = fps
+
+
+    def stream_type(self) -> str:
+        return self.__stream
+
+
+    def width(self) -> int:
+        return self.__width
+
+
+    def height(self) -> int:
+        return self.__height
+
+
+    def format(self) -> str:
+        return self.__format
+
+
+    def fps(self) -> int:
+        return self.__fps
+
+
+    def as_video_stream_profile(self) -> "_Profile":
+        return self
+
+
+    def get_intrinsics(self) -> types.SimpleNamespace:
+        # Камера без искажений с полем зрения около 70 градусов по горизонтали
+        return types.SimpleNamespace(width=self.__width, height=self.__height,
+                                     ppx=self.__width / 2, ppy=self.__height / 2,
+                                     fx=self.__width * 0.7, fy=self.__width * 0.7,
+                                     model="none", coeffs=[0.0] * 5)
+
+
+class _Sensor:
+
+    def __init__(self, name: str, profiles: list, depth_scale: float = None):
+        self.__name = name
+        self.__profiles = profiles
+        self.__depth_scale = depth_scale
+
+
+    def get_stream_profiles(self) -> list:
+        return list(self.__profiles)
+
+
+    def get_info(self, info: str) -> str:
+        return self.__name
+
+
+    def get_depth_scale(self) -> float:
+        return self.__depth_scale
+
+
+class _Device:
+
+    def __init__(self, name: str, serial: str, resolutions: typing.Sequence[tuple],
+                 fps: int, depth_scale: float):
+        self.sensors = [
+            _Sensor("Stereo Module",
+                    [_Profile("depth", w, h, "z16", fps) for w, h in resolutions], depth_scale),
+            _Sensor("RGB Camera",
+                    [_Profile("color", w, h, "bgr8", fps) for w, h in resolutions]),
+        ]
+        self.__info = {"name": name, "serial_number": serial}
+
+
+    def get_info(self, info: str) -> str:
+        return self.__info.get(info, "")
+
+
+    def query_sensors(self) -> list:
+        return list(self.sensors)
+
+
+    def first_depth_sensor(self) -> _Sensor:
+        return self.sensors[0]
+
+
+class _DevicesChanged:
+
+    def __init__(self, removed: list, added: list):
+        self.__removed = removed
+        self.__added = added
+
+
+    def was_removed(self, device: _Device) -> bool:
+        return device in self.__removed
+
+
+    def get_new_devices(self) -> list:
+        return list(self.__added)
+
+
+class _Context:
+
+    def __init__(self, devices: list, callbacks: list):
+        self.__devices = devices
+        self.__callbacks = callbacks
+
+
+    def query_devices(self) -> list:
+        return list(self.__devices)
+
+
+    def set_devices_changed_callback(self, callback: typing.Callable) -> None:
+        self.__callbacks.append(callback)
+
+
+class _Config:
+
+    def __init__(self):
+        self.serial = None
+        self.streams = {}
+
+
+    def enable_device(self, serial: str) -> None:
+        self.serial = serial
+
+
+    def enable_stream(self, stream_type: str, width: int, height: int, fmt: str, fps: int) -> None:
+        self.streams[stream_type] = (width, height, fmt, fps)
+
+
+class _Pipeline:
+
+    def __init__(self, backend: "SyntheticRealSense"):
+        self.__backend = backend
+        self.__depth = self.__color = None
+        self.__pacer = None
+        self.__number = 0
+        self.__running = False
+
+
+    def start(self, config: _Config = None) -> None:
+        streams = config.streams if config is not None else {}
+        depth_w, depth_h, _, fps = streams.get("depth", self.__backend.default_stream)
+        color_w, color_h, _, _ = streams.get("color", self.__backend.default_stream)
+
+        count = self.__backend.frames
+        self.__depth = synthetic_depth(count, depth_w, depth_h)
+        self.__color = synthetic_color(count, color_w, color_h)
+        self.__pacer = _Pacer(fps, self.__backend.realtime)
+        self.__number = 0
+        self.__running = True
+
+
+    def wait_for_frames(self, timeout_ms: int = 5000) -> _Frameset:
+        if not self.__running:
+            raise RuntimeError("wait_for_frames cannot be called before start()")
+
+        self.__pacer.wait()
+        i = self.__number % len(self.__depth)
+        timestamp = time.time() * 1000
+        frameset = _Frameset(_Frame(self.__depth[i], self.__number, timestamp),
+                             _Frame(self.__color[i], self.__number, timestamp))
+        self.__number += 1
+        return frameset
+
+
+    def stop(self) -> None:
+        self.__running = False
+
+
+class _Align:
+
+    def __init__(self, stream: str):
+        self.__stream = stream
+
+
+    def process(self, frameset: _Frameset) -> _Frameset:
+        # Синтетические потоки соосны, выравнивание сводится к масштабированию глубины до разрешения цвета
+        depth_f, color_f = frameset.get_depth_frame(), frameset.get_color_frame()
+        size = (color_f.get_width(), color_f.get_height())
+        if (depth_f.get_width(), depth_f.get_height()) == size:
+            return frameset
+
+        depth = cv2.resize(depth_f.get_data(), size, interpolation=cv2.INTER_NEAREST)
+        return _Frameset(_Frame(depth, depth_f.get_frame_number(), depth_f.get_timestamp()), color_f)
+
+
+class _Colorizer:
+
+    def __init__(self):
+        self.__colorizer = DepthColorizer()
+
+
+    def set_option(self, option: str, value: float) -> None:
+        pass
+
+
+    def colorize(self, depth_f: _Frame) -> _Frame:
+        depth = self.__colorizer.colorize(depth_f.get_data()).copy()
+        return _Frame(depth, depth_f.get_frame_number(), depth_f.get_timestamp())
+
+
+class _DepthFilter:
+    """Упрощенные фильтры глубины. Размер и тип результата совпадают с блоками librealsense, сглаживание приближенное
+    """
+
+    # Произведение базы и фокусного расстояния для перевода глубины z16 в диспаратность
+    DISPARITY_SCALE = 1e5
+
+    def __init__(self, kind: str, depth_scale: float, to_disparity: bool = True):
+        self.__kind = kind
+        self.__depth_scale = depth_scale
+        self.__to_disparity = to_disparity
+        self.__options = {"filter_magnitude": 2, "min_distance": 0.1, "max_distance": 4.0,
+                          "filter_smooth_alpha": 0.4, "filter_smooth_delta": 20, "holes_fill": 1}
+        self.__previous = None
+
+
+    def set_option(self, option: str, value: float) -> None:
+        self.__options[option] = value
+
+
+    def process(self, depth_f: _Frame) -> _Frame:
+        data = depth_f.get_data()
+
+        if self.__kind == "decimation_filter":
+            # Размер результата, как у librealsense, выравнивается до кратного 4
+            m = int(self.__options["filter_magnitude"])
+            height, width = data.shape[0] // m, data.shape[1] // m
+            result = np.zeros(((height + 3) // 4 * 4, (width + 3) // 4 * 4), dtype=data.dtype)
+            result[:height, :width] = data[:height * m:m, :width * m:m]
+
+        elif self.__kind == "threshold_filter":
+            low = self.__options["min_distance"] / self.__depth_scale
+            high = self.__options["max_distance"] / self.__depth_scale
+            result = np.where((data >= low) & (data <= high), data, 0).astype(data.dtype)
+
+        elif self.__kind == "disparity_transform":
+            result = np.zeros(data.shape, dtype=np.float32 if self.__to_disparity else np.uint16)
+            np.divide(self.DISPARITY_SCALE, data, out=result, where=data > 0, casting="unsafe")
+
+        elif self.__kind == "spatial_filter":
+            result = cv2.medianBlur(data, 5)
+
+        elif self.__kind == "temporal_filter":
+            result = data
+            if self.__previous is not None and self.__previous.shape == data.shape:
+                alpha = self.__options["filter_smooth_alpha"]
+                blend = alpha * data + (1 - alpha) * self.__previous
+                result = np.where((data > 0) & (self.__previous > 0), blend, data).astype(data.dtype)
+            self.__previous = result
+
+        else:
+            result = np.where(data == 0, cv2.dilate(data, np.ones((3, 3), dtype=np.uint8)), data)
+
+        return _Frame(result, depth_f.get_frame_number(), depth_f.get_timestamp())
+
+
+class SyntheticRealSense:
+    """Синтетическая замена модуля `pyrealsense2` для `CameraRS(backend=...)`.
+
+    Предоставляет подмножество API, используемое `CameraRS`: `context`, `pipeline`, `config`,
+    `colorizer`, `align`, фильтры глубины, `video_stream_profile`, `camera_info`, `option`. Устройства выдают
+    синтетическую глубину z16 и цветные кадры BGR заданных разрешений без подключенной камеры.
+    """
+
+    camera_info = types.SimpleNamespace(name="name", serial_number="serial_number",
+                                        product_line="product_line")
+    option = types.SimpleNamespace(**{name: name for name in (
+        "visual_preset", "filter_magnitude", "min_distance", "max_distance",
+        "filter_smooth_alpha", "filter_smooth_delta", "holes_fill")})
+    stream = types.SimpleNamespace(depth="depth", color="color")
+    format = types.SimpleNamespace(z16="z16", bgr8="bgr8")
+
+    def __init__(self,
+                 resolutions: typing.Sequence[tuple] = ((640, 480), (848, 480), (1280, 720)),
+                 fps: int = 30,
+                 devices: int = 1,
+                 realtime: bool = False,
+                 frames: int = 16,
+                 depth_scale: float = 0.001):
+        """
+        Args:
+            `resolutions (Sequence[tuple], optional)`: Разрешения профилей глубины и цвета `(W, H)`.
+            Индекс разрешения - номер профиля в `CameraRS.stream`. По умолчанию `((640, 480), (848, 480), (1280, 720))`.
+
+            `fps (int, optional)`: FPS профилей. По умолчанию `30`.
+
+            `devices (int, optional)`: Колличество устройств. По умолчанию `1`.
+
+            `realtime (bool, optional)`: Выдавать кадры с частотой `fps`, иначе максимально быстро. По умолчанию `False`.
+
+            `frames (int, optional)`: Колличество заранее сгенерированных кадров. По умолчанию `16`.
+
+            `depth_scale (float, optional)`: Метров в одной единице z16. По умолчанию `0.001`.
+        """
+        self.realtime = realtime
+        self.frames = frames
+        self.default_stream = tuple(resolutions[0]) + ("", fps)
+        self.__device_args = (resolutions, fps, depth_scale)
+        self.__devices = [_Device("Synthetic D400", f"SYN{i:06d}", *self.__device_args)
+                          for i in range(devices)]
+        self.__callbacks = []
+
+
+    def context(self) -> _Context:
+        return _Context(self.__devices, self.__callbacks)
+
+
+    def connect(self, serial: str = None) -> str:
+        """Подключение нового устройства с уведомлением `set_devices_changed_callback`
+
+        Args:
+            `serial (str, optional)`: Серийный номер. По умолчанию следующий свободный номер.
+
+        Returns:
+            `str`: Серийный номер подключенного устройства
+        """
+        serial = serial or f"SYN{len(self.__devices):06d}"
+        device = _Device("Synthetic D400", serial, *self.__device_args)
+        self.__devices.append(device)
+        for callback in self.__callbacks:
+            callback(_DevicesChanged([], [device]))
+        return serial
+
+
+    def disconnect(self, serial: str) -> None:
+        """Отключение устройства с уведомлением `set_devices_changed_callback`
+
+        Args:
+            `serial (str)`: Серийный номер
+        """
+        removed = [device for device in self.__devices if device.get_info("serial_number") == serial]
+        for device in removed:
+            self.__devices.remove(device)
+        for callback in self.__callbacks:
+            callback(_DevicesChanged(removed, []))
+
+
+    def pipeline(self) -> _Pipeline:
+        return _Pipeline(self)
+
+
+    def config(self) -> _Config:
+        return _Config()
+
+
+    def colorizer(self) -> _Colorizer:
+        return _Colorizer()
+
+
+    def align(self, stream: str) -> _Align:
+        return _Align(stream)
+
+
+    def decimation_filter(self) -> _DepthFilter:
+        return _DepthFilter("decimation_filter", self.__device_args[2])
+
+
+    def threshold_filter(self) -> _DepthFilter:
+        return _DepthFilter("threshold_filter", self.__device_args[2])
+
+
+    def disparity_transform(self, transform_to_disparity: bool = True) -> _DepthFilter:
+        return _DepthFilter("disparity_transform", self.__device_args[2], transform_to_disparity)
+
+
+    def spatial_filter(self) -> _DepthFilter:
+        return _DepthFilter("spatial_filter", self.__device_args[2])
+
+
+    def temporal_filter(self) -> _DepthFilter:
+        return _DepthFilter("temporal_filter", self.__device_args[2])
+
+
+    def hole_filling_filter(self) -> _DepthFilter:
+        return _DepthFilter("hole_filling_filter", self.__device_args[2])
+
+
+    @staticmethod
+    def video_stream_profile(profile: _Profile) -> _Profile:
+        return profile
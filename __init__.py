@@ -1,4 +1,22 @@
 from .RTSPCamera import Camera
 from .RealSenseCamera import CameraRS
 from .RealSenseMultiProc import RealSenseMultiProc
+from .RTSPMultiProc import CameraMultiProc
+from .CameraSupervisor import CameraSupervisor
+from .DeviceRegistry import DeviceRegistry, ProfileIndex
+from .SharedMemoryRing import SharedFrameRing
+from .FramePacket import FramePacket
+from .FrameBuffers import FrameBuffers
+from .FrameSynchronizer import FrameSynchronizer
+from .DepthRecorder import DepthRecorder, DepthReader
+from .DepthArchive import DepthArchive
+from .DepthColorizer import DepthColorizer
+from .PointCloud import PointCloud
+from .DepthFilters import DepthFilterChain, DEPTH_FILTERS, RECOMMENDED_DEPTH_FILTERS
+from .Overlay import Overlay
+from .StreamStats import StreamStats
+from .CaptureProfiles import CAPTURE_PROFILES, open_capture, probe_latency, compare_capture_profiles
+from .AsyncCapture import gather_frames, shared_executor
+from .CaptureEngine import CaptureEngine
+from .SyntheticSources import SyntheticCapture, SyntheticRealSense
 from .utils import *
\ No newline at end of file
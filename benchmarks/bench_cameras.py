@@ -0,0 +1,174 @@
+"""Пропускная способность `Camera` и `CameraRS` во всех режимах работы на синтетических источниках.
+
+Камеры запускаются без окон предпросмотра, каждый замер выполняется в отдельном процессе.
+Результаты (FPS, задержка кадра, загрузка CPU, пиковый RSS) сохраняются в JSON
+и могут сравниваться с предыдущим запуском через `--baseline`.
+Запуск из папки, содержащей пакет:
+    python -m RNF_Camera.benchmarks.bench_cameras --frames 300 --sizes 640x480 1280x720 --output bench.json
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import multiprocessing
+import numpy as np
+import cv2
+
+from ..RTSPCamera import Camera
+from ..RealSenseCamera import CameraRS
+from ..SyntheticSources import SyntheticCapture, SyntheticRealSense
+
+
+class LatencySink:
+    """Приемник кадров вместо `Pipe`: измеряет задержку от захвата до передачи
+    и останавливает камеру после заданного колличества кадров
+    """
+
+    def __init__(self, frames: int):
+        self.frames = frames
+        self.camera = None
+        self.latency = []
+        self.first = None
+        self.last = None
+
+    def send(self, packet) -> None:
+        now = time.time()
+        if self.first is None:
+            self.first = now
+        self.last = now
+        self.latency.append(now - packet.timestamp)
+
+        if len(self.latency) >= self.frames:
+            self.camera.stop()
+
+
+def run_case(camera: str, mode: str, size: tuple, frames: int, path: str, stages: bool = False) -> dict:
+    sink = LatencySink(frames)
+
+    if camera == "rtsp":
+        cam = Camera("synthetic", mode, capture_factory=SyntheticCapture.factory(size=size))
+        sink.camera = cam
+        run = lambda: cam.stream(size=size, img_count=frames, time_out=0, path=path,
+                                 show_gui=False, sender=sink, collect_stats=stages)
+    else:
+        cam = CameraRS(0, mode, backend=SyntheticRealSense(resolutions=[size]))
+        sink.camera = cam
+        run = lambda: cam.stream(0, 0, img_count=frames, time_out=0, path=path,
+                                 show_gui_color=False, show_gui_depth=False, sender=sink,
+                                 collect_stats=stages)
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    usage_end = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu = (usage_end.ru_utime - usage.ru_utime) + (usage_end.ru_stime - usage.ru_stime)
+    latency = np.array(sink.latency) * 1000
+    streamed = len(sink.latency)
+    span = (sink.last - sink.first) if streamed > 1 else 0.0
+
+    return {
+        "camera": camera,
+        "mode": mode,
+        "size": f"{size[0]}x{size[1]}",
+        "frames": streamed,
+        "failed": cam.failed,
+        "seconds": elapsed,
+        "fps": (streamed - 1) / span if span else 0.0,
+        "latency_ms": {
+            "p50": float(np.percentile(latency, 50)) if streamed else None,
+            "p90": float(np.percentile(latency, 90)) if streamed else None,
+            "p99": float(np.percentile(latency, 99)) if streamed else None,
+            "max": float(latency.max()) if streamed else None,
+        },
+        "cpu_percent": cpu / elapsed * 100,
+        # ru_maxrss в килобайтах в Linux и в байтах в macOS
+        "rss_peak_mb": usage_end.ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024),
+        "stages": cam.stats()["stages"],
+    }
+
+
+def _worker(queue, *args) -> None:
+    queue.put(run_case(*args))
+
+
+def run_isolated(*args) -> dict:
+    """Запуск замера в отдельном процессе, чтобы пиковый RSS не накапливался между замерами
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_worker, args=(queue, ) + args)
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return {(r["camera"], r["mode"], r["size"]): r for r in json.load(f)["results"]}
+
+
+def compare(results: list, baseline: dict) -> None:
+    print("\nComparison with baseline")
+    for r in results:
+        base = baseline.get((r["camera"], r["mode"], r["size"]))
+        if base is None or not base["fps"]:
+            continue
+        change = (r["fps"] - base["fps"]) / base["fps"] * 100
+        print(f"{r['camera']:9} {r['mode']:9} {r['size']:>10} fps {base['fps']:8.1f} -> {r['fps']:8.1f} ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--sizes", nargs="+", default=["640x480", "1280x720", "1920x1080"])
+    parser.add_argument("--modes", nargs="+", default=["stream", "video", "frame", "centring"])
+    parser.add_argument("--cameras", nargs="+", default=["rtsp", "realsense"], choices=["rtsp", "realsense"])
+    parser.add_argument("--output", type=str, default="bench_cameras.json")
+    parser.add_argument("--baseline", type=str, default=None)
+    parser.add_argument("--stages", action="store_true", help="measure per-stage timings (adds a small overhead)")
+    args = parser.parse_args()
+
+    # Базовый запуск читается до записи результатов, файлы могут совпадать
+    baseline = load_baseline(args.baseline) if args.baseline else None
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for camera in args.cameras:
+            for mode in args.modes:
+                for size in args.sizes:
+                    width, height = map(int, size.split("x"))
+                    r = run_isolated(camera, mode, (width, height), args.frames, tmp, args.stages)
+                    results.append(r)
+                    print(f"{camera:9} {mode:9} {r['size']:>10} {r['fps']:8.1f} fps  "
+                          f"latency p50 {r['latency_ms']['p50'] or 0:6.2f} ms  p99 {r['latency_ms']['p99'] or 0:6.2f} ms  "
+                          f"cpu {r['cpu_percent']:5.1f}%  rss {r['rss_peak_mb']:7.1f} MB")
+                    for stage, value in r["stages"].items():
+                        print(f"{'':20} {stage:9} p50 {value['p50_ms']:7.3f} ms  p99 {value['p99_ms']:7.3f} ms")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "cpu_count": multiprocessing.cpu_count(),
+            "frames": args.frames,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if baseline:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Сравнение `CaptureEngine` (все камеры в одном процессе на пуле потоков) с процессом на камеру (`CameraMultiProc`).
+
+Для 4, 16 и 64 синтетических камер измеряются суммарный FPS, загрузка CPU и суммарный RSS всех процессов.
+Оба способа измеряются в одинаковом окне захвата: от момента, когда все камеры выдали первый кадр,
+в течение `--seconds` секунд, без запуска и остановки камер и процессов.
+Каждый замер выполняется в отдельном процессе, результаты сохраняются в JSON.
+Запуск из папки, содержащей пакет:
+    python -m RNF_Camera.benchmarks.bench_capture_engine --streams 4 16 64 --seconds 10 --size 640x480
+"""
+import os
+import json
+import time
+import argparse
+import platform
+import resource
+import multiprocessing
+import numpy as np
+import cv2
+
+from ..RTSPCamera import Camera
+from ..RTSPMultiProc import CameraMultiProc
+from ..CaptureEngine import CaptureEngine
+from ..SyntheticSources import SyntheticCapture
+
+
+def rss_mb(pid: int = None) -> float:
+    """Текущий RSS процесса по `/proc` (Linux)
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def cpu_seconds(who: int) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def process_cpu_seconds(pid: int) -> float:
+    """Процессорное время работающего процесса по `/proc` (Linux)
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def wait_until(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def run_engine(streams: int, size: tuple, seconds: float, realtime: bool, fps: int) -> dict:
+    factory = SyntheticCapture.factory(size=size, fps=fps, realtime=realtime)
+    cameras = [Camera(f"synthetic_{i}", "stream", capture_factory=factory) for i in range(streams)]
+
+    engine = CaptureEngine(cameras, paced=realtime, size=size, fps=fps)
+    engine.start()
+    # Окно измерения начинается, когда все камеры открыты и выдали первый кадр
+    wait_until(lambda: all(camera["frames"] for camera in engine.stats()["per_camera"]), 60.0)
+
+    frames, cpu, start = engine.stats()["frames"], cpu_seconds(resource.RUSAGE_SELF), time.monotonic()
+    time.sleep(seconds / 2)
+    rss = rss_mb()
+    time.sleep(seconds / 2)
+    frames, cpu, elapsed = (engine.stats()["frames"] - frames, cpu_seconds(resource.RUSAGE_SELF) - cpu,
+                            time.monotonic() - start)
+    workers = engine.workers
+    engine.stop()
+
+    return {
+        "approach": "engine",
+        "streams": streams,
+        "workers": workers,
+        "frames": frames,
+        "fps": frames / elapsed,
+        "cpu_percent": cpu / elapsed * 100,
+        "rss_mb": rss,
+    }
+
+
+def run_processes(streams: int, size: tuple, seconds: float, realtime: bool, fps: int) -> dict:
+    factory = SyntheticCapture.factory(size=size, fps=fps, realtime=realtime)
+    counters = [multiprocessing.Value("L", 0) for _ in range(streams)]
+    # Барьер отделяет запуск процессов и открытие источников от окна измерения
+    barrier = multiprocessing.Barrier(streams + 1)
+    processes = [CameraMultiProc(f"synthetic_{i}", "stream", size=size, fps=fps, show_gui=False,
+                                 capture_factory=factory, frame_counter=counter, barrier=barrier)
+                 for i, counter in enumerate(counters)]
+
+    for process in processes:
+        process.start()
+    barrier.wait(120.0)
+    wait_until(lambda: all(counter.value for counter in counters), 60.0)
+
+    def sample() -> tuple:
+        # Процессорное время процессов камер читается, пока они работают: RUSAGE_CHILDREN учитывает
+        # только завершенные и ожидаемые процессы и включает время их запуска
+        return (sum(counter.value for counter in counters),
+                sum(process_cpu_seconds(process.pid) for process in processes), time.monotonic())
+
+    frames, cpu, start = sample()
+    time.sleep(seconds / 2)
+    rss = rss_mb() + sum(rss_mb(process.pid) for process in processes)
+    time.sleep(seconds / 2)
+    end_frames, end_cpu, end = sample()
+    frames, cpu, elapsed = end_frames - frames, end_cpu - cpu, end - start
+
+    for process in processes:
+        process.stop()
+    for process in processes:
+        process.join(10.0)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    return {
+        "approach": "multiprocess",
+        "streams": streams,
+        "workers": streams,
+        "frames": frames,
+        "fps": frames / elapsed,
+        "cpu_percent": cpu / elapsed * 100,
+        "rss_mb": rss,
+    }
+
+
+def _worker(queue, approach, *args) -> None:
+    queue.put((run_engine if approach == "engine" else run_processes)(*args))
+
+
+def run_isolated(*args) -> dict:
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_worker, args=(queue, ) + args)
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", nargs="+", type=int, default=[4, 16, 64])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--size", type=str, default="640x480")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--realtime", action="store_true", help="pace synthetic sources at --fps like live cameras")
+    parser.add_argument("--approaches", nargs="+", default=["engine", "multiprocess"], choices=["engine", "multiprocess"])
+    parser.add_argument("--output", type=str, default="bench_capture_engine.json")
+    args = parser.parse_args()
+
+    size = tuple(map(int, args.size.split("x")))
+    results = []
+    for streams in args.streams:
+        for approach in args.approaches:
+            r = run_isolated(approach, streams, size, args.seconds, args.realtime, args.fps)
+            results.append(r)
+            print(f"{approach:12} {streams:3} streams  {r['fps']:8.1f} fps total  {r['fps'] / streams:6.1f} fps/stream  "
+                  f"cpu {r['cpu_percent']:6.1f}%  rss {r['rss_mb']:8.1f} MB")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "cpu_count": multiprocessing.cpu_count(),
+            "seconds": args.seconds,
+            "size": args.size,
+            "realtime": args.realtime,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Сравнение `DepthColorizer` (LUT) с `rs.colorizer` на синтетических кадрах z16.
+
+Кадры для `rs.colorizer` подаются через `rs.software_device`, камера не требуется.
+Запуск из папки, содержащей пакет:
+    python -m RNF_Camera.benchmarks.bench_colorizer --frames 300 --size 848x480
+"""
+import time
+import argparse
+import numpy as np
+import pyrealsense2 as rs
+
+from ..DepthColorizer import DepthColorizer
+from ..SyntheticSources import synthetic_depth
+
+
+def software_depth_frames(frames: list, depth_scale: float = 0.001) -> list:
+    """Преобразование массивов z16 в кадры librealsense через программное устройство
+    """
+    height, width = frames[0].shape
+
+    device = rs.software_device()
+    sensor = device.add_sensor("Depth")
+    sensor.add_read_only_option(rs.option.depth_units, depth_scale)
+
+    intrinsics = rs.intrinsics()
+    intrinsics.width, intrinsics.height = width, height
+    intrinsics.ppx, intrinsics.ppy = width / 2, height / 2
+    intrinsics.fx = intrinsics.fy = width
+    intrinsics.model = rs.distortion.none
+
+    stream = rs.video_stream()
+    stream.type = rs.stream.depth
+    stream.fmt = rs.format.z16
+    stream.width, stream.height = width, height
+    stream.fps = 30
+    stream.bpp = 2
+    stream.index = 0
+    stream.uid = 0
+    stream.intrinsics = intrinsics
+    profile = sensor.add_video_stream(stream)
+
+    queue = rs.frame_queue(len(frames) + 1, keep_frames=True)
+    sensor.open(profile)
+    sensor.start(queue)
+
+    result = []
+    for i, depth in enumerate(frames):
+        frame = rs.software_video_frame()
+        frame.pixels = depth
+        frame.bpp = 2
+        frame.stride = width * 2
+        frame.timestamp = i * 1000 / 30
+        frame.domain = rs.timestamp_domain.hardware_clock
+        frame.frame_number = i
+        frame.profile = profile.as_video_stream_profile()
+        sensor.on_video_frame(frame)
+        result.append(queue.wait_for_frame())
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=str, default="848x480")
+    args = parser.parse_args()
+
+    width, height = map(int, args.size.split("x"))
+    frames = synthetic_depth(min(args.frames, 60), width, height)
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    lut = DepthColorizer(0.3, 4.0)
+    lut.colorize(frames[0])
+    start = time.perf_counter()
+    for depth in frames:
+        lut.colorize(depth)
+    lut_elapsed = time.perf_counter() - start
+
+    rs_frames = software_depth_frames(frames)
+    colorizer = rs.colorizer()
+    colorizer.set_option(rs.option.visual_preset, 0)
+    start = time.perf_counter()
+    for depth_f in rs_frames:
+        np.asanyarray(colorizer.colorize(depth_f).get_data())
+    rs_elapsed = time.perf_counter() - start
+
+    print(f"{args.frames} frames {width}x{height}")
+    print(f"DepthColorizer: {lut_elapsed / args.frames * 1000:7.3f} ms/frame")
+    print(f"rs.colorizer  : {rs_elapsed / args.frames * 1000:7.3f} ms/frame")
+    print(f"speedup       : {rs_elapsed / lut_elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
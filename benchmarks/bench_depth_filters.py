@@ -0,0 +1,46 @@
+"""Длительность каждого фильтра `DepthFilterChain` и объем глубины на выходе цепочки на синтетических кадрах z16.
+
+Кадры подаются через `rs.software_device`, камера не требуется.
+Запуск из папки, содержащей пакет:
+    python -m RNF_Camera.benchmarks.bench_depth_filters --frames 300 --size 848x480 --magnitude 2
+"""
+import time
+import argparse
+import numpy as np
+
+from ..DepthFilters import DepthFilterChain, RECOMMENDED_DEPTH_FILTERS
+from ..SyntheticSources import synthetic_depth
+from .bench_colorizer import software_depth_frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=str, default="848x480")
+    parser.add_argument("--magnitude", type=int, default=2, help="decimation magnitude, 1 disables decimation")
+    args = parser.parse_args()
+
+    width, height = map(int, args.size.split("x"))
+    frames = synthetic_depth(min(args.frames, 60), width, height)
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+    rs_frames = software_depth_frames(frames)
+
+    spec = [f for f in RECOMMENDED_DEPTH_FILTERS if args.magnitude > 1 or f[0] != "decimation"]
+    spec = [("decimation", {"filter_magnitude": args.magnitude}) if f[0] == "decimation" else f for f in spec]
+    chain = DepthFilterChain(spec)
+
+    start = time.perf_counter()
+    for depth_f in rs_frames:
+        result = chain.process(depth_f)
+    elapsed = time.perf_counter() - start
+    output = np.asanyarray(result.get_data())
+
+    print(f"{args.frames} frames {width}x{height} -> {output.shape[1]}x{output.shape[0]}, "
+          f"{frames[0].nbytes / 1024:.0f} KB -> {output.nbytes / 1024:.0f} KB per frame")
+    for name, summary in chain.stats().items():
+        print(f"{name:20}: {summary['mean_ms']:7.3f} ms/frame  p99 {summary['p99_ms']:7.3f} ms")
+    print(f"{'chain':20}: {elapsed / args.frames * 1000:7.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
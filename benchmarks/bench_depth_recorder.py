@@ -0,0 +1,78 @@
+"""Сравнение контейнера `DepthRecorder` с сохранением глубины в отдельные `.npy` файлы.
+
+Запуск из папки, содержащей пакет:
+    python -m RNF_Camera.benchmarks.bench_depth_recorder --frames 300 --size 1280x720
+"""
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+
+from ..DepthRecorder import DepthRecorder, DepthReader
+from ..SyntheticSources import synthetic_depth
+
+
+def folder_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def bench_npy(frames: list, folder: str) -> dict:
+    os.mkdir(folder)
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        np.save(f"{folder}/{i}.npy", frame)
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "fps": len(frames) / elapsed, "bytes": folder_size(folder)}
+
+
+def bench_recorder(frames: list, folder: str, chunk_frames: int, level: int) -> dict:
+    os.mkdir(folder)
+    recorder = DepthRecorder(f"{folder}/depth.zdepth", frames[0].shape, chunk_frames=chunk_frames, level=level)
+
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        recorder.append(frame, float(i))
+    append_elapsed = time.perf_counter() - start
+    recorder.release()
+    elapsed = time.perf_counter() - start
+
+    reader = DepthReader(f"{folder}/depth.zdepth")
+    order = np.random.default_rng(1).integers(0, len(frames), size=min(50, len(frames)))
+    start = time.perf_counter()
+    for n in order:
+        assert np.array_equal(reader.frame(int(n)), frames[int(n)])
+    seek_elapsed = time.perf_counter() - start
+    reader.close()
+
+    return {"seconds": elapsed, "fps": len(frames) / elapsed,
+            "append_fps": len(frames) / append_elapsed,
+            "random_seek_ms": seek_elapsed / len(order) * 1000,
+            "bytes": folder_size(folder)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=str, default="848x480")
+    parser.add_argument("--chunk", type=int, default=30)
+    parser.add_argument("--level", type=int, default=1)
+    args = parser.parse_args()
+
+    width, height = map(int, args.size.split("x"))
+    frames = synthetic_depth(args.frames, width, height)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        npy = bench_npy(frames, f"{tmp}/npy")
+        rec = bench_recorder(frames, f"{tmp}/rec", args.chunk, args.level)
+
+    print(f"{args.frames} frames {width}x{height}")
+    print(f"npy per file : {npy['bytes'] / 2**20:8.1f} MiB  {npy['fps']:8.1f} fps")
+    print(f"DepthRecorder: {rec['bytes'] / 2**20:8.1f} MiB  {rec['fps']:8.1f} fps "
+          f"(append {rec['append_fps']:.1f} fps, random seek {rec['random_seek_ms']:.2f} ms)")
+    print(f"size ratio   : {npy['bytes'] / rec['bytes']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Сравнение `PointCloud` (предвычисленные лучи) с `rs.pointcloud` на синтетических кадрах z16.
+
+Кадры для `rs.pointcloud` подаются через `rs.software_device`, камера не требуется.
+Оба способа возвращают массив `(H, W, 3)` float32 в метрах.
+Запуск из папки, содержащей пакет:
+    python -m RNF_Camera.benchmarks.bench_point_cloud --frames 300 --size 848x480
+"""
+import time
+import argparse
+import numpy as np
+import pyrealsense2 as rs
+
+from types import SimpleNamespace
+
+from ..PointCloud import PointCloud
+from ..SyntheticSources import synthetic_depth
+from .bench_colorizer import software_depth_frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=str, default="848x480")
+    args = parser.parse_args()
+
+    width, height = map(int, args.size.split("x"))
+    frames = synthetic_depth(min(args.frames, 60), width, height)
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+
+    # Те же внутренние параметры, что у программного устройства в `software_depth_frames`
+    intrinsics = SimpleNamespace(width=width, height=height, ppx=width / 2, ppy=height / 2,
+                                 fx=width, fy=width, model="none", coeffs=[0.0] * 5)
+    cloud = PointCloud(intrinsics, depth_scale=0.001)
+    cloud.compute(frames[0])
+    start = time.perf_counter()
+    for depth in frames:
+        cloud.compute(depth)
+    vec_elapsed = time.perf_counter() - start
+
+    rs_frames = software_depth_frames(frames)
+    pointcloud = rs.pointcloud()
+    start = time.perf_counter()
+    for depth_f in rs_frames:
+        points = pointcloud.calculate(depth_f)
+        np.asanyarray(points.get_vertices()).view(np.float32).reshape(height, width, 3)
+    rs_elapsed = time.perf_counter() - start
+
+    print(f"{args.frames} frames {width}x{height}")
+    print(f"PointCloud   : {vec_elapsed / args.frames * 1000:7.3f} ms/frame")
+    print(f"rs.pointcloud: {rs_elapsed / args.frames * 1000:7.3f} ms/frame")
+    print(f"speedup      : {rs_elapsed / vec_elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,50 @@
 import cv2
+import math
+import time
 import random
+import numpy as np
 from multiprocessing import Process, Barrier, Pipe
 
 from Calibration.utils import find_calibration_template
 
+from ..FrameSynchronizer import FrameSynchronizer
 
-def preview_cameras(barrier: Barrier, *args) -> None:
-    """Предпросмотр кадров с камер. Функция используется при мультипроцесрной работе камер
+
+def preview_cameras(barrier: Barrier, *args, tolerance: float = 0.05, stall_timeout: float = 0.5) -> None:
+    """Предпросмотр кадров с камер. Функция используется при мультипроцесрной работе камер.
+    Кадры камер сопоставляются по времени захвата. Если наборов нет дольше `stall_timeout`
+    (например, камера зависла), показываются последние кадры каждой камеры без синхронизации
 
     Args:
         `barrier` (Barrier): Ожидание других потоковых операций
         
-        `*args` (Pipe): Информация с других камер типа `Pipe`
+        `*args` (Pipe | SharedFrameRing): Информация с других камер типа `Pipe` или `SharedFrameRing`
+        
+        `tolerance` (float, optional): Допустимый разброс времени захвата кадров в секундах. По умолчанию `0.05`.
+        
+        `stall_timeout` (float, optional): Время без синхронизированных наборов в секундах до показа несинхронизированных кадров. По умолчанию `0.5`.
     """
 
+    sync = FrameSynchronizer(*args, tolerance=tolerance)
+    shown = [None] * len(args)
+
     barrier.wait()
+    last_set = time.monotonic()
 
     while True:
         key = cv2.waitKey(1)
-
-        for i, reciver in enumerate(args):
-            frame = reciver.recv()
+        
+        frames = sync.recv(timeout=0.01)
+        if frames is not None:
+            last_set = time.monotonic()
+        elif time.monotonic() - last_set > stall_timeout:
+            frames = sync.latest()
+
+        for i, frame in enumerate(frames or []):
+            # Уже показанный кадр (или его отсутствие у зависшей камеры) не перерисовывается
+            if frame is None or frame is shown[i]:
+                continue
+            shown[i] = frame
             frame_c = frame[0]
 
             cv2.imshow(f"Camera color {i}", frame_c)
@@ -33,6 +57,121 @@ def preview_cameras(barrier: Barrier, *args) -> None:
             break
         
 
+def _latest_packet(reciver, last_seq: int = -1) -> tuple:
+    """Получение последнего кадра приемника без блокировки. Более старые кадры пропускаются
+
+    Args:
+        `reciver` (Pipe | SharedFrameRing): Приемник кадров
+        
+        `last_seq` (int, optional): Номер последовательности последнего полученного кадра `SharedFrameRing`. По умолчанию `-1`.
+
+    Returns:
+        `tuple`: Последний кадр или `None`. Колличество кадров камеры с предыдущего вызова. Номер последнего кадра
+    """
+    
+    # Кольцо в разделяемой памяти сразу отдает последний кадр, пропущенные кадры считаются по номерам последовательности
+    if hasattr(reciver, "latest"):
+        if not reciver.poll():
+            return None, 0, last_seq
+        frame = reciver.latest()
+        if frame is None:
+            return None, 0, last_seq
+        count = frame[1] - last_seq if last_seq >= 0 else 1
+        return frame[0], count, frame[1]
+
+    packet, count = None, 0
+    try:
+        while reciver.poll():
+            packet = reciver.recv()
+            count += 1
+    except (EOFError, OSError):
+        pass
+    return packet, count, last_seq
+
+
+def preview_mosaic(barrier: Barrier, *args,
+                   streams: int = 1,
+                   grid: tuple = None,
+                   tile_size: tuple = (320, 240),
+                   max_fps: float = 30,
+                   name_window: str = "Cameras") -> None:
+    """Предпросмотр всех камер в одном окне-мозаике. Приемники опрашиваются без блокировки,
+    от каждой камеры используется только последний кадр, окно обновляется не чаще `max_fps`
+
+    Args:
+        `barrier` (Barrier): Ожидание других потоковых операций
+        
+        `*args` (Pipe | SharedFrameRing): Информация с других камер типа `Pipe` или `SharedFrameRing`
+        
+        `streams` (int, optional): Колличество изображений от каждой камеры: `1` - цвет, `2` - цвет и глубина. По умолчанию `1`.
+        
+        `grid` (tuple, optional): Сетка мозаики `(столбцы, строки)`. По умолчанию подбирается по колличеству изображений.
+        
+        `tile_size` (tuple, optional): Размер одной ячейки `(ширина, высота)`. По умолчанию `(320, 240)`.
+        
+        `max_fps` (float, optional): Максимальная частота обновления окна. По умолчанию `30`.
+        
+        `name_window` (str, optional): Название окна. По умолчанию `Cameras`.
+    """
+
+    tiles = len(args) * streams
+    if grid is None:
+        cols = math.ceil(math.sqrt(tiles))
+        grid = (cols, math.ceil(tiles / cols))
+
+    width, height = tile_size
+    canvas = np.zeros((grid[1] * height, grid[0] * width, 3), dtype=np.uint8)
+    cells = [canvas[(i // grid[0]) * height:(i // grid[0] + 1) * height,
+                    (i % grid[0]) * width:(i % grid[0] + 1) * width] for i in range(min(tiles, grid[0] * grid[1]))]
+
+    counts = [0] * len(args)
+    seqs = [-1] * len(args)
+    fps = [0.0] * len(args)
+    fps_time = time.monotonic()
+    period = 1 / max_fps
+
+    barrier.wait()
+
+    while True:
+        start = time.monotonic()
+
+        for i, reciver in enumerate(args):
+            packet, count, seqs[i] = _latest_packet(reciver, seqs[i])
+            counts[i] += count
+            if packet is None:
+                continue
+
+            for j, image in enumerate(packet[:streams]):
+                index = i * streams + j
+                if index >= len(cells):
+                    break
+                
+                cell = cells[index]
+                if image.ndim == 2:
+                    cell[:] = cv2.resize(image, tile_size, interpolation=cv2.INTER_NEAREST)[..., None]
+                else:
+                    cv2.resize(image, tile_size, dst=cell, interpolation=cv2.INTER_NEAREST)
+                cv2.putText(cell, f"{i}{' depth' if j else ''} {fps[i]:.1f} fps", (5, 15),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 1)
+
+        if start - fps_time >= 1.0:
+            fps = [count / (start - fps_time) for count in counts]
+            counts = [0] * len(args)
+            fps_time = start
+
+        cv2.imshow(name_window, canvas)
+        key = cv2.waitKey(1)
+
+        if key == ord('q') & 0xFF:
+            cv2.destroyAllWindows()
+            break
+
+        # Ограничение частоты обновления окна
+        elapsed = time.monotonic() - start
+        if elapsed < period:
+            time.sleep(period - elapsed)
+
+
 def preview_cameras_template_calibration(barrier: Barrier, reciver: Pipe, type: str, size: tuple, name_window: str) -> None:
 
     if not name_window: